@@ -1,7 +1,8 @@
 import streamlit as st
-import json
 import os
 from datetime import datetime
+from board_store import (BOARD_DB, COMMENT_PAGE, init_db, add_comment, delete_comment, count_comments, list_comments,
+                         list_updates, add_update, edit_update, delete_update)
 
 st.set_page_config(page_title="퀀트 매크로 연구소", page_icon="🚀", layout="centered")
 
@@ -105,20 +106,8 @@ DEFAULT_UPDATES = [
     }
 ]
 
-def load_json(path, default):
-    try:
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-    except: pass
-    return default
-
-def save_json(path, data):
-    try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        return True
-    except: return False
+# 💡 댓글/업데이트는 SQLite(board_store)에 행 단위로 저장. 예전 JSON 파일은 DB를 처음 만들 때 한 번만 옮겨 담습니다.
+init_db(BOARD_DB, COMMENT_FILE, UPDATE_FILE, DEFAULT_UPDATES)
 
 def render_tag(t):
     old_to_new = {"fix": "🔴 버그수정", "feature": "🟢 신기능", "improve": "🔵 개선", "mobile": "🟡 모바일"}
@@ -155,8 +144,10 @@ st.markdown("<br>", unsafe_allow_html=True)
 # ── 세션 상태 초기화 ──
 if "admin_ok" not in st.session_state:
     st.session_state.admin_ok = False
-if "edit_index" not in st.session_state:
-    st.session_state.edit_index = None
+if "edit_id" not in st.session_state:
+    st.session_state.edit_id = None
+if "comment_cursor" not in st.session_state:
+    st.session_state.comment_cursor = []  # 지나온 페이지들의 before_id 스택 (비어 있으면 최신 페이지)
 
 # ── [3] 기능 안내 ────────────────────────────────
 with st.expander("🔍 주요 분석 기능 보기", expanded=False):
@@ -183,19 +174,18 @@ with st.form("comment_form", clear_on_submit=True):
         if not comment_text.strip():
             st.warning("내용을 입력해주세요!")
         else:
-            comments = load_json(COMMENT_FILE, [])
-            comments.insert(0, {
-                "nickname": nickname.strip() or "익명 투자자", "mood": mood, "text": comment_text.strip(),
-                "time": datetime.now().strftime("%Y-%m-%d %H:%M")
-            })
-            if save_json(COMMENT_FILE, comments[:100]):
-                st.success("✅ 등록되었습니다!")
-                st.rerun()
+            add_comment(nickname.strip() or "익명 투자자", mood, comment_text.strip())
+            st.session_state.comment_cursor = []
+            st.success("✅ 등록되었습니다!")
+            st.rerun()
 
-comments = load_json(COMMENT_FILE, [])
+total_comments = count_comments()
+cursor = st.session_state.comment_cursor
+comments = list_comments(COMMENT_PAGE + 1, cursor[-1] if cursor else None)  # 한 개 더 읽어 다음 페이지 유무 확인
+has_next, comments = len(comments) > COMMENT_PAGE, comments[:COMMENT_PAGE]
 if comments:
-    st.markdown(f"**총 {len(comments)}개 의견**")
-    for i, c in enumerate(comments):
+    st.markdown(f"**총 {total_comments}개 의견**")
+    for c in comments:
         col1, col2 = st.columns([9, 1])
         with col1:
             st.markdown(f"""
@@ -205,11 +195,22 @@ if comments:
             </div>""", unsafe_allow_html=True)
         with col2:
             if st.session_state.admin_ok:
-                if st.button("🗑️", key=f"del_comment_{i}", help="댓글 삭제"):
-                    comments.pop(i)
-                    save_json(COMMENT_FILE, comments)
+                if st.button("🗑️", key=f"del_comment_{c['id']}", help="댓글 삭제"):
+                    delete_comment(c['id'])
                     st.rerun()
 
+    if cursor or has_next:
+        p1, p2, p3 = st.columns([1, 2, 1])
+        with p1:
+            if cursor and st.button("⬅️ 최근", key="comment_prev"):
+                cursor.pop()
+                st.rerun()
+        with p2: st.caption(f"{len(cursor) + 1}페이지")
+        with p3:
+            if has_next and st.button("이전 ➡️", key="comment_next"):
+                cursor.append(comments[-1]['id'])
+                st.rerun()
+
 st.markdown("---")
 
 # ── [5] 업데이트 로그 및 관리자 기능 ────────────────
@@ -228,7 +229,7 @@ with st.expander("🔐 관리자 로그인", expanded=False):
         st.success("✅ 관리자로 로그인 중입니다.")
         if st.button("로그아웃", key="logout_btn"):
             st.session_state.admin_ok = False
-            st.session_state.edit_index = None
+            st.session_state.edit_id = None
             st.rerun()
 
 if st.session_state.admin_ok:
@@ -245,26 +246,17 @@ if st.session_state.admin_ok:
             if st.form_submit_button("📝 추가", use_container_width=True):
                 if not new_title.strip(): st.warning("제목을 입력해주세요!")
                 else:
-                    updates = load_json(UPDATE_FILE, DEFAULT_UPDATES)
-                    updates.append({"version": new_version.strip() or "v?", "date": new_date.strip(),
-                                    "title": new_title.strip(), "desc": new_desc.strip(), "tags": new_tags})
-                    
-                    # 💡 [핵심] 버전(version) 기준 내림차순(최신순) 자동 정렬 로직!
-                    updates.sort(key=lambda x: x.get('version', ''), reverse=True)
-                    
-                    if save_json(UPDATE_FILE, updates):
-                        st.success("✅ 추가 및 자동 정렬되었습니다!")
-                        st.rerun()
+                    add_update(new_version.strip() or "v?", new_date.strip(), new_title.strip(), new_desc.strip(), new_tags)
+                    st.success("✅ 추가 및 자동 정렬되었습니다!")
+                    st.rerun()
         
 
-updates = load_json(UPDATE_FILE, DEFAULT_UPDATES)
-
-# 불러온 데이터도 항상 버전을 기준으로 내림차순 정렬하여 보여줍니다.
-updates.sort(key=lambda x: x.get('version', ''), reverse=True)
+# 💡 [핵심] 버전(version) 기준 내림차순(최신순) 정렬은 DB 인덱스로 처리합니다.
+updates = list_updates()
 
-for i, u in enumerate(updates):
-    if st.session_state.edit_index == i:
-        with st.form(key=f"edit_form_{i}"):
+for u in updates:
+    if st.session_state.edit_id == u['id']:
+        with st.form(key=f"edit_form_{u['id']}"):
             st.markdown("#### ✏️ 업데이트 기록 수정")
             c1, c2 = st.columns([1, 1])
             with c1: e_version = st.text_input("버전", value=u.get('version', ''))
@@ -280,16 +272,12 @@ for i, u in enumerate(updates):
             col_save, col_cancel = st.columns(2)
             with col_save:
                 if st.form_submit_button("💾 변경사항 저장", use_container_width=True):
-                    updates[i] = {"version": e_version.strip(), "date": e_date.strip(), 
-                                  "title": e_title.strip(), "desc": e_desc.strip(), "tags": e_tags}
-                    # 💡 수정 후에도 다시 한번 버전 순 정렬!
-                    updates.sort(key=lambda x: x.get('version', ''), reverse=True)
-                    save_json(UPDATE_FILE, updates)
-                    st.session_state.edit_index = None
+                    edit_update(u['id'], e_version.strip(), e_date.strip(), e_title.strip(), e_desc.strip(), e_tags)
+                    st.session_state.edit_id = None
                     st.rerun()
             with col_cancel:
                 if st.form_submit_button("❌ 취소", use_container_width=True):
-                    st.session_state.edit_index = None
+                    st.session_state.edit_id = None
                     st.rerun()
     else:
         tags_html = "".join(render_tag(t) for t in u.get("tags", []))
@@ -305,14 +293,13 @@ for i, u in enumerate(updates):
         if st.session_state.admin_ok:
             c1, c2, c3 = st.columns([1, 1, 8])
             with c1:
-                if st.button("✏️", key=f"edit_btn_{i}", help="수정"):
-                    st.session_state.edit_index = i
+                if st.button("✏️", key=f"edit_btn_{u['id']}", help="수정"):
+                    st.session_state.edit_id = u['id']
                     st.rerun()
             with c2:
-                if st.button("🗑️", key=f"del_update_{i}", help="삭제"):
-                    updates.pop(i)
-                    save_json(UPDATE_FILE, updates)
-                    st.session_state.edit_index = None
+                if st.button("🗑️", key=f"del_update_{u['id']}", help="삭제"):
+                    delete_update(u['id'])
+                    st.session_state.edit_id = None
                     st.rerun()
 
 st.markdown("---")
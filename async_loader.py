@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from data_fetcher import UNIVERSES, HISTORY_GROUPS, STREAM_CHUNK, unique_symbols, period_start, fetch_batch, _clean_closes, _entries_from_closes, _attach_store, _fan_out
+from fetch_executor import FetchReport
+from macro_cache import get_macro_series, get_score_history, MACRO_SYMBOLS
+from macro_weather import score_macro_weather
+from calculations import calculate_individual_metrics, calculate_sector_scores_state, calculate_core_sector_scores_state
+from instrumentation import stage
+
+# ── 비동기 적재: 매크로 / 바텀업 그룹별 수신 / 그룹별 점수 계산을 한 이벤트 루프에서 겹쳐 실행 ──
+# 💡 수신·계산 함수는 모두 동기(블로킹) 함수라 asyncio.to_thread로 돌리고, 루프는 작업 사이의 의존성만 잇습니다.
+#    그래서 콜드 적재 시간은 단계들의 합이 아니라 가장 느린 경로(보통 가장 큰 그룹의 수신 + 점수 계산)에 가까워집니다.
+SCORERS = {
+    'sector_etfs': calculate_sector_scores_state,
+    'individual_stocks': calculate_individual_metrics,
+    'core_sectors': calculate_core_sector_scores_state,
+}
+LOADER_WORKERS = 8  # 동시에 도는 블로킹 단계 수 상한 (매크로 1 + 그룹별 수신 + 그룹별 점수 계산)
+
+_loop = {'loop': None}
+_loop_lock = threading.Lock()
+
+def _background_loop():
+    """페이지 재실행과 무관하게 계속 도는 데몬 스레드의 이벤트 루프 (처음 부를 때 시작)"""
+    with _loop_lock:
+        if _loop['loop'] is None:
+            loop = asyncio.new_event_loop()
+            loop.set_default_executor(ThreadPoolExecutor(max_workers=LOADER_WORKERS, thread_name_prefix='async-loader'))
+            threading.Thread(target=loop.run_forever, name='async-loader', daemon=True).start()
+            _loop['loop'] = loop
+        return _loop['loop']
+
+def _owners(universes):
+    """여러 그룹에 겹치는 티커는 처음 나온 그룹 하나만 받도록 나눔 → {그룹: [티커]}"""
+    seen, out = set(), {}
+    for group, tickers in universes.items():
+        out[group] = [t for t in unique_symbols(tickers) if t not in seen]
+        seen.update(out[group])
+    return out
+
+def _fetch_group(group, symbols, keep, provider, report, chunk):
+    """그룹 하나의 심볼을 chunk개씩 받아 지표 entry로 접고, 차트용 이력(keep)만 남김"""
+    entries, kept = {}, {}
+    with stage('async:fetch_group', group=group, symbols=len(symbols)):
+        for i in range(0, len(symbols), chunk):
+            closes = _clean_closes(fetch_batch(symbols[i:i + chunk], provider, report=report))
+            entries.update(_entries_from_closes(closes))
+            kept.update((t, c) for t, c in closes.items() if t in keep)
+        _attach_store(entries, kept)
+    return entries
+
+def _score_group(group, data):
+    with stage(f'async:score:{group}'):
+        return SCORERS[group](data)
+
+def _load_macro(provider):
+    with stage('async:macro'):
+        macro = score_macro_weather(get_macro_series(MACRO_SYMBOLS, start=period_start('1y'), provider=provider))
+        return macro, get_score_history(provider=provider)
+
+async def load_macro(provider=None):
+    """(매크로 날씨, 점수 이력)"""
+    return await asyncio.to_thread(_load_macro, provider)
+
+async def load_market(provider=None, universes=None, history_groups=None, chunk=STREAM_CHUNK):
+    """모든 유니버스의 지표 entry + 그룹별 점수표 → {'market': data, 'scores': {그룹: DataFrame}}
+
+    data는 {그룹: {이름: entry}, 'fetch_report': 실패/타임아웃 심볼 목록}이고, 가격 이력은 history_groups
+    (기본: 설정의 history 그룹, 상세 차트용) 종목만 MarketStore에 남깁니다.
+    그룹마다 수신 작업을 따로 띄우고, 점수 계산은 자기 티커를 받는 그룹들의 수신만 끝나면 바로 시작합니다.
+    (예: 섹터 ETF 점수는 개별 종목 수천 개의 수신을 기다리지 않음)
+    """
+    t0 = time.monotonic()
+    universes = universes or UNIVERSES
+    keep = set(unique_symbols(*(universes[g] for g in (HISTORY_GROUPS if history_groups is None else history_groups) if g in universes)))
+    report = FetchReport()
+    owners = _owners(universes)
+    owner_of = {t: g for g, syms in owners.items() for t in syms}
+    fetches = {g: asyncio.create_task(asyncio.to_thread(_fetch_group, g, syms, keep, provider, report, chunk))
+               for g, syms in owners.items() if syms}
+
+    async def group_data(group):
+        needed = {owner_of[t] for t in universes[group].values()}
+        entries = {}
+        for part in await asyncio.gather(*(fetches[g] for g in needed)):
+            entries.update(part)
+        return _fan_out(universes[group], entries)
+
+    async def group_scores(group):
+        data = await group_data(group)
+        return data, (await asyncio.to_thread(_score_group, group, data) if group in SCORERS else None)
+
+    groups = list(universes)
+    results = await asyncio.gather(*(group_scores(g) for g in groups))
+    data = {g: r[0] for g, r in zip(groups, results)}
+    report.elapsed = time.monotonic() - t0  # 그룹별 수신이 겹치므로 합계 대신 벽시계 시간
+    data['fetch_report'] = report.to_dict()
+    return {'market': data, 'scores': {g: r[1] for g, r in zip(groups, results) if r[1] is not None}}
+
+async def load_page(provider=None):
+    """위험알리미 한 화면 분량 (매크로 + 바텀업)을 동시에 → {'macro': (날씨, 이력), 'market': ..., 'scores': ...}
+
+    매크로(1998년~)와 섹터 그룹(3년)은 XLY/XLP 등을 같이 받지만, price_store.refresh가 심볼별 잠금으로
+    겹치는 심볼만 차례대로 갱신하므로 임시 파일/메타가 서로 덮이지 않습니다.
+    """
+    macro, market = await asyncio.gather(load_macro(provider), load_market(provider))
+    return {'macro': macro, **market}
+
+def submit(coro):
+    """코루틴을 백그라운드 루프에 걸고 바로 반환 → concurrent.futures.Future
+
+    스트림릿 스크립트 스레드에서 .result()로 필요한 순서대로 기다리면 됩니다.
+    (예: 매크로/바텀업을 둘 다 걸어 두고, 매크로 카드는 매크로 Future만 끝나면 그림)
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop())
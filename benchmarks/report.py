@@ -0,0 +1,36 @@
+"""벤치마크 스크립트 공용 출력: JSON lines 기록(emit)과 이전 실행과의 비교표(compare)"""
+import json
+import sys
+
+def make_emitter(meta, out=None):
+    """(records, emit) 반환 — emit(record)는 records에 모으고 meta를 붙여 out 파일에 덧붙임 (없으면 stdout)"""
+    records = []
+    def emit(record):
+        records.append(record)
+        line = json.dumps({**meta, **record}, ensure_ascii=False)
+        if out:
+            with open(out, 'a', encoding='utf-8') as f: f.write(line + '\n')
+        else: print(line, flush=True)
+    return records, emit
+
+def compare(base_path, records, key, columns):
+    """이전 실행(base_path)과 같은 키의 기록끼리 소요 시간을 stderr 표로 비교
+
+    key(record)는 비교 키 튜플(대상이 아니면 None), columns는 그 튜플 각 칸의 [(머리글, 너비)]입니다.
+    첫 칸은 왼쪽, 나머지는 오른쪽 정렬이고 None 칸은 '-'로 찍습니다. seconds가 없는 기록은 건너뜁니다.
+    """
+    base = {}
+    with open(base_path, encoding='utf-8') as f:
+        for line in f:
+            r = json.loads(line)
+            k = key(r)
+            if k is not None and r.get('seconds') is not None: base[k] = r
+    def _row(cells):
+        return ''.join(f"{c:<{w}}" if i == 0 else f"{c:>{w}}" for i, (c, (_, w)) in enumerate(zip(cells, columns)))
+    print(_row([title for title, _ in columns]) + f"{'base(s)':>11}{'new(s)':>11}{'ratio':>8}", file=sys.stderr)
+    for r in records:
+        k = key(r)
+        b = base.get(k) if k is not None else None
+        if not b or r.get('seconds') is None: continue
+        ratio = r['seconds'] / b['seconds'] if b['seconds'] else float('nan')
+        print(_row(['-' if c is None else str(c) for c in k]) + f"{b['seconds']:>11.4f}{r['seconds']:>11.4f}{ratio:>8.2f}", file=sys.stderr)
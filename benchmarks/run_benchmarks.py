@@ -0,0 +1,182 @@
+"""오프라인 벤치마크 (네트워크 없이 합성 데이터로 스코어링/백테스트 경로 측정)
+
+사용법:
+    python benchmarks/run_benchmarks.py                       # 기본 규모, JSON lines를 stdout으로
+    python benchmarks/run_benchmarks.py --tickers 30 3000 --years 3 30 --out runs.jsonl
+    python benchmarks/run_benchmarks.py --compare base.jsonl --out new.jsonl   # 이전 실행과 비교
+"""
+import argparse
+import gc
+import os
+import pickle
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+for p in (parent_dir, current_dir):
+    if p not in sys.path:
+        sys.path.append(p)
+
+import numpy as np
+import pandas as pd
+
+from data_fetcher import _build_entries
+from calculations import (calculate_sector_scores, calculate_individual_metrics, calculate_core_sector_scores,
+                          close_panel, calculate_sector_scores_panel, calculate_core_sector_scores_panel,
+                          calculate_sector_scores_state, calculate_core_sector_scores_state)
+from indicators import IndicatorState, reset_states
+from v8_strategy import build_v8_frame, calculate_signals, calculate_signals_reference, calc_performance
+from v8_batch import build_v8_panel, run_batch, simulate_panel
+from event_study import event_windows
+from rotation import sector_score_history, rotation_backtest
+from macro_weather import score_macro_weather, score_history, extend_score_history
+from synthetic import make_ohlc, make_macro, make_universe
+from report import make_emitter, compare
+
+def _git_rev():
+    try: return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=parent_dir, capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except Exception: return None
+
+def measure(fn, repeat):
+    """(최소 시간, 중앙값, 최대 메모리 바이트) — 메모리는 tracemalloc 오버헤드를 피해 별도 1회 실행으로 측정"""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), statistics.median(times), peak
+
+def universe_cases(n_tickers, years, seed):
+    """종목 수에 비례하는 경로 (수신 후처리 + 섹터/개별/핵심 섹터 스코어)"""
+    universe = make_universe(n_tickers)
+    frames = make_ohlc(list(universe.values()), years, seed)
+    entries = _build_entries(frames)
+    close, tickers = close_panel(entries)
+    states = [IndicatorState.from_series(f['Close']) for f in frames.values()]
+    days = iter(pd.bdate_range(max(s.last_date for s in states) + pd.Timedelta(days=1), periods=100000))  # 반복 실행마다 다음 거래일
+    blob = pickle.dumps(entries)  # st.cache_data였다면 재실행마다 치렀을 역직렬화 비용
+    macro = make_macro(years, seed)
+    closes = pd.DataFrame({t: f['Close'] for t, f in frames.items()})
+    panel = build_v8_panel(closes, macro)
+    run = simulate_panel(panel, panel['index'][0].year)
+    events = [{'date': d, 'name': f'E{i}'} for i, d in enumerate(panel['index'][250::20])]  # 20거래일마다 이벤트 하나
+    rot_scores = sector_score_history(close)
+    return [
+        ('fetch_postprocess_cold', lambda: (reset_states(), _build_entries(frames))),  # 새 프로세스: 심볼마다 이력으로 초기화
+        ('fetch_postprocess_warm', lambda: _build_entries(frames)),                    # 새 봉 없는 재갱신: 보관 중인 상태 재사용
+        ('calculate_sector_scores', lambda: calculate_sector_scores(entries)),
+        ('calculate_sector_scores_panel', lambda: calculate_sector_scores_panel(*close_panel(entries))),
+        ('calculate_sector_scores_state', lambda: calculate_sector_scores_state(entries)),
+        ('calculate_individual_metrics', lambda: calculate_individual_metrics(entries)),
+        ('calculate_core_sector_scores', lambda: calculate_core_sector_scores(entries)),
+        ('calculate_core_sector_scores_panel', lambda: calculate_core_sector_scores_panel(close, tickers)),
+        ('calculate_core_sector_scores_state', lambda: calculate_core_sector_scores_state(entries)),
+        ('indicator_append_bar', lambda: [s.update(d, s.current) for d in [next(days)] for s in states]),
+        ('cache_payload_loads', lambda: pickle.loads(blob)),
+        ('v8_batch_panel', lambda: build_v8_panel(closes, macro)),
+        ('v8_batch_run', lambda: run_batch(panel, panel['index'][0].year)),
+        ('event_windows', lambda: event_windows(run, events)),
+        ('sector_score_history', lambda: sector_score_history(close)),
+        ('rotation_backtest', lambda: rotation_backtest(close, rot_scores, benchmark=close.columns[0])),
+    ], n_tickers, {'cache_payload_loads': {'payload_mb': round(len(blob) / 2**20, 2)}}
+
+def history_cases(years, seed):
+    """기간 길이에 비례하는 경로 (V8 신호/성과, 매크로 날씨 점수)"""
+    close = make_ohlc(['QQQ'], years + 1, seed)['QQQ'][['Close']]
+    macro = make_macro(years + 1, seed)
+    v8 = build_v8_frame(close, macro)
+    sig = calculate_signals(v8, 'QQQ')
+    start_year = v8.index[0].year + 1
+    prev_history = score_history(macro.iloc[:-1])  # 새 봉 하나를 덧붙이는 갱신
+    return [
+        ('calculate_signals', lambda: calculate_signals(v8, 'QQQ')),
+        ('calc_performance', lambda: calc_performance(sig, 'QQQ', start_year)),
+        ('score_macro_weather', lambda: score_macro_weather(macro)),
+        ('score_history', lambda: score_history(macro)),
+        ('extend_score_history', lambda: extend_score_history(prev_history, macro)),
+    ], len(v8)
+
+def run_checks(seed):
+    """벡터 엔진이 기존 구현과 같은 결과를 내는지 확인"""
+    close = make_ohlc(['QQQ'], 26, seed)['QQQ'][['Close']]
+    v8 = build_v8_frame(close, make_macro(26, seed))
+    checks = {f'signals_{t}': calculate_signals(v8, t).equals(calculate_signals_reference(v8, t)) for t in ['QQQ', 'TQQQ']}
+    entries = _build_entries(make_ohlc(list(make_universe(300).values()), 3, seed))
+    checks['sector_scores_panel'] = calculate_sector_scores(entries).equals(calculate_sector_scores_panel(*close_panel(entries)))
+    checks['core_sector_scores_panel'] = calculate_core_sector_scores(entries).equals(calculate_core_sector_scores_panel(*close_panel(entries)))
+    checks['sector_scores_state'] = calculate_sector_scores(entries).equals(calculate_sector_scores_state(entries))
+    checks['core_sector_scores_state'] = calculate_core_sector_scores(entries).equals(calculate_core_sector_scores_state(entries))
+    close, tickers = close_panel(entries)
+    history = sector_score_history(close)
+    for cut in (260, len(close)):  # 과거 임의 시점의 순위/S-L이 그 시점까지 자른 패널의 표와 같은지
+        table = calculate_sector_scores_panel(close.iloc[:cut], tickers)
+        day = pd.DataFrame({'S-L': history['S-L'].iloc[cut - 1], 'rank': history['rank'].iloc[cut - 1]}).sort_values('rank')
+        checks[f'sector_score_history_{cut}'] = list(day.index) == table['섹터'].tolist() and np.allclose(day['S-L'].to_numpy(), table['S-L'].to_numpy(), atol=5e-4)
+    frames, macro = make_ohlc(['QQQ', 'TQQQ', 'SPY'], 26, seed), make_macro(26, seed)
+    history = score_history(macro)
+    checks['score_history_last'] = bool(np.isclose(history['Score'].iloc[-1], score_macro_weather(macro.iloc[-252:])[0]))
+    extended = extend_score_history(score_history(macro.iloc[:-30]), macro)  # 롤링 합 시작점이 달라 마지막 자리 오차만 허용
+    checks['extend_score_history'] = extended['Weather'].equals(history['Weather']) and np.allclose(
+        extended.drop(columns='Weather').to_numpy(dtype='float64'), history.drop(columns='Weather').to_numpy(dtype='float64'), equal_nan=True)
+    batch = run_batch(build_v8_panel(pd.DataFrame({t: f['Close'] for t, f in frames.items()}), macro), 2005).set_index('티커')
+    for t, f in frames.items():
+        perf = calc_performance(calculate_signals(build_v8_frame(f[['Close']], macro), t), t, 2005)
+        years = (perf.index[-1] - perf.index[0]).days / 365.25
+        single = [(perf['cum_strat'].iloc[-1] ** (1 / years) - 1) * 100, perf['dd_strat'].min(), perf['dd_bah'].min()]
+        checks[f'v8_batch_{t}'] = np.allclose(batch.loc[t, ['전략 CAGR(%)', '전략 MDD(%)', '존버 MDD(%)']].to_numpy(dtype='float64'), single)
+    return checks
+
+def _bench_key(r):
+    return (r['bench'], r.get('tickers'), r.get('years')) if 'bench' in r else None
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="합성 데이터 오프라인 벤치마크")
+    ap.add_argument('--tickers', type=int, nargs='+', default=[30, 300, 3000])
+    ap.add_argument('--years', type=int, nargs='+', default=[3, 10, 30])
+    ap.add_argument('--repeat', type=int, default=3)
+    ap.add_argument('--seed', type=int, default=42)
+    ap.add_argument('--max-bars', type=float, default=6e6, help="종목 수 × 거래일이 이보다 크면 건너뜀")
+    ap.add_argument('--out', help="결과 JSON lines를 덧붙일 파일 (없으면 stdout)")
+    ap.add_argument('--compare', help="비교할 이전 실행 JSON lines 파일")
+    ap.add_argument('--no-check', action='store_true', help="동등성 검사 생략")
+    args = ap.parse_args(argv)
+
+    meta = {'run': time.strftime('%Y-%m-%dT%H:%M:%S'), 'git': _git_rev(), 'python': platform.python_version(),
+            'numpy': np.__version__, 'pandas': pd.__version__, 'machine': platform.machine()}
+    records, emit = make_emitter(meta, args.out)
+
+    if not args.no_check:
+        for name, ok in run_checks(args.seed).items():
+            emit({'check': name, 'ok': bool(ok)})
+
+    for years in args.years:
+        for n in args.tickers:
+            if n * years * 252 > args.max_bars: continue
+            cases, items, extra = universe_cases(n, years, args.seed)
+            for name, fn in cases:
+                best, median, peak = measure(fn, args.repeat)
+                emit({'bench': name, 'tickers': n, 'years': years, 'seconds': round(best, 6), 'median': round(median, 6),
+                      'throughput': round(items / best, 2), 'unit': 'tickers/s', 'peak_mb': round(peak / 2**20, 2), **extra.get(name, {})})
+        cases, rows = history_cases(years, args.seed)
+        for name, fn in cases:
+            best, median, peak = measure(fn, args.repeat)
+            emit({'bench': name, 'tickers': None, 'years': years, 'rows': rows, 'seconds': round(best, 6), 'median': round(median, 6),
+                  'throughput': round(rows / best, 2), 'unit': 'rows/s', 'peak_mb': round(peak / 2**20, 2)})
+
+    if args.compare:
+        compare(args.compare, records, _bench_key, [('bench', 36), ('tickers', 8), ('years', 6)])
+    return 0 if all(r.get('ok', True) for r in records) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""콜드 스타트 프로파일 (모듈별 import 시간 + 페이지별 첫 렌더 시간, 측정마다 새 파이썬 프로세스)
+
+사용법:
+    python benchmarks/startup_profile.py                          # 기본 모듈/페이지, JSON lines를 stdout으로
+    python benchmarks/startup_profile.py --pages app.py --out startup.jsonl
+    python benchmarks/startup_profile.py --compare base.jsonl     # 이전 실행과 비교
+
+페이지 첫 렌더는 streamlit AppTest로 한 번 실행한 시간입니다. 네트워크 없이 재려면
+SNAPSHOT_DIR / PRICE_STORE_DIR 환경 변수로 미리 만든 스냅샷·가격 저장소를 가리키면 됩니다.
+"""
+import argparse
+import os
+import platform
+import subprocess
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if current_dir not in sys.path:
+    sys.path.append(current_dir)
+
+from report import make_emitter, compare
+
+# 첫 화면에 필요 없으면 필요한 경로에서만 불러야 하는 무거운 모듈
+HEAVY = ['yfinance', 'plotly.graph_objects', 'plotly.subplots', 'matplotlib', 'pyarrow.parquet', 'scipy']
+MODULES = ['numpy', 'pandas', 'streamlit', 'pyarrow.parquet', 'yfinance', 'plotly.graph_objects', 'plotly.subplots', 'matplotlib',
+           'data_fetcher', 'price_store', 'macro_cache', 'calculations', 'async_loader', 'snapshots', 'v8_strategy', 'board_store']
+PAGES = ['app.py', os.path.join('pages', '매크로위험알리미.py'), os.path.join('pages', '백테스트.py')]
+
+_IMPORT_CHILD = """
+import sys
+__import__({mod!r})
+print({{'heavy': [m for m in {heavy!r} if m in sys.modules]}})
+"""
+
+_PAGE_CHILD = """
+import sys, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+t1 = time.perf_counter()
+at = AppTest.from_file({path!r}, default_timeout={timeout!r})
+at.run()
+t2 = time.perf_counter()
+print({{'seconds': t2 - t1, 'harness': t1 - t0, 'exceptions': [str(e.value)[:200] for e in at.exception],
+        'heavy': [m for m in {heavy!r} if m in sys.modules]}})
+"""
+
+def _child(code, timeout, importtime=False):
+    """새 인터프리터에서 code 실행 → (마지막 줄 dict, stderr)"""
+    cmd = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', code]
+    proc = subprocess.run(cmd, cwd=parent_dir, capture_output=True, text=True, timeout=timeout,
+                          env={**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [parent_dir, os.environ.get('PYTHONPATH')]))})
+    if proc.returncode != 0: raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}")
+    return eval(proc.stdout.strip().splitlines()[-1]), proc.stderr
+
+def _import_cumulative(stderr, mod):
+    """-X importtime 출력에서 최상위(들여쓰기 없는) import 한 줄의 누적 시간(초)"""
+    for line in reversed(stderr.splitlines()):
+        parts = line.split('|')
+        if not line.startswith('import time:') or len(parts) != 3 or not parts[1].strip().isdigit(): continue
+        if parts[2][1:] == mod: return int(parts[1]) / 1e6
+    return None
+
+def profile_import(mod, timeout):
+    got, stderr = _child(_IMPORT_CHILD.format(mod=mod, heavy=HEAVY), timeout, importtime=True)
+    return {'import': mod, 'seconds': _import_cumulative(stderr, mod), 'heavy': got['heavy']}
+
+def profile_page(page, timeout):
+    got, _ = _child(_PAGE_CHILD.format(path=os.path.join(parent_dir, page), timeout=timeout, heavy=HEAVY), timeout + 60)
+    return {'page': page, 'seconds': round(got['seconds'], 4), 'harness': round(got['harness'], 4),
+            'exceptions': got['exceptions'], 'heavy': got['heavy']}
+
+def _target_key(r):
+    target = r.get('import') or r.get('page')
+    return (target,) if target else None
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="콜드 스타트 프로파일 (import / 첫 렌더)")
+    ap.add_argument('--modules', nargs='*', default=MODULES)
+    ap.add_argument('--pages', nargs='*', default=PAGES)
+    ap.add_argument('--timeout', type=float, default=300, help="페이지 첫 렌더 제한 시간(초)")
+    ap.add_argument('--out', help="결과 JSON lines를 덧붙일 파일 (없으면 stdout)")
+    ap.add_argument('--compare', help="비교할 이전 실행 JSON lines 파일")
+    args = ap.parse_args(argv)
+
+    meta = {'run': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(), 'machine': platform.machine()}
+    records, emit = make_emitter(meta, args.out)
+
+    for mod in args.modules:
+        try: emit(profile_import(mod, args.timeout))
+        except Exception as e: emit({'import': mod, 'seconds': None, 'error': f"{type(e).__name__}: {e}"})
+    for page in args.pages:
+        try: emit(profile_page(page, args.timeout))
+        except Exception as e: emit({'page': page, 'seconds': None, 'error': f"{type(e).__name__}: {e}"})
+
+    if args.compare:
+        compare(args.compare, records, _target_key, [('import/page', 40)])
+    return 0 if all(r.get('seconds') is not None and not r.get('exceptions') for r in records) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+# ── 네트워크 없이 쓰는 합성 시장 데이터 (시드 고정 → 실행마다 같은 데이터) ──
+TRADING_DAYS = 252
+END_DATE = '2026-01-30'
+
+def make_ohlc(symbols, years=3, seed=0, end=END_DATE):
+    """심볼별 기하 브라운 운동 OHLCV DataFrame {심볼: DataFrame}"""
+    rng = np.random.default_rng(seed)
+    n = int(TRADING_DAYS * years)
+    idx = pd.bdate_range(end=end, periods=n, name='Date')
+    drift = rng.normal(0.0003, 0.0003, len(symbols))
+    vol = rng.uniform(0.008, 0.03, len(symbols))
+    close = 50 * np.exp(np.cumsum(rng.standard_normal((n, len(symbols))) * vol + drift, axis=0))
+    spread = np.abs(rng.standard_normal((n, len(symbols)))) * vol * close
+    frames = {}
+    for j, sym in enumerate(symbols):
+        c = close[:, j]
+        frames[sym] = pd.DataFrame({'Open': c + spread[:, j] * 0.3, 'High': c + spread[:, j], 'Low': c - spread[:, j],
+                                    'Close': c, 'Volume': rng.integers(1e5, 1e7, n).astype('float64')}, index=idx)
+    return frames
+
+def make_macro(years=3, seed=0, end=END_DATE):
+    """매크로 종가 (날짜 × ^VIX/^OVX/^TNX/^IRX/HYG/DX-Y.NYB/XLY/XLP)"""
+    rng = np.random.default_rng(seed + 1)
+    n = int(TRADING_DAYS * years)
+    idx = pd.bdate_range(end=end, periods=n, name='Date')
+    walk = lambda s: np.cumsum(rng.normal(0, s, n))
+    vix = np.clip(17 + 6 * np.sin(np.arange(n) / 90) + walk(0.6) * 0.2 + rng.gamma(1.0, 2.5, n), 9, 85)
+    df = pd.DataFrame({
+        '^VIX': vix, '^OVX': np.clip(32 + walk(0.8) * 0.3 + rng.gamma(1.0, 3, n), 15, 150),
+        '^TNX': np.clip(3.5 + walk(0.03), 0.3, 8), '^IRX': np.clip(3.0 + walk(0.03), 0.01, 7),
+        'HYG': 80 * np.exp(walk(0.004)), 'DX-Y.NYB': 100 * np.exp(walk(0.003)),
+        'XLY': 150 * np.exp(walk(0.012)), 'XLP': 70 * np.exp(walk(0.007)),
+    }, index=idx)
+    return df
+
+def make_universe(n_tickers, prefix='T'):
+    """{이름: 티커} 유니버스"""
+    return {f"{prefix}{i:04d}": f"{prefix}{i:04d}" for i in range(n_tickers)}
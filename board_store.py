@@ -0,0 +1,133 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+# ── 방문자 댓글 / 업데이트 로그 저장소 (SQLite WAL: 행 단위 원자적 추가·삭제) ──
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BOARD_DB = os.environ.get('BOARD_DB', os.path.join(BASE_DIR, 'data', 'board.db'))
+COMMENT_PAGE = 20  # 한 화면에 보여줄 댓글 수
+SCHEMA_VERSION = 1  # PRAGMA user_version — 0이면 아직 스키마를 만들지 않은(또는 이 기록 이전의) DB
+
+_init_lock = threading.Lock()
+_ready = set()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS comments (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,  -- 최신순 페이지는 rowid 역순으로 바로 읽음
+    nickname TEXT NOT NULL,
+    mood     TEXT NOT NULL DEFAULT '',
+    text     TEXT NOT NULL,
+    time     TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS updates (
+    id      INTEGER PRIMARY KEY AUTOINCREMENT,
+    version TEXT NOT NULL DEFAULT '',
+    date    TEXT NOT NULL DEFAULT '',
+    title   TEXT NOT NULL,
+    desc    TEXT NOT NULL DEFAULT '',
+    tags    TEXT NOT NULL DEFAULT '[]'          -- JSON 배열
+);
+CREATE INDEX IF NOT EXISTS idx_updates_version ON updates(version DESC, id DESC);
+"""
+
+@contextmanager
+def _db(path=None):
+    """연결 하나를 열어 트랜잭션으로 실행 (성공 시 commit, 예외 시 rollback)"""
+    path = path or BOARD_DB
+    if path not in _ready: init_db(path)
+    conn = sqlite3.connect(path, timeout=10)
+    conn.row_factory = sqlite3.Row
+    try:
+        with conn: yield conn
+    finally:
+        conn.close()
+
+def init_db(path=None, legacy_comments=None, legacy_updates=None, default_updates=()):
+    """테이블 생성 + WAL 설정, 처음 만들 때는 예전 JSON 파일(또는 기본 업데이트 기록)을 옮겨 담음
+
+    옮겨 담기는 테이블을 처음 만드는 그 트랜잭션에서만 하고 user_version에 기록합니다.
+    (관리자가 댓글/업데이트를 모두 지운 뒤 재시작해도 예전 기록이 되살아나지 않음)
+    """
+    path = path or BOARD_DB
+    with _init_lock:
+        if path in _ready: return
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        conn = sqlite3.connect(path, timeout=10)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                fresh = conn.execute("PRAGMA user_version").fetchone()[0] == 0 and \
+                    conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name IN ('comments', 'updates')").fetchone()[0] == 0
+                conn.executescript(SCHEMA)
+                if fresh:
+                    # JSON은 최신 글이 앞에 있으므로 뒤집어서 넣어야 id 순서가 시간 순서가 됨
+                    rows = [(c.get('nickname', '익명 투자자'), c.get('mood', ''), c.get('text', ''), c.get('time', ''))
+                            for c in reversed(_read_json(legacy_comments, []))]
+                    conn.executemany("INSERT INTO comments (nickname, mood, text, time) VALUES (?, ?, ?, ?)", rows)
+                    rows = [(u.get('version', ''), u.get('date', ''), u.get('title', ''), u.get('desc', ''), json.dumps(u.get('tags', []), ensure_ascii=False))
+                            for u in _read_json(legacy_updates, None) or default_updates]
+                    conn.executemany("INSERT INTO updates (version, date, title, desc, tags) VALUES (?, ?, ?, ?, ?)", rows)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        finally:
+            conn.close()
+        _ready.add(path)
+
+def _read_json(path, default):
+    try:
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+    except Exception: pass
+    return default
+
+# ── 댓글 ──
+def add_comment(nickname, mood, text, time=None, path=None):
+    with _db(path) as conn:
+        cur = conn.execute("INSERT INTO comments (nickname, mood, text, time) VALUES (?, ?, ?, ?)",
+                           (nickname, mood, text, time or datetime.now().strftime("%Y-%m-%d %H:%M")))
+        return cur.lastrowid
+
+def delete_comment(comment_id, path=None):
+    """id로 삭제 (다른 세션이 그사이 글을 추가해도 엉뚱한 댓글이 지워지지 않음)"""
+    with _db(path) as conn:
+        return conn.execute("DELETE FROM comments WHERE id = ?", (comment_id,)).rowcount > 0
+
+def count_comments(path=None):
+    with _db(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM comments").fetchone()[0]
+
+def list_comments(limit=COMMENT_PAGE, before_id=None, path=None):
+    """최신순 한 페이지 (before_id보다 작은 id부터 — 글이 늘어나도 앞 페이지를 다시 훑지 않음)"""
+    with _db(path) as conn:
+        if before_id is None:
+            rows = conn.execute("SELECT * FROM comments ORDER BY id DESC LIMIT ?", (limit,))
+        else:
+            rows = conn.execute("SELECT * FROM comments WHERE id < ? ORDER BY id DESC LIMIT ?", (before_id, limit))
+        return [dict(r) for r in rows]
+
+# ── 업데이트 로그 ──
+def _update_row(r):
+    return {**dict(r), 'tags': json.loads(r['tags'] or '[]')}
+
+def list_updates(path=None):
+    """버전 내림차순 (같은 버전이면 나중에 쓴 것 먼저)"""
+    with _db(path) as conn:
+        return [_update_row(r) for r in conn.execute("SELECT * FROM updates ORDER BY version DESC, id DESC")]
+
+def add_update(version, date, title, desc, tags, path=None):
+    with _db(path) as conn:
+        return conn.execute("INSERT INTO updates (version, date, title, desc, tags) VALUES (?, ?, ?, ?, ?)",
+                            (version, date, title, desc, json.dumps(list(tags), ensure_ascii=False))).lastrowid
+
+def edit_update(update_id, version, date, title, desc, tags, path=None):
+    with _db(path) as conn:
+        return conn.execute("UPDATE updates SET version = ?, date = ?, title = ?, desc = ?, tags = ? WHERE id = ?",
+                            (version, date, title, desc, json.dumps(list(tags), ensure_ascii=False), update_id)).rowcount > 0
+
+def delete_update(update_id, path=None):
+    with _db(path) as conn:
+        return conn.execute("DELETE FROM updates WHERE id = ?", (update_id,)).rowcount > 0
@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from market_store import entry_history
 
 def _safe_float(series, iloc_pos=-1, default=0.0):
     """Series에서 안전하게 float 추출"""
@@ -22,7 +23,7 @@ def calculate_sector_scores(sector_data):
     results = []
     for name, data in sector_data.items():
         try:
-            hist = data['history']
+            hist = entry_history(data)
             current = data['current']
             ma200 = data.get('ma200', np.nan)
             close = hist['Close']
@@ -82,7 +83,7 @@ def calculate_core_sector_scores(core_data):
     results = []
     for name, data in core_data.items():
         try:
-            hist, current = data['history'], data['current']
+            hist, current = entry_history(data), data['current']
             ma20 = _safe_float(hist['MA20']) if 'MA20' in hist.columns else np.nan
             s_score = (current/ma20-1)*0.5 + _safe_return(hist['Close'], 21, current)*0.4
             results.append({'섹터': name, '티커': data['ticker'], 'S-SCORE': round(s_score, 2), '20일(%)': round(_safe_return(hist['Close'], 20, current)*100, 2)})
@@ -90,3 +91,133 @@ def calculate_core_sector_scores(core_data):
     df = pd.DataFrame(results).sort_values('S-SCORE', ascending=False).reset_index(drop=True)
     df.insert(0, 'R1', range(1, len(df) + 1))
     return df
+
+def top_rows(df, query=None, n=None, cols=('섹터', '티커'), sort_by=None):
+    """서버 쪽 검색(부분 일치, 대소문자 무시) + 정렬 + 상위 n개 — 화면에는 잘라 낸 행만 보냄"""
+    if df.empty: return df
+    if query and query.strip():
+        q = query.strip().lower()
+        mask = np.zeros(len(df), dtype=bool)
+        for c in cols:
+            if c in df.columns: mask |= df[c].astype(str).str.lower().str.contains(q, regex=False).to_numpy()
+        df = df[mask]
+    if sort_by: df = df.sort_values(sort_by, ascending=False, na_position='last')
+    return (df.head(n) if n else df).reset_index(drop=True)
+
+# ── 패널(날짜 × 종목) 벡터 엔진: 종목 수천 개도 배열 연산 몇 번으로 계산 ──
+def close_panel(data):
+    """{이름: entry} → (종가 패널 DataFrame[날짜 × 이름], {이름: 티커})
+
+    모든 entry가 같은 MarketStore를 가리키면 종목별 Series를 다시 맞추지 않고 배열에서 바로 잘라 냅니다.
+    """
+    tickers = {name: d['ticker'] for name, d in data.items()}
+    stores = {id(d.get('store')): d.get('store') for d in data.values()}
+    if len(stores) == 1 and None not in stores.values():
+        return next(iter(stores.values())).panel(tickers), tickers
+    return pd.DataFrame({name: entry_history(d)['Close'] for name, d in data.items()}), tickers
+
+def _bottom_align(close, rows=253):
+    """종목별 유효 종가만 아래쪽으로 밀착 정렬한 (종목 × rows) 배열과 종목별 봉 개수
+
+    종목마다 거래일(휴장일)이 달라도 마지막 행이 각자의 최신 봉이 되므로
+    .iloc[-k] 기반의 기존 계산과 같은 값을 얻습니다.
+    """
+    values = close.to_numpy(dtype='float64')
+    valid = ~np.isnan(values)
+    order = np.argsort(valid, axis=0, kind='stable')
+    aligned = np.take_along_axis(values, order, axis=0)[-rows:]
+    if len(aligned) < rows:
+        aligned = np.vstack([np.full((rows - len(aligned), values.shape[1]), np.nan), aligned])
+    return np.ascontiguousarray(aligned.T), valid.sum(axis=0)
+
+def _panel_return(a, n, lookback):
+    past = a[:, -lookback]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ret = np.where(past > 0, a[:, -1] / past - 1, 0.0)
+    return np.where(n >= lookback, ret, 0.0)
+
+def _round(values, ndigits):
+    # np.round와 내장 round는 .5 경계에서 결과가 갈리므로 기존 표와 같도록 내장 round 사용
+    return [round(v, ndigits) for v in values.tolist()]
+
+def calculate_sector_scores_panel(close, tickers):
+    """calculate_sector_scores와 같은 표를 종가 패널에서 한 번에 계산"""
+    close = close.loc[:, close.notna().any()]
+    if close.empty: return pd.DataFrame()
+    a, n = _bottom_align(close)
+    current = a[:, -1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ma200 = np.where(n >= 200, a[:, -200:].mean(axis=1), np.nan)
+        ma20 = np.where(n >= 20, a[:, -20:].mean(axis=1), np.nan)
+        high_52w, low_52w = np.nanmax(a[:, -252:], axis=1), np.nanmin(a[:, -252:], axis=1)
+
+        # L-score
+        ma200_dist = np.where(ma200 > 0, current / ma200 - 1, 0.0)
+        pos_52w = np.where(high_52w != low_52w, (current - low_52w) / (high_52w - low_52w), 0.5)
+        l_score = ma200_dist * 0.4 + pos_52w * 0.3 + _panel_return(a, n, 126) * 0.3
+
+        # S-score (20일 변동성: 최근 20개 일간 수익률의 표본 표준편차)
+        ma20_dist = np.where(ma20 > 0, current / ma20 - 1, 0.0)
+        rets = a[:, -20:] / a[:, -21:-1] - 1
+        cnt = (~np.isnan(rets)).sum(axis=1)
+        vol = np.nanstd(np.where(cnt[:, None] >= 2, rets, 0.0), axis=1, ddof=1)
+        vol = np.where((n >= 10) & (cnt >= 2) & ~np.isnan(vol), vol, 0.0)
+    s_score = ma20_dist * 0.5 + _panel_return(a, n, 21) * 0.4 - vol * 0.1
+
+    return _sector_table(close.columns, tickers, l_score, s_score, _panel_return(a, n, 20) * 100)
+
+def _sector_table(names, tickers, l_score, s_score, ret_20d):
+    # S-L 및 미너비니 강등 랭킹
+    s_l_value = s_score - l_score
+    rank_score = np.where(s_score < 0, s_l_value - 10, s_l_value)
+    df = pd.DataFrame({
+        '섹터': names, '티커': [tickers.get(c, c) for c in names],
+        'L-score': _round(l_score, 3), 'S-score': _round(s_score, 3),
+        'S-L': _round(s_l_value, 3), '20일(%)': _round(ret_20d, 2),
+        '_rank_score': rank_score
+    })
+    df = df.sort_values('_rank_score', ascending=False).reset_index(drop=True)
+    df = df.drop(columns=['_rank_score'])
+    df.insert(0, 'R', range(1, len(df) + 1))
+    return df
+
+def calculate_core_sector_scores_panel(close, tickers):
+    """calculate_core_sector_scores와 같은 표를 종가 패널에서 한 번에 계산 (20봉 미만 종목 제외)"""
+    close = close.loc[:, close.notna().sum() >= 20]
+    if close.empty: return pd.DataFrame()
+    a, n = _bottom_align(close, rows=22)
+    current = a[:, -1]
+    s_score = (current / a[:, -20:].mean(axis=1) - 1) * 0.5 + _panel_return(a, n, 21) * 0.4
+    return _core_table(close.columns, tickers, s_score, _panel_return(a, n, 20) * 100)
+
+def _core_table(names, tickers, s_score, ret_20d):
+    df = pd.DataFrame({'섹터': names, '티커': [tickers.get(c, c) for c in names],
+                       'S-SCORE': _round(s_score, 2), '20일(%)': _round(ret_20d, 2)})
+    df = df.sort_values('S-SCORE', ascending=False).reset_index(drop=True)
+    df.insert(0, 'R1', range(1, len(df) + 1))
+    return df
+
+# ── 지표 상태 엔진: entry에 펼쳐 둔 IndicatorState 값만 읽음 (이력 재조회 없음) ──
+def _fields(data, keys):
+    return {k: np.array([d[k] for d in data.values()], dtype='float64') for k in keys}
+
+def calculate_sector_scores_state(sector_data):
+    """calculate_sector_scores와 같은 표를 entry의 ma20/ma200/52주 고저/ret_*/vol_20으로 계산"""
+    if not sector_data: return pd.DataFrame()
+    f = _fields(sector_data, ['current', 'ma200', 'ma20', 'high_52w', 'low_52w', 'ret_126', 'ret_21', 'ret_20', 'vol_20'])
+    current, high_52w, low_52w = f['current'], f['high_52w'], f['low_52w']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ma200_dist = np.where(f['ma200'] > 0, current / f['ma200'] - 1, 0.0)
+        pos_52w = np.where(high_52w != low_52w, (current - low_52w) / (high_52w - low_52w), 0.5)
+        ma20_dist = np.where(f['ma20'] > 0, current / f['ma20'] - 1, 0.0)
+    l_score = ma200_dist * 0.4 + pos_52w * 0.3 + f['ret_126'] * 0.3
+    s_score = ma20_dist * 0.5 + f['ret_21'] * 0.4 - f['vol_20'] * 0.1
+    return _sector_table(list(sector_data), {n: d['ticker'] for n, d in sector_data.items()}, l_score, s_score, f['ret_20'] * 100)
+
+def calculate_core_sector_scores_state(core_data):
+    """calculate_core_sector_scores와 같은 표를 entry의 ma20/ret_21/ret_20으로 계산 (20봉 미만 종목 제외)"""
+    core_data = {n: d for n, d in core_data.items() if d['bars'] >= 20}
+    if not core_data: return pd.DataFrame()
+    f = _fields(core_data, ['current', 'ma20', 'ret_21', 'ret_20'])
+    s_score = (f['current'] / f['ma20'] - 1) * 0.5 + f['ret_21'] * 0.4
+    return _core_table(list(core_data), {n: d['ticker'] for n, d in core_data.items()}, s_score, f['ret_20'] * 100)
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+# ── 차트 데이터 파이프라인: 화면 해상도만큼만 점을 보냄 (LTTB + 극값 보존) ──
+CHART_POINTS = 800  # 차트 하나에 보낼 대략적인 점 수 (모바일~데스크톱 가로 픽셀 수준)
+
+def lttb(y, n):
+    """Largest-Triangle-Three-Buckets: 선 모양을 가장 잘 살리는 n개 점의 위치(정수 인덱스)
+
+    x는 거래일 순번(등간격)으로 봅니다. NaN 구간(이동평균 초기 등)은 구간 첫 점을 고릅니다.
+    """
+    y = np.asarray(y, dtype='float64')
+    m = len(y)
+    if n >= m or n < 3: return np.arange(m)
+    edges = np.linspace(1, m - 1, n - 1).astype(np.int64)  # 첫/끝 점 사이를 n-2개 구간으로
+    out = np.empty(n, dtype=np.int64)
+    out[0], out[-1] = 0, m - 1
+    a = 0
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = hi, (edges[i + 2] if i + 2 < n - 1 else m)
+        nxt = y[nlo:nhi]
+        avg_x, avg_y = (nlo + nhi - 1) / 2, (nxt[~np.isnan(nxt)].mean() if (~np.isnan(nxt)).any() else np.nan)
+        xs = np.arange(lo, hi)
+        area = np.abs((a - avg_x) * (y[lo:hi] - y[a]) - (a - xs) * (avg_y - y[a]))
+        a = lo + int(np.argmax(np.where(np.isnan(area), -1.0, area)))
+        out[i + 1] = a
+    return out
+
+def downsample(df, n=CHART_POINTS, cols=None):
+    """같은 날짜 축을 쓰는 여러 열을 함께 줄임
+
+    열마다 LTTB로 고른 점과 열별 최고/최저점(낙폭 바닥 포함)의 합집합만 남기므로
+    모든 선이 같은 x를 공유하고 극값은 빠지지 않습니다.
+    """
+    if len(df) <= n: return df
+    cols = cols or list(df.columns)
+    per = max(3, n // len(cols))
+    keep = [lttb(df[c].to_numpy(dtype='float64'), per) for c in cols]
+    for c in cols:
+        v = df[c].to_numpy(dtype='float64')
+        if (~np.isnan(v)).any(): keep.append(np.array([np.nanargmax(v), np.nanargmin(v)]))
+    return df.iloc[np.unique(np.concatenate(keep))]
+
+def window(df, start=None, end=None, n=CHART_POINTS, cols=None):
+    """[start, end] 구간만 잘라 n점 안팎으로 — 구간이 좁을수록 원래 해상도에 가까워짐"""
+    return downsample(df.loc[pd.Timestamp(start) if start is not None else None:pd.Timestamp(end) if end is not None else None], n, cols)
@@ -1,53 +1,140 @@
-import yfinance as yf
+import json
+import os
 import pandas as pd
 from datetime import datetime
-import numpy as np
-
-def get_all_market_data():
-    sector_etfs = {
-        '금속광산': 'XME', '반도체': 'SOXX', '소비': 'XLB', '에너지': 'XLE',
-        '바이오테크': 'XBI', '필수소비재': 'XLP', '타임폴리오': '426030.KS',
-        '반도체2': 'SMH', '원유가스개발': 'XOP', '산업재': 'XLI', '주택건설': 'XHB',
-        '러셀': 'IWM', '소매판매': 'XRT', '헬스케어': 'XLV', '커뮤니케이션': 'XLC',
-        '경기소비재': 'XLY', 'S&P': 'SPY', 'NASDAQ': 'QQQ', '유틸리티': 'XLU',
-        'CASH': 'BIL', '물가연동채': 'TIP', '부동산': 'XLRE', '네오클라우드': 'WGMI',
-        '테크놀로지': 'XLK', '장기국채': 'TLT', '금융': 'XLF', '중국주식': 'FXI',
-        'FANG+/3': 'FNGS', '중국인터넷': 'KWEB', '비트코인': 'IBIT'
-    }
-    individual_stocks = {
-        'VOO': 'VOO', 'SSO': 'SSO', 'UPRO': 'UPRO', 'QQQ': 'QQQ', 'TQQQ': 'TQQQ',
-        'QQQI': 'QQQI', 'SMH': 'SMH', 'USD': 'UUP', 'SOXX': 'SOXX', 'SOXL': 'SOXL',
-        'MAGS': 'MAGS', 'BULZ': 'BULZ', 'SPMO': 'SPMO', 'VGT': 'VGT', 'IBIT': 'IBIT',
-        'AAPL': 'AAPL', 'MSFT': 'MSFT', 'NVDA': 'NVDA', 'GOOG': 'GOOG', 'AMZN': 'AMZN',
-        'META': 'META', 'TSLA': 'TSLA', 'TSMC': 'TSM', 'AVGO': 'AVGO', 'BRK.B': 'BRK-B',
-        '환율': 'KRW=X', 'VIX': '^VIX'
-    }
-    core_sectors = {
-        '커뮤니케이션': 'XLC', '임의소비재': 'XLY', '필수소비재': 'XLP', '에너지': 'XLE', 
-        '금융': 'XLF', '헬스케어': 'XLV', '산업재': 'XLI', '재료': 'XLB', '부동산': 'XLRE',
-        '정보기술': 'XLK', '유틸리티': 'XLU'
-    }
-    return {'sector_etfs': _fetch_data(sector_etfs), 'individual_stocks': _fetch_data(individual_stocks), 'core_sectors': _fetch_data(core_sectors)}
-
-def _fetch_data(tickers_dict):
-    data = {}
+import price_store
+from market_store import MarketStore
+from indicators import sync_states
+
+# ── 유니버스 정의 (universes.json에서 로드, 세 그룹이 QQQ/SMH/SOXX/XL* 등을 공유) ──
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+UNIVERSE_CONFIG = os.environ.get('UNIVERSE_CONFIG', os.path.join(BASE_DIR, 'universes.json'))
+
+def _read_ticker_file(path):
+    """한 줄에 '티커' 또는 '이름,티커' (빈 줄/#주석 무시) → {이름: 티커}"""
+    tickers = {}
+    with open(path, encoding='utf-8-sig') as f:
+        for line in f:
+            parts = [p.strip() for p in line.split('#')[0].split(',')]
+            if not parts[0]: continue
+            name, ticker = (parts[0], parts[1]) if len(parts) > 1 and parts[1] else (parts[0], parts[0])
+            tickers[name] = ticker
+    return tickers
+
+def load_universes(path=None):
+    """유니버스 설정 → ({그룹: {이름: 티커}}, 상세 차트용 이력을 보관할 그룹 집합)
+
+    그룹별 tickers는 {이름: 티커} 객체, 티커 목록, 또는 설정 파일 기준 상대 경로의 티커 파일
+    (지수 구성 종목 전체처럼 큰 목록용)을 받습니다.
+    """
+    path = path or UNIVERSE_CONFIG
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+    universes, history = {}, set()
+    for group, spec in config.items():
+        tickers = spec['tickers']
+        if isinstance(tickers, str): tickers = _read_ticker_file(os.path.join(os.path.dirname(path), tickers))
+        elif isinstance(tickers, list): tickers = {t: t for t in tickers}
+        universes[group] = dict(tickers)
+        if spec.get('history'): history.add(group)
+    return universes, history
+
+UNIVERSES, HISTORY_GROUPS = load_universes()
+SECTOR_ETFS, INDIVIDUAL_STOCKS, CORE_SECTORS = (UNIVERSES[g] for g in ('sector_etfs', 'individual_stocks', 'core_sectors'))
+
+BATCH_SIZE = 100    # yf.download 한 번에 묶을 심볼 수
+STREAM_CHUNK = 500  # 한 번에 받아 지표 상태로 접어 넣는 심볼 수 (가격 이력은 이 묶음만큼만 메모리에 둠)
+
+# ── 데이터 공급자 (download(symbols, period, start) -> {심볼: OHLCV DataFrame}) ──
+class YahooProvider:
+    """yfinance 일괄 다운로드 공급자 (start가 있으면 period 대신 사용, timeout은 심볼별 요청 제한 초)"""
+    def __init__(self, timeout=10):
+        self.timeout = timeout
+
+    def download(self, symbols, period='3y', start=None):
+        import yfinance as yf  # 💡 실제로 수신할 때만 적재 (스냅샷/저장소만 읽는 콜드 스타트는 yfinance를 건너뜀)
+        span = {'start': start} if start is not None else {'period': period}
+        raw = yf.download(list(symbols), auto_adjust=True, progress=False, group_by='ticker', timeout=self.timeout, **span)
+        return _split_batch(raw, symbols)
+
+class FakeProvider:
+    """오프라인 테스트/벤치마크용 공급자: 미리 준비한 DataFrame을 그대로 돌려줍니다."""
+    def __init__(self, frames):
+        self.frames = frames
+        self.calls = []  # 호출별 요청 심볼 기록 (왕복 횟수 확인용)
+
+    def download(self, symbols, period='3y', start=None):
+        self.calls.append(list(symbols))
+        since = pd.Timestamp(start) if start is not None else period_start(period)
+        return {s: self.frames[s][self.frames[s].index >= since].copy() for s in symbols if s in self.frames}
+
+def _split_batch(raw, symbols):
+    """다중 티커 응답을 심볼별 DataFrame으로 분리 (다른 시장 휴장일로 생긴 빈 행 제거)"""
+    frames = {}
+    if raw is None or raw.empty: return frames
+    if not isinstance(raw.columns, pd.MultiIndex):
+        frames[symbols[0]] = raw.dropna(how='all')
+        return frames
+    level = 0 if set(symbols) & set(raw.columns.get_level_values(0)) else 1
+    present = set(raw.columns.get_level_values(level))
+    for sym in symbols:
+        if sym not in present: continue
+        df = raw.xs(sym, axis=1, level=level).dropna(how='all')
+        if not df.empty: frames[sym] = df
+    return frames
+
+def unique_symbols(*groups):
+    """여러 {이름: 티커} 딕셔너리에서 순서를 유지한 고유 티커 목록"""
+    return list(dict.fromkeys(t for g in groups for t in g.values()))
+
+def period_start(period):
+    """'3y'/'6mo'/'30d' 형태의 기간을 시작일로 변환"""
+    num, unit = int(period.rstrip('ymod')), period.lstrip('0123456789')
+    offset = {'y': pd.DateOffset(years=num), 'mo': pd.DateOffset(months=num), 'd': pd.DateOffset(days=num)}[unit]
+    return pd.Timestamp.today().normalize() - offset
+
+def fetch_batch(symbols, provider=None, period='3y', batch_size=BATCH_SIZE, report=None):
+    """로컬 가격 저장소를 증분 갱신하고(새 봉만 병렬 수신) 기간만큼 잘라 반환"""
+    return price_store.refresh(symbols, period_start(period), provider or YahooProvider(), batch_size=batch_size, report=report)
+
+def _fan_out(tickers_dict, entries):
+    """심볼별 결과를 {이름: entry} 형태로 다시 나눠 담기 (중복 심볼은 같은 entry 공유)"""
+    return {name: entries[ticker] for name, ticker in tickers_dict.items() if ticker in entries}
+
+def _build_entries(frames):
+    """심볼별 OHLCV → 요약값 entry
+
+    이력은 모든 entry가 공유하는 MarketStore 하나에 float32로 보관하고, 요약 지표는 심볼별
+    IndicatorState가 지난 갱신 이후 새로 들어온 봉만 반영해 계산합니다.
+    """
+    closes = _clean_closes(frames)
+    entries = _entries_from_closes(closes)
+    _attach_store(entries, closes)
+    return entries
+
+def _clean_closes(frames):
+    closes = {}
+    for ticker, hist in frames.items():
+        try: closes[ticker] = _clean_close(ticker, hist)
+        except Exception: continue
+    return closes
+
+def _entries_from_closes(closes):
     current_year = datetime.now().year
-    for name, ticker in tickers_dict.items():
-        try:
-            hist = yf.download(ticker, period='3y', auto_adjust=True, progress=False)
-            if hist.empty: continue
-            if isinstance(hist.columns, pd.MultiIndex): hist.columns = hist.columns.get_level_values(0)
-            hist.index = pd.to_datetime(hist.index).tz_localize(None)
-            hist['Close'] = hist['Close'].ffill().bfill()
-            hist['MA20'] = hist['Close'].rolling(window=20).mean()
-            hist['MA200'] = hist['Close'].rolling(window=200).mean()
-            data[name] = {
-                'ticker': ticker, 'current': float(hist['Close'].iloc[-1]),
-                'prev_day': float(hist['Close'].iloc[-2]) if len(hist)>1 else float(hist['Close'].iloc[-1]),
-                'high_52w': float(hist['Close'].tail(252).max()), 'low_52w': float(hist['Close'].tail(252).min()),
-                'ytd_start': float(hist[hist.index.year == current_year]['Close'].iloc[0]) if not hist[hist.index.year == current_year].empty else float(hist['Close'].iloc[-1]),
-                'ma200': float(hist['MA200'].dropna().iloc[-1]) if not hist['MA200'].dropna().empty else np.nan,
-                'history': hist
-            }
-        except: continue
-    return data
+    return {ticker: {'ticker': ticker, **state.values(current_year)} for ticker, state in sync_states(closes).items()}
+
+def _attach_store(entries, closes):
+    store = MarketStore(closes)
+    for ticker in closes:
+        if ticker in entries: entries[ticker]['store'] = store
+
+def _clean_close(ticker, hist):
+    if hist.empty: raise ValueError(f"{ticker}: empty history")
+    close = hist['Close']
+    if isinstance(close, pd.DataFrame): close = close.iloc[:, 0]
+    index = close.index if isinstance(close.index, pd.DatetimeIndex) else pd.to_datetime(close.index)
+    # 💡 지표도 저장소와 같은 float32 값에서 계산해야 루프/패널 계산 결과가 서로 일치합니다.
+    values = close.to_numpy(dtype='float32').astype('float64')
+    close = pd.Series(values, index=index.tz_localize(None) if index.tz is not None else index).ffill().bfill()
+    if close.isna().all(): raise ValueError(f"{ticker}: no close prices")
+    return close
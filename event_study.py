@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from v8_strategy import SIGNALS, SIG_RED, SIG_GREEN
+
+# ── 이벤트 윈도우 분석: 모든 (이벤트 × 종목)을 정렬 인덱스 검색 + 배열 인덱싱 한 번으로 ──
+BEFORE, AFTER = 20, 60  # 이벤트일(t0) 전후로 볼 거래일 수
+CODE_RED, CODE_GREEN = SIGNALS.index(SIG_RED), SIGNALS.index(SIG_GREEN)
+
+def perf_run(perf_df, ticker):
+    """calc_performance 결과 하나 → simulate_panel과 같은 모양(날짜 × 1)의 배열 dict"""
+    code = pd.Series(perf_df['신호']).map({s: i for i, s in enumerate(SIGNALS)}).fillna(-1).to_numpy(dtype=np.int64)
+    col = lambda k: perf_df[k].to_numpy(dtype='float64')[:, None]
+    return {'index': perf_df.index, 'tickers': [ticker], 'code': code[:, None], 'cms': col('CMS'),
+            'exposure': col('exposure'), 'equity': col('cum_strat'), 'bah': col('cum_bah')}
+
+def event_windows(run, events, before=BEFORE, after=AFTER):
+    """이벤트 목록({'date', 'name', ...}) × run의 모든 종목 → (요약 표, 신호 경로 표)
+
+    이벤트일은 index.searchsorted로 그날 또는 그 뒤 첫 거래일에 맞추고, t-before ~ t+after 구간을
+    (이벤트 × 오프셋 × 종목) 배열로 한 번에 모아 계산합니다. 구간 지표는 t0부터 t+after까지입니다.
+    - 평균 비중, 전략/존버 수익률, 구간 최대 낙폭(t0 기준 고점 대비), 회피 낙폭(전략 - 존버, %p)
+    - 첫 🔴/🟢까지 거래일 수 (t0 당일이면 0, 구간 안에 없으면 NaN)
+    이벤트가 데이터 범위 밖이거나 종목 상장 전이면 행에서 빠집니다.
+    신호 경로 표는 (이벤트, 티커) × 오프셋(-before ~ +after)의 신호 코드(SIGNALS 순번, 데이터 없음 -1)입니다.
+    """
+    idx, code = run['index'], run['code']
+    n, k0 = len(idx), before
+    dates = pd.DatetimeIndex([pd.Timestamp(ev['date']) for ev in events])
+    pos = idx.searchsorted(dates)                                  # (E,)
+    offsets = np.arange(-before, after + 1)
+    rows = pos[:, None] + offsets[None, :]                         # (E, W)
+    inside = (rows >= 0) & (rows < n) & (dates >= idx[0])[:, None]  # 데이터 시작 전 이벤트는 첫 봉에 붙이지 않음
+    rc = np.clip(rows, 0, n - 1)
+
+    path = np.where(inside[..., None], code[rc], -1)               # (E, W, N)
+    e_i, t_i = np.nonzero(path[:, k0] >= 0)                        # t0에 신호가 있는 (이벤트, 종목) 조합 K개
+    fwd_path = path[e_i, k0:, t_i]                                 # (K, after+1)
+    fwd_mask = fwd_path >= 0
+    fwd_rows = rc[e_i, k0:]
+    end = fwd_mask.sum(axis=1) - 1                                 # 구간 안 마지막 유효 봉 (데이터 끝에서 잘릴 수 있음)
+
+    def fwd(key):
+        return np.where(fwd_mask, run[key][fwd_rows, t_i[:, None]], np.nan)
+
+    def change(a):
+        return (np.take_along_axis(a, end[:, None], axis=1)[:, 0] / a[:, 0] - 1) * 100
+
+    def window_dd(a):
+        return np.nanmin(a / np.fmax.accumulate(a, axis=1) - 1, axis=1) * 100
+
+    def first_day(target):
+        hit = fwd_path == target
+        return np.where(hit.any(axis=1), hit.argmax(axis=1), np.nan)
+
+    eq, bah = fwd('equity'), fwd('bah')
+    t0 = rc[e_i, k0]
+    table = pd.DataFrame({
+        '이벤트': [events[e]['name'] for e in e_i], '날짜': idx[t0].strftime('%Y-%m-%d'),
+        '티커': [run['tickers'][t] for t in t_i],
+        '신호': np.array(SIGNALS)[fwd_path[:, 0]], 'CMS': run['cms'][t0, t_i],
+        '평균 비중': np.nanmean(fwd('exposure'), axis=1),
+        '전략 수익(%)': change(eq), '존버 수익(%)': change(bah),
+        '전략 낙폭(%)': window_dd(eq), '존버 낙폭(%)': window_dd(bah),
+        '첫 🔴(일)': first_day(CODE_RED), '첫 🟢(일)': first_day(CODE_GREEN),
+    })
+    table.insert(table.columns.get_loc('존버 낙폭(%)') + 1, '회피 낙폭(%p)', table['전략 낙폭(%)'] - table['존버 낙폭(%)'])
+    paths = pd.DataFrame(path[e_i, :, t_i], columns=offsets,
+                         index=pd.MultiIndex.from_arrays([table['이벤트'], table['티커']]))
+    return table, paths
@@ -0,0 +1,70 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# ── 병렬 수신 실행기 (작업 수 제한 + 작업별 타임아웃) ──
+FETCH_WORKERS = int(os.environ.get('FETCH_WORKERS', 8))
+FETCH_TIMEOUT = float(os.environ.get('FETCH_TIMEOUT', 30))
+FETCH_MAX_ABANDONED = int(os.environ.get('FETCH_MAX_ABANDONED', 2 * FETCH_WORKERS))  # 포기했지만 아직 안 끝난 작업 스레드 상한
+
+_abandoned_lock = threading.Lock()
+_abandoned = {'running': 0}  # 타임아웃으로 포기했지만 스레드는 아직 도는 작업 수 (끝나면 줄어듦)
+
+def abandoned():
+    with _abandoned_lock:
+        return _abandoned['running']
+
+def _abandon(fut):
+    with _abandoned_lock:
+        _abandoned['running'] += 1
+    def _release(_):
+        with _abandoned_lock:
+            _abandoned['running'] -= 1
+    fut.add_done_callback(_release)
+
+class FetchReport:
+    """수신 결과 요약: 성공/실패/타임아웃 심볼과 소요 시간"""
+    def __init__(self):
+        self.ok, self.failed, self.timed_out, self.elapsed = [], {}, [], 0.0
+
+    def to_dict(self):
+        return {'ok': list(self.ok), 'failed': dict(self.failed), 'timed_out': list(self.timed_out), 'elapsed': round(self.elapsed, 3)}
+
+def run_jobs(jobs, max_workers=None, timeout=None, deadline=None):
+    """{키: 인자 없는 함수}를 병렬 실행해 (결과 dict, 실패 dict, 타임아웃 목록) 반환
+
+    결과는 끝나는 순서대로 모으고, 실행을 시작한 지 timeout초가 지난 작업은 기다리지 않고 포기합니다.
+    deadline(time.monotonic 기준 시각)이 지나면 시작 전이든 실행 중이든 남은 작업을 모두 포기합니다.
+    (스레드는 강제 종료할 수 없으므로 포기한 작업은 백그라운드에서 끝나도록 둡니다.
+     그런 스레드가 FETCH_MAX_ABANDONED개 이상 남아 있으면 응답 없는 서버로 보고 새 작업을 시작하지 않고 바로 타임아웃 처리)
+    """
+    max_workers = max_workers or FETCH_WORKERS
+    timeout = FETCH_TIMEOUT if timeout is None else timeout
+    results, failed, timed_out = {}, {}, []
+    if not jobs: return results, failed, timed_out
+    if (deadline is not None and time.monotonic() >= deadline) or abandoned() >= FETCH_MAX_ABANDONED:
+        return results, failed, list(jobs)
+
+    started = {}
+    def _run(key, fn):
+        started[key] = time.monotonic()
+        return fn()
+
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(jobs)))
+    pending = {pool.submit(_run, key, fn): key for key, fn in jobs.items()}
+    try:
+        while pending:
+            done, _ = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+            for fut in done:
+                key = pending.pop(fut)
+                try: results[key] = fut.result()
+                except Exception as e: failed[key] = f"{type(e).__name__}: {e}"
+            now = time.monotonic()
+            for fut, key in list(pending.items()):
+                if (key in started and now - started[key] > timeout) or (deadline is not None and now >= deadline):
+                    if not fut.cancel(): _abandon(fut)  # 이미 도는 작업만 포기 목록에 (시작 전이면 취소로 끝)
+                    timed_out.append(pending.pop(fut))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return results, failed, timed_out
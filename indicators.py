@@ -0,0 +1,156 @@
+import math
+import threading
+from collections import deque
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# ── 종목별 증분 지표 상태: 새 봉 하나를 O(1)로 반영 (3년치 이력을 매번 다시 훑지 않음) ──
+WINDOW_52W = 252
+RING = WINDOW_52W + 1  # 가장 긴 조회(52주 + 전일)만큼만 종가 보관
+VOL_WINDOW = 20
+RESYNC = 4096          # 누적 합의 부동소수점 오차를 이 횟수마다 창 전체로 다시 맞춤
+
+class IndicatorState:
+    """MA20/MA200 누적 합, 52주 고저 단조 덱, 연초 기준가, 20일 변동성(수익률 합·제곱합)
+
+    update()는 봉 하나당 상수 시간이고, from_series()는 마지막 RING개 봉만 훑어 초기화합니다.
+    """
+    def __init__(self):
+        self.closes = deque(maxlen=RING)
+        self.rets = deque(maxlen=VOL_WINDOW)
+        self.sum20 = self.sum200 = self.ret_sum = self.ret_sq = 0.0
+        self.max_q, self.min_q = deque(), deque()  # (봉 번호, 종가) — 앞쪽이 창 안의 최대/최소
+        self.bars, self.updates = 0, 0
+        self.last_date = None
+        self.ytd_year, self.ytd_first = None, None
+
+    @classmethod
+    def from_series(cls, close):
+        """종가 Series로 초기화 (연초 기준가만 전체에서 찾고 나머지는 꼬리 RING개로 계산)"""
+        state = cls()
+        if close.empty: return state
+        idx = pd.DatetimeIndex(close.index)
+        values = close.to_numpy(dtype='float64')
+        tail = values[-RING:].tolist()
+        state.closes.extend(tail)
+        state.rets.extend(c / p - 1 if p else math.nan for p, c in list(zip(tail[:-1], tail[1:]))[-VOL_WINDOW:])
+        state.bars = len(values)
+        state._resync()  # 누적 합과 단조 덱을 꼬리 구간으로 채움
+        state.last_date = idx[-1]
+        state.ytd_year = idx[-1].year
+        state.ytd_first = float(values[np.argmax(idx.year == state.ytd_year)])
+        return state
+
+    def update(self, date, close):
+        """새 봉 하나 반영 (마지막 봉보다 이후 날짜만)"""
+        date = pd.Timestamp(date)
+        if self.last_date is not None and date <= self.last_date:
+            raise ValueError(f"{date:%Y-%m-%d} is not after {self.last_date:%Y-%m-%d}")
+        c = float(close)
+        if date.year != self.ytd_year:
+            self.ytd_year, self.ytd_first = date.year, c
+        self._push(c)
+        self.bars += 1
+        self.last_date = date
+        self.updates += 1
+        if self.updates % RESYNC == 0: self._resync()
+        return self
+
+    def extend(self, close):
+        for date, c in zip(close.index, close.to_numpy(dtype='float64').tolist()):
+            self.update(date, c)
+        return self
+
+    def _push(self, c):
+        closes, n = self.closes, len(self.closes)
+        if n:
+            r = c / closes[-1] - 1 if closes[-1] else math.nan
+            if len(self.rets) == VOL_WINDOW:
+                old = self.rets[0]
+                self.ret_sum -= old
+                self.ret_sq -= old * old
+            self.rets.append(r)
+            self.ret_sum += r
+            self.ret_sq += r * r
+        self.sum20 += c - (closes[-20] if n >= 20 else 0.0)
+        self.sum200 += c - (closes[-200] if n >= 200 else 0.0)
+        i = self.bars
+        while self.max_q and self.max_q[-1][1] <= c: self.max_q.pop()
+        while self.min_q and self.min_q[-1][1] >= c: self.min_q.pop()
+        self.max_q.append((i, c))
+        self.min_q.append((i, c))
+        while self.max_q[0][0] <= i - WINDOW_52W: self.max_q.popleft()
+        while self.min_q[0][0] <= i - WINDOW_52W: self.min_q.popleft()
+        closes.append(c)
+
+    def _resync(self):
+        values = list(self.closes)
+        self.sum20, self.sum200 = math.fsum(values[-20:]), math.fsum(values[-200:])
+        self.ret_sum, self.ret_sq = math.fsum(self.rets), math.fsum(r * r for r in self.rets)
+        window = values[-WINDOW_52W:]
+        first = self.bars - len(window)
+        self.max_q.clear(); self.min_q.clear()
+        for i, c in enumerate(window, start=first):
+            while self.max_q and self.max_q[-1][1] <= c: self.max_q.pop()
+            while self.min_q and self.min_q[-1][1] >= c: self.min_q.pop()
+            self.max_q.append((i, c))
+            self.min_q.append((i, c))
+
+    # ── 조회 (모두 상수 시간) ──
+    @property
+    def current(self): return self.closes[-1]
+
+    def ret(self, lookback):
+        """lookback봉 전 대비 수익률 (봉이 모자라거나 기준가가 0 이하면 0)"""
+        if self.bars < lookback or len(self.closes) < lookback: return 0.0
+        past = self.closes[-lookback]
+        return self.current / past - 1 if past > 0 else 0.0
+
+    def vol(self):
+        """최근 20개 일간 수익률의 표본 표준편차 (10봉 미만이거나 수익률 2개 미만이면 0)"""
+        k = len(self.rets)
+        if self.bars < 10 or k < 2: return 0.0
+        var = (self.ret_sq - self.ret_sum * self.ret_sum / k) / (k - 1)
+        return math.sqrt(var) if var > 0 else 0.0
+
+    def values(self, year=None):
+        """entry에 그대로 펼쳐 넣는 지표 값 dict"""
+        c = self.current
+        year = year or datetime.now().year
+        return {
+            'current': c, 'prev_day': self.closes[-2] if len(self.closes) > 1 else c,
+            'high_52w': self.max_q[0][1], 'low_52w': self.min_q[0][1],
+            'ytd_start': self.ytd_first if self.ytd_year == year else c,
+            'ma200': self.sum200 / 200 if self.bars >= 200 else np.nan,
+            'ma20': self.sum20 / 20 if self.bars >= 20 else np.nan,
+            'vol_20': self.vol(), 'ret_20': self.ret(20), 'ret_21': self.ret(21), 'ret_126': self.ret(126),
+            'bars': self.bars,
+        }
+
+# ── 심볼별 상태 보관소 (프로세스 단위, 갱신 때마다 새 봉만 반영) ──
+_lock = threading.Lock()
+_states = {}
+
+def sync_states(closes):
+    """{심볼: 종가 Series} → {심볼: IndicatorState}
+
+    보관 중인 상태의 마지막 봉이 새 이력에도 같은 값으로 있으면 그 뒤 봉만 update()하고,
+    없거나 값이 달라졌으면(분할/배당 수정) 이력으로 다시 초기화합니다.
+    """
+    out = {}
+    with _lock:
+        for sym, close in closes.items():
+            state = _states.get(sym)
+            last = state.last_date if state else None
+            if last is None or last not in close.index or float(close[last]) != state.current:
+                state = IndicatorState.from_series(close)
+            else:
+                state.extend(close[close.index > last])
+            _states[sym] = out[sym] = state
+    return out
+
+def reset_states():
+    """보관 중인 상태를 모두 버림 (다음 sync_states는 전부 이력으로 다시 초기화 — 콜드 스타트 측정/테스트용)"""
+    with _lock:
+        _states.clear()
@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+import pandas as pd
+
+# ── 구간별 계측 (벽시계 시간, 호출 수, 캐시 적중/미스) ──
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOG_PATH = os.environ.get('INSTRUMENT_LOG', os.path.join(BASE_DIR, 'logs', 'timings.jsonl'))  # 빈 문자열이면 파일 기록 끔
+LOG_MAX_BYTES = int(os.environ.get('INSTRUMENT_LOG_MAX_BYTES', 5 * 1024 * 1024))  # 이 크기를 넘으면 .1, .2 …로 돌려 씀
+LOG_BACKUPS = int(os.environ.get('INSTRUMENT_LOG_BACKUPS', 3))                    # 남겨 둘 이전 파일 수 (최대 용량 ≈ 크기 × (1 + 개수))
+
+_lock = threading.Lock()
+_stats = {}
+_local = threading.local()
+_sink = {'logger': None}
+
+class _QuietRotatingHandler(RotatingFileHandler):
+    def handleError(self, record):
+        pass  # 디스크가 차거나 권한이 없어도 계측 때문에 화면/콘솔이 시끄러워지지 않게 (기록만 건너뜀)
+
+def _logger():
+    """JSON lines 파일 싱크 (처음 기록할 때 만듦, 크기 기준으로 돌려 써서 끝없이 커지지 않음)"""
+    with _lock:
+        if _sink['logger'] is None:
+            os.makedirs(os.path.dirname(LOG_PATH) or '.', exist_ok=True)
+            handler = _QuietRotatingHandler(LOG_PATH, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding='utf-8', delay=True)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            logger = logging.getLogger(f'{__name__}.timings')
+            logger.handlers[:] = [handler]
+            logger.setLevel(logging.INFO)
+            logger.propagate = False  # 앱 로그(콘솔)에는 섞지 않음
+            _sink['logger'] = logger
+        return _sink['logger']
+
+def _write(event):
+    if not LOG_PATH: return
+    try:
+        _logger().info(json.dumps(event, ensure_ascii=False, default=str))
+    except OSError:
+        pass
+
+def record(name, seconds, cache=None, **tags):
+    """구간 하나의 측정값을 누적하고 JSON lines로 기록 (cache: True=적중, False=미스, None=캐시 아님)"""
+    with _lock:
+        s = _stats.setdefault(name, {'calls': 0, 'total': 0.0, 'max': 0.0, 'last': 0.0, 'hits': 0, 'misses': 0})
+        s['calls'] += 1
+        s['total'] += seconds
+        s['max'] = max(s['max'], seconds)
+        s['last'] = seconds
+        if cache is True: s['hits'] += 1
+        elif cache is False: s['misses'] += 1
+    _write({'ts': time.time(), 'stage': name, 'seconds': round(seconds, 6), **({'cache': 'hit' if cache else 'miss'} if cache is not None else {}), **tags})
+
+def log_event(name, **fields):
+    """누적 통계 없이 JSON lines에만 한 줄 기록 (예: 묶음 수신 하나를 심볼별로 풀어 적을 때)"""
+    _write({'ts': time.time(), 'stage': name, **fields})
+
+@contextmanager
+def stage(name, cache=False, **tags):
+    """with stage('calculate_sector_scores'): ...
+
+    cache=True로 감싼 구간은 안에서 mark_miss()가 호출되지 않으면 캐시 적중으로 집계합니다.
+    (st.cache_data 함수 본문 첫 줄에 mark_miss()를 두면 실제 계산이 돈 경우만 미스가 됩니다)
+    """
+    frames = _local.__dict__.setdefault('frames', [])
+    frame = {'miss': False}
+    frames.append(frame)
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        frames.pop()
+        record(name, time.perf_counter() - t0, (not frame['miss']) if cache else None, **tags)
+
+def mark_miss():
+    """현재 스레드에서 진행 중인 모든 cache 구간을 미스로 표시"""
+    for frame in getattr(_local, 'frames', []):
+        frame['miss'] = True
+
+def timed(name=None):
+    """함수 전체를 stage로 감싸는 데코레이터"""
+    def deco(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name or fn.__name__):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+def summary():
+    """구간별 누적 통계 DataFrame (총 시간 내림차순)"""
+    with _lock:
+        rows = [{'구간': k, '호출': s['calls'], '총(ms)': s['total'] * 1000, '평균(ms)': s['total'] / s['calls'] * 1000,
+                 '최대(ms)': s['max'] * 1000, '최근(ms)': s['last'] * 1000, '캐시적중': s['hits'], '캐시미스': s['misses']}
+                for k, s in _stats.items()]
+    df = pd.DataFrame(rows)
+    return df.sort_values('총(ms)', ascending=False).reset_index(drop=True) if not df.empty else df
+
+def render_sidebar(extra=()):
+    """관리자 사이드바의 "구간별 성능 계측" 패널 (관리자가 아니면 아무것도 그리지 않음)
+
+    extra: [(설명, 표 DataFrame을 돌려주는 함수)] — 페이지별로 덧붙이는 표 (관리자일 때만 계산)
+    """
+    import streamlit as st
+    if not st.session_state.get('admin_ok'): return
+    with st.sidebar.expander("⏱️ 구간별 성능 계측", expanded=False):
+        st.dataframe(summary().round(1), use_container_width=True, hide_index=True)
+        st.caption(f"상세 기록(JSON lines): {LOG_PATH}" if LOG_PATH else "상세 기록(JSON lines): 꺼짐")
+        for caption, table in extra:
+            st.caption(caption)
+            st.dataframe(table(), use_container_width=True, hide_index=True)
+
+def reset():
+    with _lock:
+        _stats.clear()
@@ -0,0 +1,82 @@
+import threading
+import time
+from concurrent.futures import Future
+import pandas as pd
+
+import price_store
+from data_fetcher import YahooProvider
+from macro_weather import extend_score_history
+
+# ── 매크로 시계열 공용 캐시 (두 페이지 + 모든 백테스트 종목이 공유) ──
+# VIX, OVX, 10년물, 3개월물, 하이일드, 달러인덱스, 경기소비재, 필수소비재
+MACRO_SYMBOLS = ['^VIX', '^OVX', '^TNX', '^IRX', 'HYG', 'DX-Y.NYB', 'XLY', 'XLP']
+MACRO_START = '1998-01-01'  # 백테스트 최장 구간(2000년 시작 → 1999년부터 수신)을 덮는 시작일
+MACRO_TTL = 300
+
+_lock = threading.Lock()  # 캐시 dict를 읽고 바꾸는 동안만 잡음 (네트워크 수신 중에는 잡지 않음)
+_cache = {'series': {}, 'loaded': 0.0, 'refreshes': 0, 'stale': [], 'flight': None}
+_history = {'frame': None, 'loaded': None}  # 날씨 점수 이력 (매크로 시계열이 갱신될 때만 새 날짜를 덧붙임)
+
+class MacroDataError(price_store.DataUnavailable):
+    """필요한 매크로 시계열을 한 번도 받지 못함 (페이지에서 st.error로 알림)"""
+
+def _refresh(provider, flight):
+    """잠금 밖에서 가격 저장소를 갱신하고, 끝나면 잠금 안에서 결과만 바꿔 끼움
+
+    갱신에 실패한 심볼은 직전에 받아 둔 시계열을 그대로 두고 stale 목록에 적습니다.
+    """
+    try:
+        frames = price_store.refresh(MACRO_SYMBOLS, MACRO_START, provider or YahooProvider(), max_age=MACRO_TTL)
+        with _lock:
+            if frames:
+                _cache['series'] = {**_cache['series'], **{s: df['Close'] for s, df in frames.items()}}
+                _cache['loaded'] = time.time()
+                _cache['refreshes'] += 1
+            _cache['stale'] = [s for s in MACRO_SYMBOLS if s not in frames]
+        flight.set_result(None)
+    except Exception as e:
+        flight.set_exception(e)
+    finally:
+        with _lock:
+            _cache['flight'] = None
+
+def get_macro_series(symbols=None, start=None, provider=None, strict=False):
+    """매크로 종가를 (날짜 × 심볼) DataFrame으로 반환
+
+    가장 긴 이력을 프로세스 메모리에 한 번 올려 두고, 호출마다 필요한 심볼/구간만 잘라 줍니다.
+    MACRO_TTL이 지나면 가격 저장소에서 새 봉만 증분 갱신합니다.
+    - 갱신은 한 번에 하나만 돌고(single-flight), 그동안 다른 호출은 캐시된 값이 있으면 기다리지 않고 바로 받음
+    - strict=True면 symbols 중 한 번도 받지 못한 심볼이 있을 때 MacroDataError (없으면 빠진 열 없이 반환)
+    """
+    with _lock:
+        flight, leader = _cache['flight'], False
+        if flight is None and time.time() - _cache['loaded'] >= MACRO_TTL:
+            flight = _cache['flight'] = Future()
+            leader = True
+        wait = leader or (flight is not None and not _cache['series'])
+    if leader: _refresh(provider, flight)
+    error = flight.exception() if wait else None  # 첫 적재를 다른 호출이 하는 중이면 끝날 때까지 기다림
+    with _lock:
+        series = _cache['series']
+    if error is not None and not series: raise error
+    symbols = symbols or MACRO_SYMBOLS
+    missing = [s for s in symbols if s not in series]
+    if strict and missing:
+        raise MacroDataError(f"매크로 지표를 받지 못했습니다: {', '.join(missing)} (잠시 뒤 다시 시도해 주세요)")
+    out = pd.DataFrame({s: series[s] for s in symbols if s in series})
+    return out[out.index >= pd.Timestamp(start)] if start is not None and not out.empty else out
+
+def get_score_history(start=None, provider=None):
+    """매크로 날씨 점수 이력 (macro_weather.score_history 형식, 가장 긴 구간을 한 번 계산해 두고 잘라 줌)"""
+    series = get_macro_series(MACRO_SYMBOLS, provider=provider)
+    with _lock:
+        if _history['loaded'] != _cache['loaded'] and not series.empty:
+            _history['frame'] = extend_score_history(_history['frame'], series)
+            _history['loaded'] = _cache['loaded']
+        frame = _history['frame']
+    if frame is None: return None
+    return frame[frame.index >= pd.Timestamp(start)] if start is not None else frame
+
+def macro_cache_info():
+    """캐시 상태 (적재 시각, 갱신 횟수, 보유 심볼, 직전 갱신에 실패해 예전 값을 쓰는 심볼)"""
+    return {'loaded': _cache['loaded'], 'refreshes': _cache['refreshes'], 'symbols': list(_cache['series']), 'stale': list(_cache['stale'])}
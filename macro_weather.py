@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+
+# ── 탑다운 매크로 날씨 점수 (VIX/OVX/금리차/HYG/DXY/XLY-XLP 감점 방식) ──
+CLEAR_LEVEL, STORM_LEVEL = 80, 50  # 이 점수 이상이면 맑음 / 이 점수 미만이면 태풍
+WEATHER_EXPOSURE = {'맑음': 1.0, '흐림': 0.6, '태풍': 0.0}  # 날씨를 비중 신호로 쓸 때의 기본 비중
+SCORE_WARMUP = 50  # 가장 긴 이동평균 창 (증분 갱신 때 이만큼 앞에서부터 다시 계산)
+PENALTY_COLS = ['pen_vix', 'pen_ovx', 'pen_spread', 'pen_hyg', 'pen_dxy', 'pen_ratio']
+
+def _pos(x):
+    """max(0, x)와 같은 규칙 (NaN이면 0)"""
+    return np.where(x > 0, x, 0.0)
+
+def _score_frame(df):
+    """ffill된 매크로 종가 → 날짜별 지표/감점/점수 DataFrame (모든 행을 한 번에)"""
+    out = pd.DataFrame(index=df.index)
+    out['VIX'], out['OVX'], out['HYG'], out['DXY'] = df['^VIX'], df['^OVX'], df['HYG'], df['DX-Y.NYB']
+    out['Spread'] = df['^TNX'] - df['^IRX']
+    out['HYG_MA50'] = df['HYG'].rolling(50).mean()
+    out['DXY_MA20'] = df['DX-Y.NYB'].rolling(20).mean()
+    out['Ratio'] = df['XLY'] / df['XLP']
+    out['Ratio_MA50'] = out['Ratio'].rolling(50).mean()
+
+    # 💡 [정밀 튜닝 완료] 감점 로직 (제자님의 아이디어 반영: VIX 기준 강화!)
+    # VIX 20부터 감점이 시작되고, 페널티 가중치(1.5)를 늘려 더 예민하게 반응합니다!
+    # 비교 대상이 NaN(상장 전/이동평균 준비 전)이면 감점하지 않습니다.
+    out['pen_vix'] = _pos(out['VIX'] - 20) * 1.5
+    out['pen_ovx'] = _pos(out['OVX'] - 35) * 1.2
+    out['pen_spread'] = np.where(out['Spread'] < -0.5, 20, 0)
+    out['pen_hyg'] = np.where(out['HYG'] < out['HYG_MA50'], 20, 0)
+    out['pen_dxy'] = np.where(out['DXY'] > (out['DXY_MA20'] * 1.02), 15, 0)
+    out['pen_ratio'] = np.where(out['Ratio'] < out['Ratio_MA50'], 15, 0)
+    out['Score'] = np.clip(100 - out[PENALTY_COLS].sum(axis=1), 0, 100)  # 0~100점 사이 고정
+    out['Weather'] = weather_of(out['Score'])
+    return out
+
+def weather_of(score):
+    """점수(스칼라 또는 배열) → '맑음'/'흐림'/'태풍'"""
+    return np.select([np.asarray(score) >= CLEAR_LEVEL, np.asarray(score) >= STORM_LEVEL], ['맑음', '흐림'], default='태풍')
+
+def score_exposure(score, table=None):
+    """점수 배열 → 날씨별 비중 배열 (WEATHER_EXPOSURE 기준)"""
+    table = table or WEATHER_EXPOSURE
+    return pd.Series(weather_of(score)).map(table).to_numpy(dtype='float64')
+
+def _prepare(df):
+    """매크로 종가 → ffill 후 VIX가 있는 날만 (다른 지표의 NaN은 남겨 _score_frame에서 감점 없이 처리)"""
+    df = df.ffill()
+    return df[df['^VIX'].notna()] if not df.empty else df
+
+def score_history(df):
+    """매크로 종가 (날짜 × 심볼) → 가용한 모든 날짜의 점수 DataFrame
+
+    VIX가 있는 날부터 계산하고, 아직 없는 지표(예: 2007년 이전 OVX)는 감점 없이 둡니다.
+    """
+    return _score_frame(_prepare(df))
+
+def extend_score_history(prev, df):
+    """이전 점수 이력에 새 날짜만 덧붙임 (SCORE_WARMUP개 봉 + 새 봉만 다시 계산)
+
+    이전 마지막 날의 점수가 새 입력으로 다시 계산해도 같을 때만 덧붙이고,
+    달라졌으면(과거 시세 수정) 전체를 다시 계산합니다.
+    """
+    if prev is None or prev.empty: return score_history(df)
+    df = _prepare(df)
+    last = prev.index[-1]
+    if last not in df.index: return score_history(df)
+    pos = df.index.get_loc(last)
+    if pos == len(df) - 1: return prev
+    tail = _score_frame(df.iloc[max(0, pos - SCORE_WARMUP):])
+    if pos >= SCORE_WARMUP and tail.loc[last, 'Score'] != prev.loc[last, 'Score']: return score_history(df)
+    return pd.concat([prev, tail[tail.index > last]])
+
+def score_macro_weather(df):
+    """매크로 종가 (날짜 × 심볼) → (점수, 날씨, 이모지, 색상, 세부지표) / 데이터가 없으면 None
+
+    score_history와 같은 입력 처리라 점수는 score_history(df)의 마지막 행과 같습니다 (없는 지표는 감점 없이 '-').
+    """
+    df = _prepare(df)
+
+    if df.empty: return None
+
+    today = _score_frame(df).iloc[-1]
+    score = today['Score']
+
+    # 날씨 판별
+    if score >= CLEAR_LEVEL: weather, emoji, color = "아주 맑음 (레버리지 풀악셀 가능)", "☀️", "#10b981"
+    elif score >= STORM_LEVEL: weather, emoji, color = "흐림 (비중 조절 및 관망)", "🌤️", "#f59e0b"
+    else: weather, emoji, color = "태풍 경보 (현금/SGOV 대피 권장!)", "⛈️", "#ef4444"
+
+    fmt = lambda key, tpl: '-' if pd.isna(today[key]) else tpl.format(today[key])
+
+    # 💡 [핵심 수술] VIX가 20 이상이면 얄짤없이 "위험"으로 빨간불을 켭니다!
+    details = {
+        "VIX": {"val": fmt('VIX', '{:.1f}'), "stat": "위험" if today['VIX'] >= 20 else "안전", "col": "#ef4444" if today['VIX'] >= 20 else "#10b981"},
+        "OVX": {"val": fmt('OVX', '{:.1f}'), "stat": "위험" if today['pen_ovx'] > 0 else "안전", "col": "#ef4444" if today['pen_ovx'] > 0 else "#10b981"},
+        "Spread": {"val": fmt('Spread', '{:.2f}%'), "stat": "위험" if today['pen_spread'] > 0 else "안전", "col": "#ef4444" if today['pen_spread'] > 0 else "#10b981"},
+        "HYG": {"val": fmt('HYG', '${:.2f}'), "stat": "위험" if today['pen_hyg'] > 0 else "안전", "col": "#ef4444" if today['pen_hyg'] > 0 else "#10b981"},
+        "DXY": {"val": fmt('DXY', '{:.2f}'), "stat": "위험" if today['pen_dxy'] > 0 else "안전", "col": "#ef4444" if today['pen_dxy'] > 0 else "#10b981"},
+        "Ratio": {"val": fmt('Ratio', '{:.3f}'), "stat": "방어적" if today['pen_ratio'] > 0 else "공격적", "col": "#f59e0b" if today['pen_ratio'] > 0 else "#10b981"}
+    }
+    return score, weather, emoji, color, details
+
+def regime_stats(close, history, horizon=20):
+    """날씨 구간별 (거래일 비중, 이후 horizon일 평균/하위 10% 수익률, 연율 변동성) — 기준선 검증용
+
+    close: 종목 종가 Series, history: score_history() 결과. 점수는 그날 종가까지 알 수 있으므로
+    이후 수익률은 다음 날부터 셉니다.
+    """
+    weather = history['Weather'].reindex(close.index, method='ffill')
+    fwd = (close.shift(-horizon) / close - 1) * 100
+    daily = close.pct_change().shift(-1)
+    df = pd.DataFrame({'날씨': weather, 'fwd': fwd, 'daily': daily}).dropna(subset=['날씨'])
+    g = df.groupby('날씨')
+    out = pd.DataFrame({
+        '거래일 비중(%)': g.size() / len(df) * 100,
+        f'이후 {horizon}일 평균(%)': g['fwd'].mean(),
+        f'이후 {horizon}일 하위 10%(%)': g['fwd'].quantile(0.1),
+        '연율 변동성(%)': g['daily'].std() * np.sqrt(252) * 100,
+    })
+    return out.reindex([w for w in WEATHER_EXPOSURE if w in out.index])
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+import price_store
+
+# ── 메모리 시세 저장소: 공용 날짜 인덱스 + (날짜 × 종목) float32 종가 (디스크 저장소는 price_store) ──
+class MarketStore:
+    """여러 종목의 종가를 배열 하나로 보관하는 읽기 전용 저장소
+
+    종목마다 OHLCV + 이동평균 DataFrame을 들고 있는 대신 실제로 쓰는 종가만 float32로 담고,
+    이동평균 같은 파생 열은 history()를 부를 때 해당 종목만 계산합니다.
+    배열이 쓰기 금지라 st.cache_resource로 여러 세션이 복사 없이 같은 객체를 참조해도 안전합니다.
+    """
+    def __init__(self, closes):
+        # closes: {티커: 종가 Series (종목 자체 거래일 기준)}
+        stamps = [s.index.to_numpy(dtype='datetime64[ns]') for s in closes.values()]
+        self.dates = pd.DatetimeIndex(np.unique(np.concatenate(stamps)) if stamps else [])
+        values = np.full((len(self.dates), len(closes)), np.nan, dtype='float32')
+        for j, s in enumerate(closes.values()):
+            values[self.dates.get_indexer(s.index), j] = s.to_numpy(dtype='float32')
+        values.flags.writeable = False
+        self.close = values
+        self.columns = {t: j for j, t in enumerate(closes)}
+
+    def __contains__(self, ticker):
+        return ticker in self.columns
+
+    @property
+    def nbytes(self):
+        return self.close.nbytes + self.dates.nbytes
+
+    def close_series(self, ticker):
+        """종목 하나의 종가 Series (그 종목에 봉이 없는 날짜는 제외)"""
+        col = self.close[:, self.columns[ticker]]
+        valid = ~np.isnan(col)
+        return pd.Series(col[valid].astype('float64'), index=self.dates[valid], name='Close')
+
+    def history(self, ticker):
+        """상세 차트/기존 계산용 Close·MA20·MA200 DataFrame (요청 시 계산)"""
+        return history_frame(self.close_series(ticker))
+
+    def panel(self, tickers):
+        """{이름: 티커} → 종가 패널 DataFrame[날짜 × 이름] (모든 종목이 비어 있는 날짜는 제외)"""
+        names = [n for n, t in tickers.items() if t in self.columns]
+        values = self.close[:, [self.columns[tickers[n]] for n in names]]
+        rows = ~np.isnan(values).all(axis=1)
+        return pd.DataFrame(values[rows], index=self.dates[rows], columns=names)
+
+def history_frame(close):
+    return pd.DataFrame({'Close': close, 'MA20': close.rolling(window=20).mean(), 'MA200': close.rolling(window=200).mean()})
+
+def entry_history(entry):
+    """entry의 일봉 이력 — 압축 저장소를 가리키는 entry는 그 자리에서 만들어 돌려줍니다.
+
+    이력을 메모리에 남기지 않은 대형 유니버스 종목은 로컬 가격 저장소(price_store)에서 읽습니다.
+    """
+    if 'history' in entry: return entry['history']
+    if 'store' in entry: return entry['store'].history(entry['ticker'])
+    df = price_store.load(entry['ticker'])
+    close = df['Close'].ffill().dropna().astype('float64') if df is not None else pd.Series(dtype='float64', name='Close')
+    return history_frame(close.rename('Close'))
@@ -1,10 +1,9 @@
 import streamlit as st
-import plotly.graph_objects as go
 import sys
 import os
 import pandas as pd
-import numpy as np
-import yfinance as yf  # 💡 [NEW] 매크로 데이터를 가져오기 위해 추가!
+import time
+from datetime import datetime
 
 # [1] 경로 설정
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -14,8 +13,16 @@ if parent_dir not in sys.path:
 
 # [2] 부품 로드 (제자님의 기존 로직 100% 보존)
 try:
-    from data_fetcher import get_all_market_data
-    from calculations import calculate_sector_scores, calculate_individual_metrics, calculate_core_sector_scores
+    from async_loader import submit, load_macro, load_market
+    from swr_cache import request as swr_request, stats as swr_stats, SWR_TTL
+    from macro_weather import CLEAR_LEVEL, STORM_LEVEL
+    from market_store import entry_history
+    from chart_data import window
+    from snapshots import latest_version, load_snapshot, SNAPSHOT_STALE
+    from instrumentation import stage, mark_miss, render_sidebar
+    from calculations import top_rows, close_panel
+    from view_models import sector_view, individual_view, core_view, select, card_rows, INDIVIDUAL_COLS, GROUP_LABELS, GROUP_COLORS
+    from rotation import sector_score_history, rotation_backtest, SAFE_ASSETS, SAFE_ALARM, REBALANCE
 except ImportError as e:
     st.error(f"🚨 부품 로딩 실패! (에러: {e})")
     st.stop()
@@ -69,90 +76,123 @@ html, body, [class*="css"] { font-family: 'Noto Sans KR', sans-serif; }
 """, unsafe_allow_html=True)
 
 st.title("📊 매크로 & 섹터 듀얼 위험알리미")
+
+# 💡 refresher.py가 만든 최신 스냅샷이 있으면 그것만 읽고, 없으면 예전처럼 이 자리에서 계산합니다.
+@st.cache_resource(max_entries=2, show_spinner=False)
+def load_snapshot_cached(version):
+    mark_miss()
+    return load_snapshot(version)
+
+snapshot = None
+snapshot_version = latest_version()
+if snapshot_version:
+    with stage('load_snapshot', cache=True, version=snapshot_version):
+        try: snapshot = load_snapshot_cached(snapshot_version)
+        except Exception: snapshot = None
+if snapshot:
+    age_min = (time.time() - snapshot['built_at']) / 60
+    built = datetime.fromtimestamp(snapshot['built_at']).strftime('%Y-%m-%d %H:%M')
+    if age_min * 60 > SNAPSHOT_STALE:
+        st.warning(f"🕒 데이터 기준 {built} ({age_min:.0f}분 전) — 백그라운드 갱신이 멈춘 것 같습니다.")
+    else:
+        st.caption(f"🕒 데이터 기준 {built} ({age_min:.0f}분 전, 백그라운드 갱신)")
 st.markdown("---")
 
 # =====================================================================
 # 🌍 [NEW 1층] 탑다운: 글로벌 매크로 날씨 (스마트 머니 추적기)
 # =====================================================================
-@st.cache_data(ttl=300, show_spinner=False)
-def get_macro_weather():
-    # VIX, OVX, 10년물, 3개월물, 하이일드, 달러인덱스, 경기소비재, 필수소비재
-    tickers = "^VIX ^OVX ^TNX ^IRX HYG DX-Y.NYB XLY XLP"
-    df = yf.download(tickers, period="1y", interval="1d", progress=False)['Close']
-    df = df.ffill().dropna()
-
-    if df.empty: return None
-
-    # 지표 계산
-    df['Spread'] = df['^TNX'] - df['^IRX']
-    df['HYG_MA50'] = df['HYG'].rolling(50).mean()
-    df['DXY_MA20'] = df['DX-Y.NYB'].rolling(20).mean()
-    df['XLY_XLP_Ratio'] = df['XLY'] / df['XLP']
-    df['Ratio_MA50'] = df['XLY_XLP_Ratio'].rolling(50).mean()
-    
-    today = df.iloc[-1]
-    
-  # 💡 [정밀 튜닝 완료] 감점 로직 (제자님의 아이디어 반영: VIX 기준 강화!)
-    # VIX 20부터 감점이 시작되고, 페널티 가중치(1.5)를 늘려 더 예민하게 반응합니다!
-    pen_vix = max(0, today['^VIX'] - 20) * 1.5 
-    pen_ovx = max(0, today['^OVX'] - 35) * 1.2
-    pen_spread = 20 if today['Spread'] < -0.5 else 0
-    pen_hyg = 20 if today['HYG'] < today['HYG_MA50'] else 0  
-    pen_dxy = 15 if today['DX-Y.NYB'] > (today['DXY_MA20'] * 1.02) else 0  
-    pen_ratio = 15 if today['XLY_XLP_Ratio'] < today['Ratio_MA50'] else 0  
-
-    score = 100 - (pen_vix + pen_ovx + pen_spread + pen_hyg + pen_dxy + pen_ratio)
-    score = max(0, min(100, score)) # 0~100점 사이 고정
-
-    # 날씨 판별
-    if score >= 80: weather, emoji, color = "아주 맑음 (레버리지 풀악셀 가능)", "☀️", "#10b981"
-    elif score >= 50: weather, emoji, color = "흐림 (비중 조절 및 관망)", "🌤️", "#f59e0b"
-    else: weather, emoji, color = "태풍 경보 (현금/SGOV 대피 권장!)", "⛈️", "#ef4444"
-
-    # 💡 [핵심 수술] VIX가 20 이상이면 얄짤없이 "위험"으로 빨간불을 켭니다!
-    details = {
-        "VIX": {"val": f"{today['^VIX']:.1f}", "stat": "위험" if today['^VIX'] >= 20 else "안전", "col": "#ef4444" if today['^VIX'] >= 20 else "#10b981"},
-        "OVX": {"val": f"{today['^OVX']:.1f}", "stat": "위험" if pen_ovx > 0 else "안전", "col": "#ef4444" if pen_ovx > 0 else "#10b981"},
-        "Spread": {"val": f"{today['Spread']:.2f}%", "stat": "위험" if pen_spread > 0 else "안전", "col": "#ef4444" if pen_spread > 0 else "#10b981"},
-        "HYG": {"val": f"${today['HYG']:.2f}", "stat": "위험" if pen_hyg > 0 else "안전", "col": "#ef4444" if pen_hyg > 0 else "#10b981"},
-        "DXY": {"val": f"{today['DX-Y.NYB']:.2f}", "stat": "위험" if pen_dxy > 0 else "안전", "col": "#ef4444" if pen_dxy > 0 else "#10b981"},
-        "Ratio": {"val": f"{today['XLY_XLP_Ratio']:.3f}", "stat": "방어적" if pen_ratio > 0 else "공격적", "col": "#f59e0b" if pen_ratio > 0 else "#10b981"}
-    }
-    return score, weather, emoji, color, details
-
-macro_data = get_macro_weather()
-
-if macro_data:
-    score, weather, emoji, color, details = macro_data
-    st.markdown(f"""
-    <div class="macro-card">
-        <h3 style="margin-top:0; color:white;">🌍 글로벌 매크로 기상청 (탑다운 레이더)</h3>
-        <h1 style="color:{color}; font-size:2.5rem; margin:10px 0;">{emoji} {score:.0f}점 : {weather}</h1>
-        <div style="display:flex; justify-content:space-between; flex-wrap:wrap; margin-top:15px; border-top:1px solid rgba(255,255,255,0.2); padding-top:15px; line-height:1.8;">
-            <div style="margin-right:15px;"><b>VIX(공포):</b> {details['VIX']['val']} <span style="color:{details['VIX']['col']}; font-weight:bold;">[{details['VIX']['stat']}]</span></div>
-            <div style="margin-right:15px;"><b>OVX(원유):</b> {details['OVX']['val']} <span style="color:{details['OVX']['col']}; font-weight:bold;">[{details['OVX']['stat']}]</span></div>
-            <div style="margin-right:15px;"><b>금리차:</b> {details['Spread']['val']} <span style="color:{details['Spread']['col']}; font-weight:bold;">[{details['Spread']['stat']}]</span></div>
-            <div style="margin-right:15px;"><b>HYG(정크):</b> {details['HYG']['val']} <span style="color:{details['HYG']['col']}; font-weight:bold;">[{details['HYG']['stat']}]</span></div>
-            <div style="margin-right:15px;"><b>달러(유동성):</b> {details['DXY']['val']} <span style="color:{details['DXY']['col']}; font-weight:bold;">[{details['DXY']['stat']}]</span></div>
-            <div><b>스마트머니:</b> {details['Ratio']['val']} <span style="color:{details['Ratio']['col']}; font-weight:bold;">[{details['Ratio']['stat']}]</span></div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+# 💡 매크로와 바텀업 적재를 백그라운드 이벤트 루프에 한꺼번에 걸어 두고(async_loader), 먼저 끝나는 매크로부터 그립니다.
+#    swr_cache가 모든 세션/재실행에 같은 값을 주고, TTL이 지나면 직전 값을 그대로 보여주면서 갱신은 뒤에서 한 번만 돌립니다.
+def freshness_note(res, label):
+    """직전 값으로 응답 중이면(백그라운드 갱신 중 / 갱신 실패) 데이터 나이를 알려줌"""
+    age_min = res['age'] / 60
+    if res['error']:
+        st.warning(f"⚠️ {label} 갱신 실패 — {age_min:.0f}분 전 데이터를 표시 중입니다. ({res['error']})")
+    elif res['age'] >= SWR_TTL:
+        st.caption(f"🔄 {label} 백그라운드 갱신 중 — {age_min:.0f}분 전 데이터를 표시 중입니다.")
+
+if snapshot:
+    macro_data = snapshot['macro']
+    macro_history = snapshot.get('macro_history')
 else:
-    st.warning("⏳ 매크로 데이터를 불러오는 중입니다...")
+    macro_req = swr_request('risk:macro', lambda: submit(load_macro()))
+    market_req = swr_request('risk:market', lambda: submit(load_market()))
+    with stage('wait:macro'):
+        # VIX, OVX, 10년물, 3개월물, 하이일드, 달러인덱스, 경기소비재, 필수소비재 (백테스트와 같은 공용 캐시에서 최근 1년 + 점수 이력)
+        macro_res = macro_req.result()
+    macro_data, macro_history = macro_res['value']
+    freshness_note(macro_res, "매크로")
+
+@st.fragment
+def render_macro_card(macro_data):
+    with stage('render:macro_card'):
+        if macro_data:
+            score, weather, emoji, color, details = macro_data
+            st.markdown(f"""
+            <div class="macro-card">
+                <h3 style="margin-top:0; color:white;">🌍 글로벌 매크로 기상청 (탑다운 레이더)</h3>
+                <h1 style="color:{color}; font-size:2.5rem; margin:10px 0;">{emoji} {score:.0f}점 : {weather}</h1>
+                <div style="display:flex; justify-content:space-between; flex-wrap:wrap; margin-top:15px; border-top:1px solid rgba(255,255,255,0.2); padding-top:15px; line-height:1.8;">
+                    <div style="margin-right:15px;"><b>VIX(공포):</b> {details['VIX']['val']} <span style="color:{details['VIX']['col']}; font-weight:bold;">[{details['VIX']['stat']}]</span></div>
+                    <div style="margin-right:15px;"><b>OVX(원유):</b> {details['OVX']['val']} <span style="color:{details['OVX']['col']}; font-weight:bold;">[{details['OVX']['stat']}]</span></div>
+                    <div style="margin-right:15px;"><b>금리차:</b> {details['Spread']['val']} <span style="color:{details['Spread']['col']}; font-weight:bold;">[{details['Spread']['stat']}]</span></div>
+                    <div style="margin-right:15px;"><b>HYG(정크):</b> {details['HYG']['val']} <span style="color:{details['HYG']['col']}; font-weight:bold;">[{details['HYG']['stat']}]</span></div>
+                    <div style="margin-right:15px;"><b>달러(유동성):</b> {details['DXY']['val']} <span style="color:{details['DXY']['col']}; font-weight:bold;">[{details['DXY']['stat']}]</span></div>
+                    <div><b>스마트머니:</b> {details['Ratio']['val']} <span style="color:{details['Ratio']['col']}; font-weight:bold;">[{details['Ratio']['stat']}]</span></div>
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.warning("⏳ 매크로 데이터를 불러오는 중입니다...")
+
+render_macro_card(macro_data)
+
+@st.fragment
+def render_macro_history(history):
+    # 💡 날마다 같은 감점 규칙으로 다시 계산한 점수 이력 — 맑음/흐림/태풍 기준선이 실제로 맞았는지 확인용
+    if history is None or history.empty: return
+    with st.expander("📈 매크로 날씨 점수 추이", expanded=False):
+        d0, d1 = history.index[0].to_pydatetime(), history.index[-1].to_pydatetime()
+        view_start = max(d0, (history.index[-1] - pd.DateOffset(years=3)).to_pydatetime())
+        start, end = st.slider("🔍 구간", min_value=d0, max_value=d1, value=(view_start, d1), format="YYYY-MM", key="macro_range")
+        with stage('render:macro_history'):
+            view = window(history[['Score']], start, end)
+            # 💡 plotly는 차트를 그릴 때 처음 적재 (콜드 스타트에서 카드/표가 먼저 뜨도록)
+            import plotly.graph_objects as go
+            fig = go.Figure(go.Scattergl(x=view.index, y=view['Score'], name='날씨 점수', line=dict(color='#1e293b', width=1.5)))
+            fig.add_hrect(y0=CLEAR_LEVEL, y1=100, fillcolor='#10b981', opacity=0.12, line_width=0)
+            fig.add_hrect(y0=STORM_LEVEL, y1=CLEAR_LEVEL, fillcolor='#f59e0b', opacity=0.12, line_width=0)
+            fig.add_hrect(y0=0, y1=STORM_LEVEL, fillcolor='#ef4444', opacity=0.12, line_width=0)
+            fig.update_layout(template="plotly_white", height=300, yaxis_range=[0, 100], margin=dict(l=10, r=10, t=10, b=10))
+            st.plotly_chart(fig, use_container_width=True)
+            share = history.loc[start:end, 'Weather'].value_counts(normalize=True) * 100
+            st.caption(" | ".join(f"{w} {share.get(w, 0):.0f}%" for w in ['맑음', '흐림', '태풍']) + " (선택 구간 거래일 비중)")
+
+render_macro_history(macro_history)
 
 # =====================================================================
 # 🏢 [2층] 바텀업: 섹터 및 개별 종목 (제자님의 기존 로직 완벽 보존)
 # =====================================================================
-@st.cache_data(ttl=300)
-def load_all_data():
-    return get_all_market_data()
-
-with st.spinner("⏳ 바텀업 데이터를 분석 중입니다..."):
-    all_data      = load_all_data()
-    df_sectors    = calculate_sector_scores(all_data['sector_etfs'])
-    df_individual = calculate_individual_metrics(all_data['individual_stocks'])
-    df_core       = calculate_core_sector_scores(all_data['core_sectors'])
+# 💡 바텀업 수신과 그룹별 점수 계산은 매크로 카드를 그리는 동안 이미 백그라운드에서 진행 중입니다.
+#    (프로세스 메모리의 값을 공유하므로 세션/재실행마다 pickle 복사본을 만들지 않고 읽기 전용 저장소를 그대로 참조)
+if snapshot:
+    all_data, df_sectors, df_individual, df_core = snapshot['market'], snapshot['sectors'], snapshot['individual'], snapshot['core']
+else:
+    with st.spinner("⏳ 바텀업 데이터를 분석 중입니다..."):
+        with stage('wait:market'):
+            market_res = market_req.result()
+        all_data, scores = market_res['value']['market'], market_res['value']['scores']
+        df_sectors, df_individual, df_core = scores['sector_etfs'], scores['individual_stocks'], scores['core_sectors']
+    freshness_note(market_res, "바텀업")
+# 데이터 버전: 스냅샷 버전 또는 swr_cache 갱신 번호 (백그라운드 갱신이 끝나 값이 바뀔 때만 달라짐)
+# 💡 id(all_data)는 예전 결과가 GC된 뒤 새 결과에 재사용될 수 있어 낡은 뷰 모델을 돌려줄 수 있습니다.
+data_key = snapshot_version if snapshot else f"live-{market_res['version']}"
+
+# 💡 수신 실패/타임아웃 종목은 조용히 빠지지 않도록 알려줍니다.
+fetch_report = all_data.get('fetch_report', {})
+if fetch_report.get('failed') or fetch_report.get('timed_out'):
+    st.caption(f"⚠️ 데이터 수신 실패: {', '.join(fetch_report.get('failed', {})) or '-'} | "
+               f"타임아웃: {', '.join(fetch_report.get('timed_out', [])) or '-'}")
 
 # [4] 메인 시장 상태 지표 (데드존 장착 완료!)
 st.subheader("🏢 시장 체력 스캐너 (바텀업 레이더)")
@@ -173,80 +213,101 @@ else:
 
 # [5] 조기경보 시스템
 top_5_sectors = df_sectors.head(5)['섹터'].tolist()
-safe_assets   = ['CASH', '장기국채', '물가연동채', '유틸리티', '필수소비재']
-safe_count    = sum(1 for s in top_5_sectors if s in safe_assets)
-if safe_count >= 2:
+safe_count    = sum(1 for s in top_5_sectors if s in SAFE_ASSETS)
+if safe_count >= SAFE_ALARM:
     st.error(f"🚨 **안전자산 쏠림 경보 발령!** 현재 상위 5개 섹터 중 {safe_count}개가 방어적 자산입니다. "
              "스마트머니가 피난 중입니다. 관망하십시오!")
 elif safe_count == 1:
     st.warning("⚠️ **안전자산 상승 주의:** 상위 5위권 내에 방어적 자산이 포착되었습니다.")
 
+# 🔄 S-L 로테이션 백테스트 (과거 매일의 순위로 "상위 5개 매수 + 안전자산 쏠림 시 대피"를 검증)
+@st.cache_resource(ttl=300, show_spinner=False)
+def load_rotation_scores(data_key, _sector_data):
+    mark_miss()
+    # 💡 데이터 버전(스냅샷/캐시 객체)마다 한 번만 L/S/S-L/순위 패널을 만들고, 보유 개수/주기만 바꾼 재실행은 재사용
+    close, _ = close_panel(_sector_data)
+    return close, sector_score_history(close)
+
+@st.fragment
+def render_rotation(close, scores):
+    with st.expander("🔄 S-L 로테이션 백테스트 (상위 N개 보유 vs S&P)", expanded=False):
+        r1, r2, r3 = st.columns(3)
+        top_n = r1.number_input("보유 개수", min_value=1, max_value=max(1, close.shape[1]), value=min(5, close.shape[1]), key="rot_top_n")
+        freq = r2.selectbox("리밸런싱", list(REBALANCE), key="rot_freq")
+        risk_off = r3.toggle("안전자산 쏠림 경보 시 CASH 대피", value=True, key="rot_risk_off")
+        with stage('render:rotation'):
+            res = rotation_backtest(close, scores, int(top_n), REBALANCE[freq], risk_off)
+            if res is None:
+                st.caption("💡 MA200이 준비될 만큼 이력이 쌓이면 표시됩니다.")
+                return
+            st.dataframe(res['stats'].round(2), use_container_width=True, hide_index=True)
+            view = window(pd.DataFrame({'로테이션': res['equity'], 'S&P': res['benchmark']}) if res['benchmark'] is not None else res['equity'].to_frame('로테이션'))
+            import plotly.graph_objects as go
+            fig = go.Figure([go.Scattergl(x=view.index, y=view[c], name=c, line=dict(dash='dot') if c != '로테이션' else None) for c in view.columns])
+            fig.update_layout(template="plotly_white", height=320, margin=dict(l=10, r=10, t=10, b=10), legend=dict(orientation="h", y=1.02, x=1, xanchor="right"))
+            st.plotly_chart(fig, use_container_width=True)
+            st.dataframe(res['holdings'].tail(10).iloc[::-1].round({'회전율': 2}), use_container_width=True, hide_index=True)
+
+if all_data.get('sector_etfs'):
+    with stage('load_rotation_scores', cache=True):
+        rot_close, rot_scores = load_rotation_scores(data_key, all_data['sector_etfs'])
+    render_rotation(rot_close, rot_scores)
+
 st.markdown("---")
 st.info("📱 모바일에서 표가 잘리면 **테이블을 좌우로 스크롤**하거나 **카드 뷰**를 이용하세요!")
 
 # [6] 메인 탭
-tab1, tab2, tab3 = st.tabs(["📈 섹터 ETF", "💹 개별 종목", "🎯 11개 핵심 섹터"])
+TABLE_TOP_N = 50  # 이보다 큰 표는 검색/상위 N 컨트롤을 띄우고 잘라 낸 행만 브라우저로 보냄
+
+def table_controls(df, key, cols, sort_by=None):
+    """대형 유니버스 표를 서버에서 검색/상위 N개로 줄임 (작은 표는 그대로)"""
+    if len(df) <= TABLE_TOP_N: return df
+    c1, c2 = st.columns([3, 1])
+    query = c1.text_input("🔎 이름/티커 검색", key=f"{key}_q")
+    n = c2.number_input("상위 N개", min_value=10, max_value=len(df), value=TABLE_TOP_N, step=10, key=f"{key}_n")
+    view = top_rows(df, query, int(n), cols, sort_by)
+    st.caption(f"전체 {len(df):,}개 중 {len(view):,}개 표시")
+    return view
+
+# 💡 표 CSS/서식과 카드 HTML은 데이터 버전마다 한 번만 만들고(view_models), 재실행(탭 전환, 검색, 다른 위젯)에서는
+#    고른 행만 잘라 씁니다. 카드는 열마다 markdown 한 번으로 그립니다.
+@st.cache_resource(max_entries=4, show_spinner=False)
+def load_view_models(data_key, _df_sectors, _df_individual, _df_core):
+    mark_miss()
+    return {'sector': sector_view(_df_sectors), 'individual': individual_view(_df_individual), 'core': core_view(_df_core)}
+
+def styled(table, css, fmt):
+    return table.style.apply(lambda _: css, axis=None).format(fmt)
+
+def render_cards(cards):
+    """카드 HTML 목록을 두 열에 번갈아 배치"""
+    cols = st.columns(2)
+    for k in range(2):
+        with cols[k]: st.markdown("".join(cards[k::2]), unsafe_allow_html=True)
 
 # ══════════════════════════════════════
 # TAB1: 섹터 ETF
 # ══════════════════════════════════════
-with tab1:
+@st.fragment
+def render_sector_tab(vm):
     st.subheader("📈 섹터 ETF 스코어 (S-L 순위)")
-    sub_t, sub_c = st.tabs(["📑 테이블 뷰", "🎴 카드 뷰"])
-
-    with sub_t:
-        def hb(row):
-            s = row['섹터']
-            if s in ['S&P', 'NASDAQ']:      return ['background-color:#d9d9d9;font-weight:bold'] * len(row)
-            elif s in ['CASH','물가연동채','장기국채']: return ['background-color:#e2efda;color:#385723;font-weight:bold'] * len(row)
-            return [''] * len(row)
-        st.dataframe(
-            df_sectors.style.apply(hb, axis=1)
-                .background_gradient(cmap='RdYlGn', subset=['L-score','S-score','S-L','20일(%)'])
-                .format({'L-score':'{:.2f}','S-score':'{:.2f}','S-L':'{:.2f}','20일(%)':'{:.2f}%'}),
-            use_container_width=True, height=500
-        )
-
-    with sub_c:
-        def get_sig_order(row):
-            # 💡 [핵심 수술] 개별 섹터도 0 근처에서 알짱거리는 휩쏘(거짓 신호)를 차단!
-            if row['S-score'] > 0.05 and row['L-score'] > 0.05: return 0
-            if row['S-score'] < -0.05 and row['L-score'] < -0.05: return 2
-            return 1 # 그 사이(-0.05 ~ 0.05)는 무조건 관망(1)으로 처리!
-
-        df_card = df_sectors.copy()
-        df_card['_o'] = df_card.apply(get_sig_order, axis=1)
-        df_card = df_card.sort_values(['_o','S-L'], ascending=[True, False]).reset_index(drop=True)
-
-        sig_labels = {0:"✅ 매수 구간", 1:"⚠️ 관망 구간", 2:"🚨 도망챠 구간"}
-        sig_colors = {0:"#d1fae5",     1:"#fef9c3", 2:"#fee2e2"}
-        current_sig = -1
-        cols = st.columns(2)
-        col_idx = 0
-
-        for _, row in df_card.iterrows():
-            o = row['_o']
-            if o != current_sig:
-                current_sig = o
-                st.markdown(f"<div style='background:{sig_colors[o]};padding:6px 12px;border-radius:6px;"
-                            f"font-weight:700;font-size:0.82rem;margin:10px 0 6px 0; color:#1e293b;'>{sig_labels[o]}</div>",
+    df_sectors_view = table_controls(vm['table'], 'sector', ('섹터', '티커'))
+    sub_t, sub_c = st.tabs(["📑 테이블 뷰", "🎴 카드 뷰"], key="sector_view", on_change="rerun")
+
+    if sub_t.open:
+        with sub_t, stage('render:sector_table'):
+            st.dataframe(styled(*select(vm, df_sectors_view), vm['format']), use_container_width=True, height=500)
+
+    if sub_c.open:
+        with sub_c, stage('render:sector_cards'):
+            # 💡 [핵심 수술] 개별 섹터도 0 근처에서 알짱거리는 휩쏘(거짓 신호)를 차단! (관망 구간은 view_models.sector_view)
+            rows = card_rows(vm, df_sectors_view)
+            sig = vm['signal'][rows]
+            for o in dict.fromkeys(sig.tolist()):
+                st.markdown(f"<div style='background:{GROUP_COLORS[o]};padding:6px 12px;border-radius:6px;"
+                            f"font-weight:700;font-size:0.82rem;margin:10px 0 6px 0; color:#1e293b;'>{GROUP_LABELS[o]}</div>",
                             unsafe_allow_html=True)
-                col_idx = 0
-                cols = st.columns(2)
-            
-            css = ["card-buy", "card-wait", "card-exit"][o]
-            sig_txt = ["✅ 매수 신호", "⚠️ 관망", "🚨 도망챠"][o]
-            ic = ["🟢", "🟡", "🔴"][o]
-            
-            with cols[col_idx % 2]:
-                st.markdown(f"""
-                <div class="unified-card {css}">
-                    <span class="ticker-label">{ic} {row['섹터']} <span style='color:#64748b;font-weight:400;font-size:0.9rem;'>({row['티커']})</span></span>
-                    <span class="signal-text">{sig_txt}</span>
-                    <div class="score-line">S-L: <b>{row['S-L']:.3f}</b> | 20일: <b>{row['20일(%)']:.2f}%</b><br>
-                    L: {row['L-score']:.3f} / S: {row['S-score']:.3f}</div>
-                </div>""", unsafe_allow_html=True)
-            col_idx += 1
+                render_cards(vm['cards'][rows[sig == o]])
 
     st.markdown("##### 💡 퀀트 지표 핵심 요약")
     st.caption("**📊 L-score**: 200일선 이격도, 52주 고점 위치 등 장기 추세 점수")
@@ -256,137 +317,97 @@ with tab1:
 # ══════════════════════════════════════
 # TAB2: 개별 종목
 # ══════════════════════════════════════
-with tab2:
+@st.fragment
+def render_individual_tab(vm):
     st.subheader("💹 개별 종목 추적")
-    sub_t2, sub_c2 = st.tabs(["📑 테이블 뷰", "🎴 카드 뷰"])
-
-    df_display = df_individual.copy()
-    
-    def add_asset_icon(tick):
-        if tick in ['TQQQ', 'SOXL', 'UPRO', 'QLD', 'SSO', 'TECL', 'FNGU', 'BULZ', 'NVDL', 'CONL']: 
-            return f"🟥 {tick}"
-        elif tick in ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META', 'NVDA', 'TSLA', 'SPY', 'QQQ', 'DIA']: 
-            return f"🟩 {tick}"
-        else: 
-            return f"🟨 {tick}"
-        
-    df_display['티커_아이콘'] = df_display['티커'].apply(add_asset_icon)
-    
-    num_cols = ['연초대비','high대비','200대비','전일대비','52저대비']
-    for col in num_cols:
-        df_display[col] = pd.to_numeric(df_display[col], errors='coerce').fillna(0)
-
-    with sub_t2:
-        cols_order = ['티커_아이콘', '현재가', '연초대비', 'high대비', '200대비', '전일대비', '52저대비']
-        df_table = df_display[cols_order].rename(columns={'티커_아이콘': '티커'})
-        
-        st.dataframe(
-            df_table.style
-                .background_gradient(cmap='RdYlGn', subset=num_cols, vmin=-10, vmax=10)
-                .format({
-                    '현재가':'{:.2f}',
-                    '연초대비':'{:.1f}%',
-                    'high대비':'{:.1f}%',
-                    '200대비':'{:.1f}%',
-                    '전일대비':'{:.1f}%',
-                    '52저대비':'{:.1f}%'
-                }),
-            use_container_width=True, height=450
-        )
-        st.caption("💡 🟩 코어 우량주 / 🟨 위성 자산 / 🟥 레버리지·고변동성")
-
-    with sub_c2: 
-        df_stk = df_display.sort_values('연초대비', ascending=False).reset_index(drop=True)
-        cols2 = st.columns(2)
-        for i, row in df_stk.iterrows():
-            ytd = row.get('연초대비', 0)
-            ma200 = row.get('200대비', 0)
-            prev  = row.get('전일대비', 0)
-            high  = row.get('high대비', 0)
-            ticker_with_icon = row['티커_아이콘']
-
-            css = "card-buy" if ytd > 0 else ("card-exit" if ytd < 0 else "card-wait")
-            sig_txt = "✅ 매수 신호" if ytd > 0 else ("🚨 도망챠" if ytd < 0 else "⚠️ 관망")
-            ic = "🟢" if ytd > 0 else ("🔴" if ytd < 0 else "🟡")
-            
-            ytd_str   = f"{ytd:+.1f}%"
-            ma200_str = f"{ma200:+.1f}%"
-            prev_str  = f"{prev:+.1f}%"
-            high_str  = f"{high:+.1f}%"
-
-            with cols2[i % 2]:
-                st.markdown(f"""
-                <div class="unified-card {css}">
-                    <span class="ticker-label">{ic} {ticker_with_icon} <span style='font-size:0.9rem;font-weight:400'>| ${row['현재가']:,.2f}</span></span>
-                    <span class="signal-text">{sig_txt} <span style='font-weight:400'>(YTD: {ytd_str})</span></span>
-                    <div class="score-line">
-                        전일: <b>{prev_str}</b> | 200일: <b>{ma200_str}</b><br>
-                        고점대비: <b>{high_str}</b>
-                    </div>
-                </div>""", unsafe_allow_html=True)
+    df_display = table_controls(vm['table'], 'individual', ('티커',), sort_by='연초대비')
+    sub_t2, sub_c2 = st.tabs(["📑 테이블 뷰", "🎴 카드 뷰"], key="individual_view", on_change="rerun")
+
+    if sub_t2.open:
+        with sub_t2, stage('render:individual_table'):
+            table, css = select(vm, df_display, INDIVIDUAL_COLS, {'티커_아이콘': '티커'})
+            st.dataframe(styled(table, css, vm['format']), use_container_width=True, height=450)
+            st.caption("💡 🟩 코어 우량주 / 🟨 위성 자산 / 🟥 레버리지·고변동성")
+
+    if sub_c2.open:
+        with sub_c2, stage('render:individual_cards'):
+            render_cards(vm['cards'][card_rows(vm, df_display)])
 
 # ══════════════════════════════════════
 # TAB3: 11개 핵심 섹터
 # ══════════════════════════════════════
-with tab3:
+@st.fragment
+def render_core_tab(vm):
     st.subheader("🎯 11개 핵심 섹터 현황")
-    sub_t3, sub_c3 = st.tabs(["📑 테이블 뷰", "🎴 카드 뷰"])
-
-    with sub_t3:
-        st.dataframe(
-            df_core.style
-                .background_gradient(cmap='RdYlGn', subset=['S-SCORE','20일(%)'])
-                .format({'S-SCORE':'{:.2f}','20일(%)':'{:.2f}%'}),
-            use_container_width=True, height=450
-        )
-
-    with sub_c3:
-        df_core_sorted = df_core.sort_values('S-SCORE', ascending=False).reset_index(drop=True)
-        cols3 = st.columns(2)
-        for i, row in df_core_sorted.iterrows():
-            sc  = float(row['S-SCORE'])
-            ret = float(row['20일(%)'])
-            rank = int(row['R1']) if 'R1' in row else i+1
-            
-            css = "card-buy" if sc > 0.05 else ("card-exit" if sc < -0.05 else "card-wait")
-            sig_txt = "✅ 매수 신호" if sc > 0.05 else ("🚨 도망챠" if sc < -0.05 else "⚠️ 관망")
-            ic = "🟢" if sc > 0.05 else ("🔴" if sc < -0.05 else "🟡")
-
-            with cols3[i % 2]:
-                st.markdown(f"""
-                <div class="unified-card {css}">
-                    <span class="ticker-label">{ic} #{rank} {row['섹터']} <span style='color:#64748b;font-weight:400;font-size:0.9rem;'>({row['티커']})</span></span>
-                    <span class="signal-text">{sig_txt}</span>
-                    <div class="score-line">S점수: <b>{sc:+.3f}</b> | 20일 수익: <b>{ret:+.2f}%</b></div>
-                </div>""", unsafe_allow_html=True)
+    df_core_view = table_controls(vm['table'], 'core', ('섹터', '티커'))
+    sub_t3, sub_c3 = st.tabs(["📑 테이블 뷰", "🎴 카드 뷰"], key="core_view", on_change="rerun")
+
+    if sub_t3.open:
+        with sub_t3, stage('render:core_table'):
+            st.dataframe(styled(*select(vm, df_core_view), vm['format']), use_container_width=True, height=450)
+
+    if sub_c3.open:
+        with sub_c3, stage('render:core_cards'):
+            render_cards(vm['cards'][card_rows(vm, df_core_view)])
+
+@st.fragment
+def render_score_tabs(vms):
+    # 💡 탭 전환은 이 프래그먼트만 다시 실행하고, 선택된 탭만 그립니다 (숨은 탭은 처음 열 때 생성).
+    tab1, tab2, tab3 = st.tabs(["📈 섹터 ETF", "💹 개별 종목", "🎯 11개 핵심 섹터"], key="score_tab", on_change="rerun")
+    if tab1.open:
+        with tab1: render_sector_tab(vms['sector'])
+    if tab2.open:
+        with tab2: render_individual_tab(vms['individual'])
+    if tab3.open:
+        with tab3: render_core_tab(vms['core'])
+
+with stage('load_view_models', cache=True):
+    view_models = load_view_models(data_key, df_sectors, df_individual, df_core)
+render_score_tabs(view_models)
 
 # [7] 차트
 st.markdown("---")
-selected = st.selectbox("📉 상세 분석 차트 선택", list(all_data['sector_etfs'].keys()))
-if selected:
-    hist   = all_data['sector_etfs'][selected]['history'].copy()
-    ticker = all_data['sector_etfs'][selected]['ticker']
-    if isinstance(hist.columns, pd.MultiIndex):
-        hist.columns = hist.columns.get_level_values(0)
-    date_list = hist.index.tolist()
-
-    def to_1d(col):
-        s = hist[col]
-        if isinstance(s, pd.DataFrame): s = s.iloc[:, 0]
-        return s.values.flatten()
-
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=date_list, y=to_1d('Close'), name='종가', line=dict(color='blue', width=2)))
-    if 'MA20'  in hist.columns: fig.add_trace(go.Scatter(x=date_list, y=to_1d('MA20'),  name='MA20',  line=dict(dash='dash', color='orange')))
-    if 'MA200' in hist.columns: fig.add_trace(go.Scatter(x=date_list, y=to_1d('MA200'), name='MA200', line=dict(dash='dot',  color='green', width=2)))
-
-    view_days = min(len(hist), 500)
-    fig.update_layout(
-        title=f"{selected} ({ticker}) 분석 차트", template="plotly_white", height=450,
-        xaxis_range=[date_list[-view_days], date_list[-1]], hovermode="x unified",
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-        margin=dict(l=10, r=10, t=50, b=10)
-    )
-    st.plotly_chart(fig, use_container_width=True)
-
 
+@st.fragment
+def render_detail_chart(sector_data, df_sectors):
+    # 💡 차트 선택은 이 프래그먼트만 다시 실행 (표/카드는 다시 만들지 않음)
+    chart_options = list(sector_data.keys()) if len(sector_data) <= TABLE_TOP_N else \
+        top_rows(df_sectors, st.session_state.get('sector_q'), st.session_state.get('sector_n', TABLE_TOP_N), ('섹터', '티커'))['섹터'].tolist()
+    selected = st.selectbox("📉 상세 분석 차트 선택", chart_options)
+    if selected:
+        full   = entry_history(sector_data[selected])
+        ticker = sector_data[selected]['ticker']
+        if isinstance(full.columns, pd.MultiIndex):
+            full.columns = full.columns.get_level_values(0)
+        # 💡 처음엔 최근 500봉만 보내고, 구간을 넓히면 화면 해상도만큼 줄여서(LTTB) 보냅니다.
+        d0, d1 = full.index[0].to_pydatetime(), full.index[-1].to_pydatetime()
+        view_start = full.index[-min(len(full), 500)].to_pydatetime()
+        start, end = st.slider("🔍 차트 구간", min_value=d0, max_value=d1, value=(view_start, d1), format="YYYY-MM-DD", key=f"detail_range_{selected}")
+    with stage('render:detail_chart'):
+        if selected:
+            hist = window(full, start, end, cols=[c for c in ['Close', 'MA20', 'MA200'] if c in full.columns])
+            date_list = hist.index.tolist()
+
+            def to_1d(col):
+                s = hist[col]
+                if isinstance(s, pd.DataFrame): s = s.iloc[:, 0]
+                return s.values.flatten()
+
+            import plotly.graph_objects as go
+            fig = go.Figure()
+            fig.add_trace(go.Scattergl(x=date_list, y=to_1d('Close'), name='종가', line=dict(color='blue', width=2)))
+            if 'MA20'  in hist.columns: fig.add_trace(go.Scattergl(x=date_list, y=to_1d('MA20'),  name='MA20',  line=dict(dash='dash', color='orange')))
+            if 'MA200' in hist.columns: fig.add_trace(go.Scattergl(x=date_list, y=to_1d('MA200'), name='MA200', line=dict(dash='dot',  color='green', width=2)))
+
+            fig.update_layout(
+                title=f"{selected} ({ticker}) 분석 차트", template="plotly_white", height=450,
+                hovermode="x unified",
+                legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+                margin=dict(l=10, r=10, t=50, b=10)
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+render_detail_chart(all_data['sector_etfs'], df_sectors)
+
+# [8] 관리자 전용: 구간별 성능 계측
+render_sidebar([("시세 캐시: 적중 / 만료 값 응답 / 미스 / 갱신 / 갱신 실패 횟수", lambda: pd.DataFrame(swr_stats()))])
@@ -1,9 +1,24 @@
 import streamlit as st
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
-import yfinance as yf
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+import price_store
+from data_fetcher import YahooProvider, SECTOR_ETFS, INDIVIDUAL_STOCKS
+from macro_cache import get_macro_series, get_score_history
+from macro_weather import regime_stats, WEATHER_EXPOSURE
+from v8_strategy import build_v8_frame, calculate_signals, calc_performance, V8_PARAMS, SIGNALS
+from v8_sweep import run_sweep, exposure_label, parse_exposures
+from v8_batch import leaderboard
+from event_study import event_windows, perf_run, BEFORE, AFTER
+from chart_data import window
+from instrumentation import stage, mark_miss, render_sidebar
 
 st.set_page_config(page_title="V8 최종 커스텀 리포트", page_icon="🛡️", layout="wide")
 
@@ -35,86 +50,47 @@ EVENTS = [
 # ── 데이터 로딩 (Pure Close) ──
 @st.cache_data(ttl=3600, show_spinner=False)
 def load_v8_custom_data(ticker, start_year):
+    mark_miss()
     fetch_start = f"{start_year - 1}-01-01"
-    df = yf.download(ticker, start=fetch_start, interval='1d', progress=False)
-    if isinstance(df.columns, pd.MultiIndex): df.columns = df.columns.get_level_values(0)
-    df = df[['Close']].dropna()
-    
-    vix = yf.download("^VIX", start=fetch_start, progress=False)
-    ovx = yf.download("^OVX", start=fetch_start, progress=False)
-    tnx = yf.download("^TNX", start=fetch_start, progress=False)
-    irx = yf.download("^IRX", start=fetch_start, progress=False)
-    for d in [vix, ovx, tnx, irx]:
-        if isinstance(d.columns, pd.MultiIndex): d.columns = d.columns.get_level_values(0)
-        
-    combined = df.join(vix['Close'].to_frame('VIX'), how='inner')
-    combined = combined.join(ovx['Close'].to_frame('OVX'), how='left')
-    combined['Spread'] = (tnx['Close'] - irx['Close'])
-    combined['MA20'] = combined['Close'].rolling(20).mean()
-    combined['MA50'] = combined['Close'].rolling(50).mean()
-    combined['MA200'] = combined['Close'].rolling(200).mean()
-    combined['VIX_MA5'] = combined['VIX'].rolling(5).mean()
-    combined['OVX'] = combined['OVX'].fillna(30)
-    combined['Spread'] = combined['Spread'].fillna(1.0)
-    return combined.dropna(subset=['Close', 'VIX', 'MA200']).tz_localize(None)
-
-# ── 로직 및 성과 계산 ──
-def calculate_signals(df, ticker):
-    df = df.copy()
-    is_lev = ticker in ["TQQQ", "QLD"]
-    def get_status(row):
-        c, m20, m50, m200, v, v5, o, s = row['Close'], row['MA20'], row['MA50'], row['MA200'], row['VIX'], row['VIX_MA5'], row['OVX'], row['Spread']
-        mult = 2.0 if c < m50 else 1.0
-        pen = ((1.0 * max(0, v - 25)) + (1.2 * max(0, o - 35)) + (20 if s < -0.5 else 0)) * mult
-        cms = 100 - pen
-        v_spike = v / v5 > 1.25 if v5 > 0 else False
-        if c < m200 and cms < 50: return '🔴철수(Red)', cms
-        if is_lev:
-            if c < m20 or v_spike: return '⚠️터보경보(Turbo)', cms
-        else:
-            if c < m50 or v_spike: return '🟡조기경보(Yellow)', cms
-        if cms >= 55: return '🟢매수(Green)', cms
-        if c < (m200 * 0.90): return '🔥역발상매수', cms
-        return '🟡관망(Yellow)', cms
-    res = df.apply(get_status, axis=1, result_type='expand')
-    df['신호'], df['CMS'] = res[0], res[1]
-    return df
-
-def calc_performance(df, ticker, start_year):
-    df = df[df.index >= f"{start_year}-01-01"].copy()
-    df['daily_ret'] = df['Close'].pct_change().fillna(0).clip(-0.99, 5.0)
-    is_lev = ticker in ["TQQQ", "QLD"]
-    def get_exp(sig):
-        if sig == '🟢매수(Green)': return 1.0
-        if sig == '⚠️터보경보(Turbo)': return 0.2 if is_lev else 0.4
-        if sig == '🟡조기경보(Yellow)': return 0.4
-        if sig == '🟡관망(Yellow)': return 0.7
-        if sig == '🔥역발상매수': return 0.8
-        return 0.0
-    df['base_exp'] = df['신호'].apply(get_exp).shift(1).fillna(0)
-    final_exp, cur_cum, max_cum = [], 1.0, 1.0
-    for i in range(len(df)):
-        exp, d_ret = df['base_exp'].iloc[i], df['daily_ret'].iloc[i]
-        cost = 0.002 if i > 0 and exp != df['base_exp'].iloc[i-1] else 0
-        temp_cum = cur_cum * (1 + (d_ret * exp) - cost)
-        dd = (temp_cum / max_cum) - 1
-        actual_exp = exp * 0.3 if dd < -0.08 else exp
-        cur_cum *= (1 + (d_ret * actual_exp) - (cost if actual_exp > 0 else 0))
-        if cur_cum > max_cum: max_cum = cur_cum
-        final_exp.append(actual_exp)
-    df['cum_strat'] = (1 + (df['daily_ret'] * pd.Series(final_exp, index=df.index))).cumprod()
-    df['cum_bah'] = (1 + df['daily_ret']).cumprod()
-    df['dd_strat'] = (df['cum_strat'] / df['cum_strat'].cummax() - 1) * 100
-    df['dd_bah'] = (df['cum_bah'] / df['cum_bah'].cummax() - 1) * 100
-    return df
+    # 💡 종목은 로컬 가격 저장소에서(새 봉만 수신), 매크로 지표는 두 페이지 공용 캐시에서 잘라 씁니다.
+    frames = price_store.refresh([ticker], fetch_start, YahooProvider(), max_age=3600)
+    if ticker not in frames: raise price_store.DataUnavailable(f"{ticker} 시세를 받지 못했습니다 (잠시 뒤 다시 시도해 주세요)")
+    df = frames[ticker][['Close']].dropna()
+    macro = get_macro_series(["^VIX", "^OVX", "^TNX", "^IRX"], start=fetch_start, strict=True)
+    return build_v8_frame(df, macro)
 
 # ── 메인 실행 (종목 순서 변경 및 SOXX 삭제 완료) ──
 ticker = st.selectbox("종목 선택", ["QQQ", "SPY", "TQQQ", "QLD"])
 start_year = st.selectbox("시작 연도", [2000, 2010, 2020])
+# 💡 매크로 날씨 점수(맑음/흐림/태풍)를 과거 매일 다시 계산해 비중 신호로 겹쳐 볼 수 있음
+WEATHER_MODES = {'반영 안 함': None, 'V8 × 날씨 비중': 'overlay', '날씨 비중만': 'only'}
+weather_label = st.selectbox("매크로 날씨 반영", list(WEATHER_MODES),
+                             help=" / ".join(f"{w} {e:.0%}" for w, e in WEATHER_EXPOSURE.items()) + " (점수 이력이 없는 날은 100%)")
 
-raw_data = load_v8_custom_data(ticker, start_year)
-sig_df = calculate_signals(raw_data, ticker)
-perf_df = calc_performance(sig_df, ticker, start_year)
+@st.cache_data(ttl=3600, show_spinner=False)
+def run_backtest(ticker, start_year, weather_mode=None):
+    # 💡 신호·성과·위기 이벤트 윈도우·날씨 구간 통계를 한 묶음으로 캐시 (다른 위젯만 바뀐 재실행은 다시 계산하지 않음)
+    mark_miss()
+    with stage('load_v8_custom_data', cache=True, ticker=ticker):
+        raw_data = load_v8_custom_data(ticker, start_year)
+    with stage('get_score_history'):
+        history = get_score_history()
+    with stage('calculate_signals', ticker=ticker):
+        sig_df = calculate_signals(raw_data, ticker)
+    with stage('calc_performance', ticker=ticker):
+        weather = history['Score'] if weather_mode and history is not None else None
+        perf_df = calc_performance(sig_df, ticker, start_year, weather=weather, weather_mode=weather_mode or 'overlay')
+    with stage('event_windows', ticker=ticker):
+        ev_table, ev_paths = event_windows(perf_run(perf_df, ticker), EVENTS)
+    regimes = regime_stats(perf_df['Close'], history) if history is not None else None
+    return perf_df, ev_table, ev_paths, regimes
+
+try:
+    with stage('run_backtest', cache=True, ticker=ticker):
+        perf_df, ev_table, ev_paths, regimes = run_backtest(ticker, start_year, WEATHER_MODES[weather_label])
+except price_store.DataUnavailable as e:  # 💡 예외는 st.cache_data에 남지 않으므로 다음 재실행에서 다시 시도
+    st.error(f"🚨 {e}")
+    st.stop()
 
 # ── 📊 상단 지표 순서 재배치 ──
 f_strat, f_bah = (perf_df['cum_strat'].iloc[-1]-1)*100, (perf_df['cum_bah'].iloc[-1]-1)*100
@@ -130,37 +106,161 @@ m2.metric("전략 MDD", f"{mdd_s:.1f}%", delta=f"{abs(mdd_b)-abs(mdd_s):.1f}%p 
 m3.metric("전략 CAGR", f"{cagr_s:.1f}%", delta=f"{cagr_s - cagr_b:.1f}%p")
 m4.metric("존버 수익률", f"{f_bah:,.0f}%")
 m5.metric("존버 MDD", f"{mdd_b:.1f}%")
+st.caption(f"💸 비중 변경 비용 합계: {perf_df['cost'].sum()*100:.1f}%p (건당 0.2%, 자산곡선에 반영)")
 
 # 📈 [시각화] 차트 영역
-fig = make_subplots(rows=2, cols=1, row_heights=[0.7, 0.3], shared_xaxes=True, vertical_spacing=0.05)
-fig.add_trace(go.Scatter(x=perf_df.index, y=perf_df['cum_strat'], name='V8 전략'), row=1, col=1)
-fig.add_trace(go.Scatter(x=perf_df.index, y=perf_df['cum_bah'], name='B&H 존버', line=dict(dash='dot')), row=1, col=1)
-fig.add_trace(go.Scatter(x=perf_df.index, y=perf_df['dd_strat'], name='전략 MDD', fill='tozeroy'), row=2, col=1)
-fig.add_trace(go.Scatter(x=perf_df.index, y=perf_df['dd_bah'], name='존버 MDD', line=dict(dash='dot')), row=2, col=1)
-fig.update_layout(height=600, yaxis_type="log")
-st.plotly_chart(fig, use_container_width=True)
+# 💡 25년치 일봉을 그대로 보내지 않고 화면 해상도만큼만(LTTB, 최고/최저·MDD 바닥 보존) WebGL로 그립니다.
+#    구간을 좁히면 그 구간만 다시 뽑으므로 확대할수록 원래 일봉 해상도에 가까워집니다.
+@st.fragment
+def render_equity_chart(perf_df):
+    d0, d1 = perf_df.index[0].to_pydatetime(), perf_df.index[-1].to_pydatetime()
+    start, end = st.slider("🔍 차트 구간 (좁히면 더 촘촘하게 다시 그림)", min_value=d0, max_value=d1, value=(d0, d1), format="YYYY-MM")
+    view = window(perf_df[['cum_strat', 'cum_bah', 'dd_strat', 'dd_bah']], start, end)
+    with stage('render:equity_chart', points=len(view)):
+        # 💡 plotly(특히 plotly.subplots)는 차트를 그릴 때 처음 적재 (콜드 스타트에서 입력/표가 먼저 뜨도록)
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+        fig = make_subplots(rows=2, cols=1, row_heights=[0.7, 0.3], shared_xaxes=True, vertical_spacing=0.05)
+        fig.add_trace(go.Scattergl(x=view.index, y=view['cum_strat'], name='V8 전략'), row=1, col=1)
+        fig.add_trace(go.Scattergl(x=view.index, y=view['cum_bah'], name='B&H 존버', line=dict(dash='dot')), row=1, col=1)
+        fig.add_trace(go.Scattergl(x=view.index, y=view['dd_strat'], name='전략 MDD', fill='tozeroy'), row=2, col=1)
+        fig.add_trace(go.Scattergl(x=view.index, y=view['dd_bah'], name='존버 MDD', line=dict(dash='dot')), row=2, col=1)
+        fig.update_layout(height=600, yaxis_type="log")
+        st.plotly_chart(fig, use_container_width=True)
+
+render_equity_chart(perf_df)
+
+if regimes is not None and not regimes.empty:
+    with st.expander("🌦️ 매크로 날씨 구간별 검증 (기준선이 실제로 위험을 갈랐는지)", expanded=False):
+        st.dataframe(regimes.round(2), use_container_width=True)
+        st.caption(f"💡 그날 점수로 본 날씨 구간마다 {ticker}의 이후 수익률/변동성입니다. 태풍 구간의 하위 10% 수익률이 가장 나쁘고 변동성이 가장 커야 기준선이 맞습니다.")
 
 # 🎯 [복구완료] 7대 역사적 위기 회피 검증
 st.markdown("---")
 st.markdown("#### 🎯 7대 역사적 위기 회피 검증")
 ev_cols = st.columns(2)
-for i, ev in enumerate(EVENTS):
-    ev_date = pd.Timestamp(ev['date'])
-    if ev_date < perf_df.index[0]: continue
-    
-    # 해당 날짜 혹은 가장 가까운 미래 날짜의 데이터 추출
-    future_data = perf_df.loc[perf_df.index >= ev_date]
-    if future_data.empty: continue
-    row = future_data.iloc[0]
-    
-    sig_color = "red" if "철수" in row['신호'] else ("orange" if "경보" in row['신호'] or "관망" in row['신호'] else "green")
-    if "역발상" in row['신호']: sig_color = "purple"
+EVENT_INFO = {ev['name']: ev for ev in EVENTS}
+with stage('render:events'):
+    # 💡 이벤트 위치는 run_backtest에서 정렬 인덱스 검색으로 한 번에 찾아 둠 (이벤트마다 전체 마스크를 만들지 않음)
+    for i, row in enumerate(ev_table.to_dict('records')):
+        ev = EVENT_INFO[row['이벤트']]
+        sig_color = "red" if "철수" in row['신호'] else ("orange" if "경보" in row['신호'] or "관망" in row['신호'] else "green")
+        if "역발상" in row['신호']: sig_color = "purple"
+        first_red = f"{row['첫 🔴(일)']:.0f}일 뒤" if pd.notna(row['첫 🔴(일)']) else "없음"
     
-    with ev_cols[i % 2]:
-        st.markdown(f"""
-<div class="event-card {'ev-safe' if ev['type']=='safe' else 'ev-danger'}">
-    <b>📅 {ev['date']} | {ev['name']}</b><br>
-    신호: <span style="color:{sig_color}; font-weight:800;">{row['신호']}</span><br>
-    <small>CMS 점수: {row['CMS']:.1f}점 | {ev['desc']}</small>
-</div>
-""", unsafe_allow_html=True)
+        with ev_cols[i % 2]:
+            st.markdown(f"""
+    <div class="event-card {'ev-safe' if ev['type']=='safe' else 'ev-danger'}">
+        <b>📅 {ev['date']} | {ev['name']}</b><br>
+        신호: <span style="color:{sig_color}; font-weight:800;">{row['신호']}</span><br>
+        <small>CMS 점수: {row['CMS']:.1f}점 | {ev['desc']}</small><br>
+        <small>이후 {AFTER}거래일 낙폭: 전략 {row['전략 낙폭(%)']:.1f}% vs 존버 {row['존버 낙폭(%)']:.1f}% ({row['회피 낙폭(%p)']:+.1f}%p) | 첫 🔴 {first_red}</small>
+    </div>
+    """, unsafe_allow_html=True)
+
+# 📐 이벤트 윈도우 (t-20 ~ t+60 신호 경로)
+SIGNAL_COLORS = ['#e5e7eb', '#ef4444', '#f97316', '#facc15', '#10b981', '#8b5cf6', '#fde68a']  # 데이터 없음(-1) + SIGNALS 순서
+with st.expander(f"📐 이벤트 윈도우 분석 (t-{BEFORE} ~ t+{AFTER} 거래일)", expanded=False):
+    st.dataframe(ev_table.round(2), use_container_width=True, hide_index=True)
+    if not ev_paths.empty:
+        n_codes = len(SIGNAL_COLORS)
+        scale = [[(k + edge) / n_codes, c] for k, c in enumerate(SIGNAL_COLORS) for edge in (0, 1)]
+        labels = np.array(['데이터 없음'] + SIGNALS)[ev_paths.to_numpy() + 1]
+        import plotly.graph_objects as go
+        path_fig = go.Figure(go.Heatmap(z=ev_paths.to_numpy(), x=ev_paths.columns, y=ev_paths.index.get_level_values(0),
+                                        zmin=-1.5, zmax=n_codes - 1.5, colorscale=scale, showscale=False,
+                                        customdata=labels, hovertemplate="%{y} | t%{x:+d}: %{customdata}<extra></extra>"))
+        path_fig.update_layout(height=60 + 28 * len(ev_paths), xaxis_title="이벤트일 대비 거래일", margin=dict(l=10, r=10, t=10, b=10))
+        path_fig.add_vline(x=0, line_dash="dot")
+        st.plotly_chart(path_fig, use_container_width=True)
+
+# 🏁 유니버스 일괄 백테스트 (섹터 ETF + 개별 종목을 한 번에)
+st.markdown("---")
+st.markdown("#### 🏁 유니버스 일괄 백테스트")
+# 💡 지수(^)·환율(=X)은 매매 대상이 아니므로 제외
+BATCH_UNIVERSES = {'섹터 ETF': SECTOR_ETFS, '개별 종목': INDIVIDUAL_STOCKS}
+BATCH_UNIVERSES = {g: {n: t for n, t in u.items() if not t.startswith('^') and '=' not in t} for g, u in BATCH_UNIVERSES.items()}
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_batch(start_year):
+    mark_miss()
+    fetch_start = f"{start_year - 1}-01-01"
+    symbols = list(dict.fromkeys(t for u in BATCH_UNIVERSES.values() for t in u.values()))
+    frames = price_store.refresh(symbols, fetch_start, YahooProvider(), max_age=3600)
+    closes = pd.DataFrame({s: df['Close'] for s, df in frames.items() if df is not None and not df.empty})
+    macro = get_macro_series(["^VIX", "^OVX", "^TNX", "^IRX"], start=fetch_start, strict=True)
+    board, run = leaderboard(BATCH_UNIVERSES, closes, macro, start_year)
+    return board, event_windows(run, EVENTS)[0]
+
+with st.expander(f"V8 신호를 {sum(len(u) for u in BATCH_UNIVERSES.values())}개 종목에 동시에 적용해 전략 vs 존버 CAGR/MDD를 비교합니다", expanded=False):
+    if st.button(f"🚀 {start_year}년부터 일괄 실행", use_container_width=True, key="batch_run"):
+        try:
+            with st.spinner("⏳ 유니버스 백테스트 중..."), stage('load_batch', cache=True, start_year=start_year):
+                st.session_state.batch_result = (start_year, load_batch(start_year))
+        except price_store.DataUnavailable as e:
+            st.error(f"🚨 {e}")
+    batch = st.session_state.get('batch_result')
+    if batch and batch[0] == start_year:
+        board, batch_events = batch[1]
+        b1, b2, b3 = st.columns(3)
+        b1.metric("전략이 CAGR 우위", f"{(board['CAGR 차(%p)'] > 0).sum()} / {len(board)}")
+        b2.metric("전략이 MDD 개선", f"{(board['MDD 개선(%p)'] > 0).sum()} / {len(board)}")
+        b3.metric("CAGR 차 중앙값", f"{board['CAGR 차(%p)'].median():+.1f}%p")
+        st.dataframe(board.round(1), use_container_width=True, hide_index=True, height=400)
+        st.caption("💡 종목마다 MA200이 생긴 첫 거래일부터 계산합니다 (시작일 열). 같은 티커가 두 그룹에 있으면 결과도 같습니다.")
+        if not batch_events.empty:
+            st.markdown(f"**위기 이벤트별 회피 낙폭 (이후 {AFTER}거래일, 전략 - 존버 %p)**")
+            avoided = batch_events.pivot_table(index='티커', columns='이벤트', values='회피 낙폭(%p)', sort=False)
+            st.dataframe(avoided.round(1), use_container_width=True, height=300)
+
+# 🧪 파라미터 스윕 (임계값 그리드 서치)
+st.markdown("---")
+st.markdown("#### 🧪 파라미터 스윕")
+SWEEP_FIELDS = {
+    'vix_floor': 'VIX 감점 기준', 'ovx_floor': 'OVX 감점 기준', 'spread_floor': '금리차 기준', 'spike_ratio': 'VIX 스파이크 배수',
+    'cms_red': 'CMS 철수 기준', 'cms_green': 'CMS 매수 기준', 'contra_level': '역발상 MA200 배수', 'throttle_dd': '낙폭 스로틀 기준',
+    'exposure': '신호별 비중 (매수/터보/조기/관망/역발상, 후보는 ;로 구분)'
+}
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_sweep(ticker, start_year, grid_items):
+    return run_sweep(load_v8_custom_data(ticker, start_year), ticker, start_year, dict(grid_items))
+
+with st.expander("임계값 후보를 쉼표로 입력하면 모든 조합을 한 번에 백테스트합니다", expanded=False):
+    grid, sw_cols = {}, st.columns(4)
+    for i, (key, label) in enumerate(SWEEP_FIELDS.items()):
+        is_exp = key == 'exposure'  # 💡 비중표는 '1/0.4/0.4/0.7/0.8' 한 묶음이 후보 하나
+        with sw_cols[i % 4]:
+            txt = st.text_input(label, value=exposure_label(V8_PARAMS[key]) if is_exp else str(V8_PARAMS[key]), key=f"sweep_{key}")
+        try: grid[key] = (parse_exposures(txt) if is_exp else tuple(float(x) for x in txt.split(',') if x.strip())) or (V8_PARAMS[key],)
+        except ValueError: grid[key] = (V8_PARAMS[key],)
+    n_combo = int(np.prod([len(v) for v in grid.values()]))
+    if st.button(f"🚀 {n_combo:,}개 조합 실행", use_container_width=True):
+        try:
+            with st.spinner("⏳ 조합별 백테스트 중..."):
+                st.session_state.sweep_result = (ticker, start_year, load_sweep(ticker, start_year, tuple(grid.items())))
+        except price_store.DataUnavailable as e:
+            st.error(f"🚨 {e}")
+
+    sweep = st.session_state.get('sweep_result')
+    if sweep and sweep[:2] == (ticker, start_year):
+        res = sweep[2]
+        st.dataframe(res.head(200), use_container_width=True, height=300)
+        axes = [k for k in SWEEP_FIELDS if k in res.columns and res[k].nunique() > 1]
+        if len(axes) >= 2:
+            h1, h2, h3 = st.columns(3)
+            with h1: x_key = st.selectbox("X축", axes, format_func=SWEEP_FIELDS.get, key="sweep_x")
+            with h2: y_key = st.selectbox("Y축", [a for a in axes if a != x_key], format_func=SWEEP_FIELDS.get, key="sweep_y")
+            with h3: metric = st.selectbox("지표", ['CAGR(%)', 'MDD(%)', '회전율(연)'], key="sweep_metric")
+            # 나머지 파라미터는 각 칸에서 가장 좋은 값으로 (회전율은 가장 낮은 값)
+            pivot = res.pivot_table(index=y_key, columns=x_key, values=metric, aggfunc='min' if metric == '회전율(연)' else 'max')
+            import plotly.graph_objects as go
+            hm = go.Figure(go.Heatmap(z=pivot.values, x=[str(c) for c in pivot.columns], y=[str(i) for i in pivot.index],
+                                      colorscale='RdYlGn_r' if metric == '회전율(연)' else 'RdYlGn', text=np.round(pivot.values, 1), texttemplate="%{text}"))
+            hm.update_layout(height=420, xaxis_title=SWEEP_FIELDS[x_key], yaxis_title=SWEEP_FIELDS[y_key], margin=dict(l=10, r=10, t=30, b=10))
+            st.plotly_chart(hm, use_container_width=True)
+        elif len(res) > 1:
+            st.caption("💡 두 개 이상의 파라미터에 후보를 여러 개 넣으면 히트맵이 표시됩니다.")
+
+# ⏱️ 관리자 전용: 구간별 성능 계측
+render_sidebar()
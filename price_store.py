@@ -0,0 +1,200 @@
+import os
+import itertools
+import json
+import tempfile
+import threading
+import time
+import urllib.parse
+import pandas as pd
+from contextlib import contextmanager
+from functools import partial
+from fetch_executor import run_jobs, FetchReport, FETCH_WORKERS, FETCH_TIMEOUT
+from instrumentation import stage, log_event
+
+# ── 심볼별 Parquet 일봉 저장소 (data/prices/<심볼>.parquet) ──
+BASE_DIR  = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.environ.get('PRICE_STORE_DIR', os.path.join(BASE_DIR, 'data', 'prices'))
+OHLC_COLS = ['Open', 'High', 'Low', 'Close', 'Volume']
+ADJ_TOLERANCE = 1e-4  # 겹치는 마지막 봉 종가가 이만큼 달라지면 배당/분할 재조정으로 보고 전체 재수신
+
+class DataUnavailable(RuntimeError):
+    """요청한 심볼의 시세를 받지 못했고 저장본도 없음 (페이지에서 st.error로 알림)"""
+
+_locks = {}                     # 심볼 → 읽기-수정-쓰기 잠금 (같은 프로세스 안의 동시 refresh 직렬화)
+_locks_guard = threading.Lock()
+_chunk_ids = itertools.count(1)  # 수신 묶음 번호 (fetch:symbol 기록을 묶음별로 다시 모을 때 씀)
+
+@contextmanager
+def _locked(symbols):
+    """심볼별 잠금을 정렬 순서로 잡음 (겹치는 심볼만 기다리고, 순서가 같아 교착 없음)"""
+    with _locks_guard:
+        locks = [_locks.setdefault(sym, threading.Lock()) for sym in sorted(set(symbols))]
+    for lock in locks: lock.acquire()
+    try:
+        yield
+    finally:
+        for lock in reversed(locks): lock.release()
+
+def _path(symbol):
+    return os.path.join(STORE_DIR, urllib.parse.quote(symbol, safe='') + '.parquet')
+
+def read_meta(symbol):
+    """저장 메타 {'since', 'last', 'updated'} (없으면 None)"""
+    path = _path(symbol)
+    if not os.path.exists(path): return None
+    try:
+        import pyarrow.parquet as pq  # 💡 저장소를 실제로 읽고 쓸 때만 적재 (스냅샷만 보는 콜드 스타트는 건너뜀)
+        raw = pq.read_schema(path).metadata or {}
+        return json.loads(raw.get(b'price_store', b'null'))
+    except Exception:
+        return None
+
+def load(symbol, start=None):
+    """디스크에서 일봉 읽기 (없으면 None)"""
+    path = _path(symbol)
+    if not os.path.exists(path): return None
+    try: df = pd.read_parquet(path)
+    except Exception: return None
+    return df[df.index >= pd.Timestamp(start)] if start is not None else df
+
+def save(symbol, df, since):
+    """임시 파일(스레드/프로세스마다 고유한 이름)에 쓴 뒤 os.replace로 원자적 교체"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    os.makedirs(STORE_DIR, exist_ok=True)
+    meta = {'since': str(pd.Timestamp(since).date()), 'last': str(df.index[-1].date()), 'updated': time.time()}
+    table = pa.Table.from_pandas(df)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), b'price_store': json.dumps(meta).encode()})
+    path = _path(symbol)
+    fd, tmp = tempfile.mkstemp(dir=STORE_DIR, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp): os.remove(tmp)
+        raise
+
+def _normalize(df):
+    df = df.copy()
+    if isinstance(df.columns, pd.MultiIndex): df.columns = df.columns.get_level_values(0)
+    df.index = pd.to_datetime(df.index).tz_localize(None)
+    df.index.name = 'Date'
+    cols = [c for c in OHLC_COLS if c in df.columns]
+    return df[cols].astype('float64').dropna(how='all').sort_index()
+
+def _timed_download(provider, symbols, start, retry=False):
+    """묶음 하나 수신 — 누적 통계는 묶음 단위 'fetch', JSON lines에는 심볼마다 'fetch:symbol' 한 줄
+
+    심볼 줄에는 묶음 벽시계 시간과 묶음 번호(chunk)를 적습니다. 묶음 안에서 누가 느렸는지는 알 수 없으므로
+    느린 묶음은 같은 chunk 줄을 모아 보고, 실패/타임아웃 뒤 심볼 하나씩 다시 받는 시도(retry=True)는
+    묶음 크기가 1이라 그 심볼 자체의 시간입니다.
+    """
+    chunk, got, error = next(_chunk_ids), None, None
+    t0 = time.perf_counter()
+    try:
+        with stage('fetch', chunk=chunk, size=len(symbols), start=str(start.date()), retry=retry):
+            got = provider.download(symbols, start=start)
+        return got
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        seconds = round(time.perf_counter() - t0, 6)
+        for sym in symbols:
+            df = (got or {}).get(sym)
+            log_event('fetch:symbol', symbol=sym, seconds=seconds, chunk=chunk, size=len(symbols), retry=retry,
+                      rows=0 if df is None else len(df), **({'error': error} if error else {}))
+
+def _download(provider, requests, batch_size, report, workers=None, timeout=None):
+    """[(심볼 목록, 시작일)] 요청을 묶음으로 나눠 병렬 수신
+
+    묶음 크기는 batch_size 이하에서 작업 스레드 수만큼 고르게 나뉘도록 정하고,
+    실패하거나 타임아웃한 묶음은 심볼 하나씩 다시 시도해, 문제 심볼만 report에 남깁니다.
+    💡 전체 수신은 시작 + timeout에서 끝납니다. 묶음 첫 시도는 그 절반까지만 기다리고, 재시도는 새 timeout을
+       받지 않고 남은 시간 안에서만 돕니다. 그래서 멈춘 심볼 하나가 있어도 같은 묶음의 다른 심볼은 재시도로 받고,
+       멈춘 심볼은 timeout 안에 timed_out으로 남습니다.
+    """
+    timeout = FETCH_TIMEOUT if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    def _jobs(reqs, size, is_retry=False):
+        jobs = {}
+        for symbols, start in reqs:
+            size = min(size, max(1, -(-len(symbols) // (workers or FETCH_WORKERS))))
+            for i in range(0, len(symbols), size):
+                chunk = tuple(symbols[i:i + size])
+                jobs[(chunk, str(start))] = partial(_timed_download, provider, list(chunk), start, is_retry)
+        return jobs
+
+    def _record(failed, timed_out, retry=None):
+        for key in list(failed) + timed_out:
+            chunk, start = key
+            if retry is not None and len(chunk) > 1: retry.append((list(chunk), starts[start]))
+            elif key in failed: report.failed[chunk[0]] = failed[key]
+            else: report.timed_out.append(chunk[0])
+
+    frames, starts, retry = {}, {str(start): start for _, start in requests}, []
+    results, failed, timed_out = run_jobs(_jobs(requests, batch_size), workers, timeout / 2, deadline)
+    _record(failed, timed_out, retry)
+    if retry:
+        more, failed, timed_out = run_jobs(_jobs(retry, 1, is_retry=True), workers, max(deadline - time.monotonic(), 0), deadline)
+        results.update(more)
+        _record(failed, timed_out)
+    for got in results.values():
+        frames.update({s: _normalize(df) for s, df in (got or {}).items() if df is not None and not df.empty})
+    for symbols, _ in requests:
+        for sym in symbols:
+            if sym in frames: report.ok.append(sym)
+            elif sym not in report.failed and sym not in report.timed_out: report.failed[sym] = 'no data'
+    return frames
+
+def refresh(symbols, start, provider, max_age=0, batch_size=100, workers=None, timeout=None, report=None):
+    """저장소를 갱신하고 start 이후 일봉을 {심볼: DataFrame}으로 반환
+
+    - 저장본이 없거나 start보다 늦게 시작하면 start부터 전체 수신
+    - 그 외에는 마지막 저장일부터(마지막 봉 재확인 포함) 새 봉만 수신해 이어 붙임
+    - max_age초 안에 갱신된 심볼은 네트워크를 건너뜀
+    - 수신은 fetch_executor로 병렬 실행되며, 실패/타임아웃 심볼은 report(FetchReport)에 기록
+    - 겹치는 심볼을 다루는 동시 호출은 심볼별 잠금으로 차례대로 실행 (뒤 호출은 앞 호출이 쓴 메타를 보고 판단)
+    """
+    with _locked(symbols):
+        return _refresh(symbols, start, provider, max_age, batch_size, workers, timeout, report)
+
+def _refresh(symbols, start, provider, max_age, batch_size, workers, timeout, report):
+    t0 = time.monotonic()
+    report = report if report is not None else FetchReport()
+    start = pd.Timestamp(start).normalize()
+    now = time.time()
+    full, incremental = [], {}
+    for sym in dict.fromkeys(symbols):
+        meta = read_meta(sym)
+        if meta is None or pd.Timestamp(meta['since']) > start: full.append(sym)
+        elif now - meta['updated'] >= max_age: incremental.setdefault(meta['last'], []).append(sym)
+
+    requests = ([(full, start)] if full else []) + [(syms, pd.Timestamp(last)) for last, syms in incremental.items()]
+    fresh = _download(provider, requests, batch_size, report, workers, timeout)
+
+    refetch = {}
+    for sym in full:
+        if sym in fresh: save(sym, fresh[sym], start)
+    for last, syms in incremental.items():
+        last_ts = pd.Timestamp(last)
+        for sym in syms:
+            if sym not in fresh: continue
+            new, old, meta = fresh[sym], load(sym), read_meta(sym)
+            if last_ts in new.index and last_ts in old.index:
+                prev_close, new_close = old.at[last_ts, 'Close'], new.at[last_ts, 'Close']
+                if prev_close and abs(new_close / prev_close - 1) > ADJ_TOLERANCE:
+                    refetch.setdefault(meta['since'], []).append(sym)
+                    continue
+            save(sym, pd.concat([old[old.index < last_ts], new]), meta['since'])
+    for since, syms in refetch.items():
+        for sym, df in _download(provider, [(syms, pd.Timestamp(since))], batch_size, FetchReport(), workers, timeout).items():
+            save(sym, df, since)
+
+    out = {}
+    for sym in dict.fromkeys(symbols):
+        df = load(sym, start)
+        if df is not None and not df.empty: out[sym] = df
+    report.elapsed += time.monotonic() - t0
+    return out
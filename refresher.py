@@ -0,0 +1,40 @@
+"""위험알리미 점수 스냅샷 갱신기 (페이지와 별도 프로세스로 실행)
+
+사용법:
+    python refresher.py                    # 스냅샷 하나 만들고 종료 (cron 등에서 호출)
+    python refresher.py --interval 300     # 300초마다 계속 갱신 (데몬)
+"""
+import argparse
+import sys
+import time
+import traceback
+
+from snapshots import build_snapshot, write_snapshot, SNAPSHOT_DIR
+
+def refresh_once(directory=None):
+    snapshot = build_snapshot()
+    version = write_snapshot(snapshot, directory)
+    report = snapshot['market'].get('fetch_report', {})
+    print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] snapshot {version} "
+          f"({snapshot['build_seconds']:.1f}s, 실패 {len(report.get('failed', {}))}, 타임아웃 {len(report.get('timed_out', []))})", flush=True)
+    return version
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="위험알리미 점수 스냅샷 갱신기")
+    ap.add_argument('--interval', type=float, default=0, help="갱신 주기(초). 0이면 한 번만 실행")
+    ap.add_argument('--dir', default=SNAPSHOT_DIR, help="스냅샷 저장 폴더")
+    args = ap.parse_args(argv)
+
+    if args.interval <= 0:
+        refresh_once(args.dir)
+        return 0
+    while True:
+        t0 = time.time()
+        try: refresh_once(args.dir)
+        except Exception:
+            # 💡 한 번 실패해도 데몬은 계속 돌고, 페이지는 직전 스냅샷을 보여줍니다.
+            traceback.print_exc()
+        time.sleep(max(0.0, args.interval - (time.time() - t0)))
+
+if __name__ == '__main__':
+    sys.exit(main())
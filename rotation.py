@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+
+# ── S-L 섹터 로테이션: 매일의 L/S/S-L/순위 패널 + 상위 N 보유 백테스트 ──
+SAFE_ASSETS = ['CASH', '장기국채', '물가연동채', '유틸리티', '필수소비재']
+SAFE_ALARM = 2          # 상위 5개 중 안전자산이 이만큼 이상이면 쏠림 경보 (위험알리미 페이지와 같은 기준)
+REBALANCE = {'주간': 5, '격주': 10, '월간': 21}  # 리밸런싱 간격 (거래일)
+ROTATION_COST = 0.001   # 편도 회전율 1당 비용
+
+def _ret(close, lookback, n):
+    """close.iloc[-lookback] 대비 수익률 (봉이 모자라거나 기준가가 0 이하면 0)"""
+    past = close.shift(lookback - 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where((n >= lookback) & (past > 0), close / past - 1, 0.0)
+
+def sector_score_history(close):
+    """종가 패널[날짜 × 섹터] → 날마다 calculate_sector_scores와 같은 규칙으로 계산한 패널 dict
+
+    반환: {'L', 'S', 'S-L', 'rank_score', 'rank'} (모두 날짜 × 섹터 DataFrame, rank는 1부터, 가격 없으면 NaN)
+    상장 후 휴장일(다른 거래소 종목)은 전일 종가로 채워 하나의 달력에서 계산합니다.
+    """
+    close = close.ffill()
+    n = close.notna().cumsum().to_numpy()
+    c = close.to_numpy(dtype='float64')
+    ma200 = close.rolling(200).mean().to_numpy()
+    ma20 = close.rolling(20).mean().to_numpy()
+    high, low = close.rolling(252, min_periods=1).max().to_numpy(), close.rolling(252, min_periods=1).min().to_numpy()
+    vol = close.pct_change().rolling(20, min_periods=2).std().to_numpy()
+    vol = np.where((n >= 10) & ~np.isnan(vol), vol, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ma200_dist = np.where(ma200 > 0, c / ma200 - 1, 0.0)
+        pos_52w = np.where(high != low, (c - low) / (high - low), 0.5)
+        ma20_dist = np.where(ma20 > 0, c / ma20 - 1, 0.0)
+    l_score = ma200_dist * 0.4 + pos_52w * 0.3 + _ret(close, 126, n) * 0.3
+    s_score = ma20_dist * 0.5 + _ret(close, 21, n) * 0.4 - vol * 0.1
+    s_l = s_score - l_score
+    rank_score = np.where(s_score < 0, s_l - 10, s_l)  # 미너비니 강등: S<0이면 맨 뒤로
+
+    live = ~np.isnan(c)
+    rank_score = np.where(live, rank_score, np.nan)
+    order = np.argsort(np.where(live, -rank_score, np.inf), axis=1, kind='stable')
+    rank = np.empty_like(order)
+    np.put_along_axis(rank, order, np.arange(1, c.shape[1] + 1)[None, :].repeat(len(c), axis=0), axis=1)
+    frame = lambda a: pd.DataFrame(np.where(live, a, np.nan), index=close.index, columns=close.columns)
+    return {'L': frame(l_score), 'S': frame(s_score), 'S-L': frame(s_l), 'rank_score': frame(rank_score), 'rank': frame(rank.astype('float64'))}
+
+def _stats(equity, years):
+    cagr = (equity.iloc[-1] ** (1 / years) - 1) * 100 if years > 0 else np.nan
+    return cagr, (equity / equity.cummax() - 1).min() * 100
+
+def rotation_backtest(close, scores, top_n=5, rebalance=REBALANCE['주간'], risk_off=True, benchmark='S&P',
+                      safe_assets=SAFE_ASSETS, cash='CASH', cost_rate=ROTATION_COST, warmup=200):
+    """S-L 순위 상위 top_n 동일 비중 로테이션 백테스트
+
+    - warmup(MA200 준비) 이후 rebalance 거래일마다 그날 종가 기준 순위로 종목을 고르고 다음 날 종가에 체결
+    - risk_off=True면 그날 상위 5개 중 안전자산이 SAFE_ALARM개 이상일 때 전부 cash 종목(없으면 현금)으로
+    - 리밸런싱 사이에는 비중이 가격대로 흘러가고, 체결일의 편도 회전율 × cost_rate를 비용으로 차감
+    반환: {'equity', 'benchmark', 'holdings', 'stats'}
+    """
+    close = close.ffill()
+    names = list(close.columns)
+    c = close.to_numpy(dtype='float64')
+    rank = scores['rank'].to_numpy()
+    T, N = c.shape
+
+    # 결정일과 목표 비중 (결정일 i → 체결일 i+1)
+    decide = np.arange(warmup, T - 1, rebalance)
+    if not len(decide): return None
+    top5_safe = ((rank[decide] <= 5) & np.isin(names, safe_assets)[None, :]).sum(axis=1)
+    alarm = (top5_safe >= SAFE_ALARM) & risk_off
+    target = np.where(rank[decide] <= top_n, 1.0, 0.0)
+    if cash in names:
+        target[alarm] = 0.0
+        target[alarm, names.index(cash)] = 1.0
+    else:
+        target[alarm] = 0.0  # 현금 보유 (수익률 0)
+    target = target / np.maximum(target.sum(axis=1, keepdims=True), 1.0)
+
+    # 구간 k(체결일 E_k ~ E_k+1 전날)에는 체결 비중이 가격 비율대로 흘러가고, 현금 부분은 그대로
+    execute = decide + 1
+    cash_w = 1 - target.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # 다음 체결일까지 흘러간 비중 (현금 포함) → 새 목표 비중과의 차이가 편도 회전율
+        moved = np.where(target[:-1] > 0, target[:-1] * c[execute[1:]] / c[execute[:-1]], 0.0)
+    seg_growth = moved.sum(axis=1) + cash_w[:-1]
+    drift = np.vstack([np.zeros((1, N)), moved / seg_growth[:, None]])
+    drift_cash = np.concatenate([[1.0], cash_w[:-1] / seg_growth])
+    turnover = (np.abs(target - drift).sum(axis=1) + np.abs(cash_w - drift_cash)) / 2
+    start_val = np.cumprod(np.concatenate([[1.0], seg_growth]) * (1 - turnover * cost_rate))  # 체결 직후 자산
+
+    days = np.arange(execute[0], T)
+    seg = np.searchsorted(execute, days, side='right') - 1
+    w = target[seg]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rel = np.where(w > 0, c[days] / c[execute[seg]], 0.0)
+    equity = pd.Series(start_val[seg] * ((w * rel).sum(axis=1) + cash_w[seg]), index=close.index[days])
+
+    bench = close[benchmark].loc[equity.index] if benchmark in names else None
+    bench = bench / bench.iloc[0] if bench is not None else None
+    years = (equity.index[-1] - equity.index[0]).days / 365.25
+    s_cagr, s_mdd = _stats(equity, years)
+    stats = [{'구분': f'로테이션 상위 {top_n}', 'CAGR(%)': s_cagr, 'MDD(%)': s_mdd,
+             '연 회전율': turnover.sum() / max(years, 1e-9), '리스크오프 비중(%)': alarm.mean() * 100}]
+    if bench is not None:
+        b_cagr, b_mdd = _stats(bench, years)
+        stats.append({'구분': f'{benchmark} 보유', 'CAGR(%)': b_cagr, 'MDD(%)': b_mdd, '연 회전율': 0.0, '리스크오프 비중(%)': 0.0})
+    holdings = pd.DataFrame({
+        '체결일': close.index[execute], '리스크오프': alarm, '회전율': turnover,
+        '보유': [', '.join(np.array(names)[t > 0]) or '현금' for t in target],
+    })
+    return {'equity': equity, 'benchmark': bench, 'holdings': holdings, 'stats': pd.DataFrame(stats)}
@@ -0,0 +1,62 @@
+import asyncio
+import os
+import pickle
+import time
+
+from async_loader import load_page
+from instrumentation import stage
+
+# ── 점수 스냅샷 (refresher.py가 주기적으로 만들고, 위험알리미 페이지는 최신본만 읽음) ──
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR', os.path.join(BASE_DIR, 'data', 'snapshots'))
+SNAPSHOT_KEEP = 5                                              # 보관할 이전 버전 수
+SNAPSHOT_STALE = int(os.environ.get('SNAPSHOT_STALE', 1800))   # 이보다 오래되면 페이지에서 경고 (초)
+LATEST = 'LATEST'                                              # 최신 버전 이름을 담은 포인터 파일
+
+def build_snapshot(provider=None):
+    """시세 수신 + 섹터/개별/핵심 섹터 점수 + 매크로 날씨를 한 번에 계산 (async_loader로 단계들을 겹쳐 실행)"""
+    t0 = time.time()
+    with stage('snapshot:build'):
+        page = asyncio.run(load_page(provider))
+    (macro, macro_history), market, scores = page['macro'], page['market'], page['scores']
+    return {'built_at': time.time(), 'build_seconds': time.time() - t0, 'macro': macro, 'macro_history': macro_history, 'market': market,
+            'sectors': scores['sector_etfs'], 'individual': scores['individual_stocks'], 'core': scores['core_sectors']}
+
+def _path(version, directory):
+    return os.path.join(directory, f"snapshot-{version}.pkl")
+
+def _replace(path, payload):
+    # 임시 파일에 다 쓴 뒤 이름만 바꿔서, 읽는 쪽이 반쯤 쓴 파일을 보지 않도록 함
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def write_snapshot(snapshot, directory=None):
+    """새 버전 파일을 쓰고 LATEST 포인터를 옮긴 뒤 오래된 버전을 정리 → 버전 이름"""
+    directory = directory or SNAPSHOT_DIR
+    os.makedirs(directory, exist_ok=True)
+    ms = round(snapshot['built_at'] * 1000)  # 💡 한 정수에서 초/밀리초를 나눠야 .9995초 이상에서 초 자리 올림이 빠지지 않음
+    version = time.strftime('%Y%m%dT%H%M%S', time.localtime(ms // 1000)) + f".{ms % 1000:03d}"
+    snapshot = {**snapshot, 'version': version}
+    _replace(_path(version, directory), pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL))
+    _replace(os.path.join(directory, LATEST), version.encode())
+    for name in sorted(f for f in os.listdir(directory) if f.startswith('snapshot-') and f.endswith('.pkl'))[:-SNAPSHOT_KEEP]:
+        try: os.remove(os.path.join(directory, name))
+        except OSError: pass
+    return version
+
+def latest_version(directory=None):
+    """최신 스냅샷 버전 (아직 없으면 None)"""
+    try:
+        with open(os.path.join(directory or SNAPSHOT_DIR, LATEST), encoding='utf-8') as f:
+            version = f.read().strip()
+    except OSError:
+        return None
+    return version if version and os.path.exists(_path(version, directory or SNAPSHOT_DIR)) else None
+
+def load_snapshot(version, directory=None):
+    with open(_path(version, directory or SNAPSHOT_DIR), 'rb') as f:
+        return pickle.load(f)
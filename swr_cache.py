@@ -0,0 +1,99 @@
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+
+# ── stale-while-revalidate 캐시 (키마다 갱신은 한 번에 하나, 실패하면 직전 값으로 버팀) ──
+# 💡 TTL이 지나도 값을 지우지 않습니다. 만료 뒤 첫 요청은 직전 값을 바로 받고, 갱신은 백그라운드에서 한 번만 돕니다.
+#    그래서 만료 직후 몰려온 세션들이 같이 막히거나, 동시에 미스 난 요청마다 전체 재수신을 하지 않습니다.
+SWR_TTL = 300          # 이보다 오래된 값은 응답은 하되 백그라운드 갱신을 건다 (초)
+SWR_RETRY_AFTER = 30   # 갱신이 실패하면 이만큼 지난 뒤에 다시 시도 (초)
+
+_lock = threading.RLock()  # 이미 끝난 Future에 콜백을 걸면 같은 스레드에서 바로 불리므로 재진입 허용
+_entries = {}  # 키 → {'value', 'loaded', 'version', 'error', 'failed', 'flight'}
+_versions = itertools.count(1)  # 갱신 성공마다 새 번호 (모든 키 공통, invalidate 뒤에도 되돌아가지 않음)
+_counters = {}  # 키 → {'hits', 'stale', 'misses', 'refreshes', 'failures'}
+
+def _snapshot(entry):
+    """호출자에게 주는 결과: {'value', 'version', 'age'(초), 'error'(마지막 갱신 실패, 없으면 None), 'refreshing'}
+
+    version은 값이 바뀔 때만 바뀌는 번호라 하위 캐시(st.cache_*)의 키로 쓰면 됩니다.
+    """
+    return {'value': entry['value'], 'version': entry['version'], 'age': time.time() - entry['loaded'], 'error': entry['error'],
+            'refreshing': entry['flight'] is not None}
+
+def _done(result):
+    fut = Future()
+    fut.set_result(result)
+    return fut
+
+def _finish(key, flight):
+    with _lock:
+        entry = _entries[key]
+        entry['flight'] = None
+        try:
+            entry['value'], entry['loaded'], entry['error'] = flight.result(), time.time(), None
+            entry['version'] = next(_versions)
+        except Exception as e:
+            entry['error'], entry['failed'] = f"{type(e).__name__}: {e}", time.time()
+            _counters[key]['failures'] += 1
+
+def _launch(key, start):
+    """진행 중인 갱신이 없으면 start()로 새로 걸고, 있으면 그것을 반환 (single-flight, 잠금 안에서 호출)"""
+    entry = _entries[key]
+    if entry['flight'] is not None: return entry['flight']
+    _counters[key]['refreshes'] += 1
+    try:
+        flight = start()
+    except Exception as e:
+        flight = Future()
+        flight.set_exception(e)
+    entry['flight'] = flight
+    flight.add_done_callback(lambda f: _finish(key, f))  # 이미 끝난 Future면 여기서 바로 _finish가 불려 flight가 비워짐
+    return flight
+
+def request(key, start, ttl=SWR_TTL, retry_after=SWR_RETRY_AFTER):
+    """key의 값을 stale-while-revalidate로 요청 → concurrent.futures.Future[_snapshot 결과]
+
+    start: 인자 없이 불러 새 값을 계산하는 concurrent Future를 돌려주는 함수 (예: async_loader.submit)
+    - 신선한 값: 바로 끝난 Future (적중)
+    - 만료된 값: 바로 끝난 Future로 직전 값을 주고, 갱신을 백그라운드에 한 번만 걸어 둠
+      (직전 갱신이 실패했으면 retry_after가 지날 때까지 다시 걸지 않음)
+    - 값이 없음: 진행 중인 첫 적재(없으면 새로 건 것)가 끝날 때 끝나는 Future (미스, 실패하면 예외)
+    요청만 걸어 두고 나중에 .result()로 기다리면 되므로, 여러 키의 적재를 겹쳐 실행할 수 있습니다.
+    """
+    with _lock:
+        entry = _entries.setdefault(key, {'value': None, 'loaded': None, 'version': None, 'error': None, 'failed': 0.0, 'flight': None})
+        count = _counters.setdefault(key, {'hits': 0, 'stale': 0, 'misses': 0, 'refreshes': 0, 'failures': 0})
+        if entry['loaded'] is not None:
+            if time.time() - entry['loaded'] < ttl:
+                count['hits'] += 1
+            else:
+                count['stale'] += 1
+                if entry['flight'] is None and time.time() - entry['failed'] >= retry_after:
+                    _launch(key, start)
+            return _done(_snapshot(entry))
+        count['misses'] += 1
+        flight = _launch(key, start)
+
+    out = Future()
+    def _resolve(f):
+        with _lock:
+            entry = _entries[key]
+            if entry['loaded'] is not None: out.set_result(_snapshot(entry))
+            else: out.set_exception(f.exception() or RuntimeError(f"{key}: no value"))
+    flight.add_done_callback(_resolve)  # _finish보다 나중에 걸었으므로 항목이 갱신된 뒤에 불림
+    return out
+
+def invalidate(key=None):
+    """값을 버려 다음 요청이 미스가 되게 함 (key가 없으면 전부, 진행 중인 갱신은 그대로 끝까지 돔)"""
+    with _lock:
+        for k in ([key] if key is not None else list(_entries)):
+            if k in _entries: _entries[k].update(value=None, loaded=None, version=None, error=None, failed=0.0)
+
+def stats():
+    """키별 카운터와 현재 상태 목록 (관리자 화면용)"""
+    with _lock:
+        now = time.time()
+        return [{'key': k, **c, 'age': round(now - _entries[k]['loaded'], 1) if _entries[k]['loaded'] is not None else None,
+                 'refreshing': _entries[k]['flight'] is not None, 'error': _entries[k]['error']} for k, c in _counters.items()]
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+# ── 표 배경 그라데이션 (Styler.background_gradient(cmap='RdYlGn')와 같은 색, matplotlib 없이 numpy로) ──
+RDYLGN = ['#a50026', '#d73027', '#f46d43', '#fdae61', '#fee08b', '#ffffbf', '#d9ef8b', '#a6d96a', '#66bd63', '#1a9850', '#006837']
+LUT_SIZE = 256                 # matplotlib 컬러맵 기본 해상도
+TEXT_COLOR_THRESHOLD = 0.408   # pandas 기본값: 배경 상대 휘도가 이보다 낮으면 밝은 글자
+
+def _lut(anchors, n=LUT_SIZE):
+    rgb = np.array([[int(h[i:i + 2], 16) / 255 for i in (1, 3, 5)] for h in anchors])
+    pos, grid = np.linspace(0, 1, len(anchors)), np.linspace(0, 1, n)
+    return np.column_stack([np.interp(grid, pos, rgb[:, k]) for k in range(3)])
+
+def _luminance(rgb):
+    lin = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    return lin @ np.array([0.2126, 0.7152, 0.0722])
+
+_RDYLGN = _lut(RDYLGN)
+# 칸 번호 → CSS (마지막 칸은 빈 문자열이라 NaN의 칸 번호 -1이 그대로 빈 문자열을 가리킴)
+_RDYLGN_CSS = np.array([f"background-color: #{r:02x}{g:02x}{b:02x};color: {'#f1f1f1' if lum < TEXT_COLOR_THRESHOLD else '#000000'}"
+                        for (r, g, b), lum in zip(np.round(_RDYLGN * 255).astype(int), _luminance(_RDYLGN))] + [''], dtype=object)
+
+def gradient_codes(values, vmin=None, vmax=None):
+    """값 배열 → 컬러맵 칸 번호 (0~LUT_SIZE-1, NaN은 -1) — vmin/vmax가 없으면 배열의 최소/최대"""
+    v = np.asarray(values, dtype='float64')
+    ok = ~np.isnan(v)
+    if not ok.any(): return np.full(v.shape, -1)
+    lo = np.nanmin(v) if vmin is None else vmin
+    hi = np.nanmax(v) if vmax is None else vmax
+    x = (v - lo) / (hi - lo) if hi != lo else np.zeros_like(v)
+    return np.where(ok, np.clip((np.nan_to_num(x) * LUT_SIZE).astype(np.int64), 0, LUT_SIZE - 1), -1)
+
+def gradient_frame(df, cols, vmin=None, vmax=None):
+    """df의 cols 열마다(열 안에서 정규화) CSS 문자열 DataFrame — 나머지 열은 빈 문자열, NaN 칸도 빈 문자열"""
+    out = pd.DataFrame('', index=df.index, columns=df.columns, dtype=object)
+    for c in cols:
+        out[c] = _RDYLGN_CSS[gradient_codes(df[c], vmin, vmax)]
+    return out
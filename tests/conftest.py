@@ -0,0 +1,35 @@
+import os
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for p in (ROOT, os.path.join(ROOT, 'benchmarks')):
+    if p not in sys.path:
+        sys.path.insert(0, p)
+
+@pytest.fixture
+def slow_provider():
+    """FakeProvider인데 수신마다 잠깐 쉬어 동시 refresh/그룹 수신이 실제로 겹치게 함 → slow_provider(frames)"""
+    from data_fetcher import FakeProvider
+
+    class SlowProvider(FakeProvider):
+        def download(self, symbols, period='3y', start=None):
+            time.sleep(0.05)
+            return super().download(symbols, period, start)
+    return SlowProvider
+
+@pytest.fixture
+def store_dir(tmp_path, monkeypatch):
+    """테스트마다 빈 가격 저장소"""
+    import price_store
+    monkeypatch.setattr(price_store, 'STORE_DIR', str(tmp_path / 'prices'))
+    return tmp_path / 'prices'
+
+@pytest.fixture
+def cold_macro(monkeypatch):
+    """빈 매크로 공용 캐시 (첫 호출이 가격 저장소에서 새로 적재)"""
+    import macro_cache
+    monkeypatch.setattr(macro_cache, '_cache', {'series': {}, 'loaded': 0.0, 'refreshes': 0, 'stale': [], 'flight': None})
+    monkeypatch.setattr(macro_cache, '_history', {'frame': None, 'loaded': None})
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+import macro_cache
+import price_store
+from async_loader import load_page
+from calculations import calculate_sector_scores_state, calculate_individual_metrics, calculate_core_sector_scores_state
+from data_fetcher import FakeProvider, UNIVERSES, unique_symbols, period_start, _build_entries, _fan_out
+from macro_cache import MACRO_START, MACRO_SYMBOLS
+from synthetic import make_ohlc, make_macro
+
+@pytest.fixture
+def frames():
+    frames = make_ohlc(unique_symbols(*UNIVERSES.values()), 4, seed=3)
+    macro = make_macro(29, seed=3)
+    frames.update({s: macro[[s]].rename(columns={s: 'Close'}) for s in macro.columns})  # XLY/XLP는 매크로 이력으로
+    return frames
+
+def test_load_page_overlapping_symbols(store_dir, frames, cold_macro, slow_provider):
+    overlap = set(MACRO_SYMBOLS) & set(unique_symbols(*UNIVERSES.values()))
+    assert overlap  # 매크로와 섹터 그룹이 같은 심볼(XLY, XLP 등)을 동시에 갱신하는 경우
+
+    for _ in range(3):
+        for f in store_dir.glob('*.parquet'): f.unlink()
+        macro_cache._cache['loaded'] = 0.0
+        page = asyncio.run(load_page(slow_provider(frames)))
+        report = page['market']['fetch_report']
+        assert not report['failed'] and not report['timed_out']
+        assert page['macro'][0] is not None
+        for sym in overlap:
+            # 짧은 구간(바텀업 3년)이 긴 구간(매크로) 메타를 덮지 않음
+            assert price_store.read_meta(sym)['since'] == MACRO_START
+        assert not list(store_dir.glob('*.tmp'))
+
+    # 순차 경로(같은 저장소에서 다시 계산)와 같은 점수표
+    entries = _build_entries(price_store.refresh(unique_symbols(*UNIVERSES.values()), period_start('3y'), FakeProvider(frames), max_age=1e9))
+    expected = {
+        'sector_etfs': calculate_sector_scores_state(_fan_out(UNIVERSES['sector_etfs'], entries)),
+        'individual_stocks': calculate_individual_metrics(_fan_out(UNIVERSES['individual_stocks'], entries)),
+        'core_sectors': calculate_core_sector_scores_state(_fan_out(UNIVERSES['core_sectors'], entries)),
+    }
+    for group, df in expected.items():
+        assert page['scores'][group].equals(df)
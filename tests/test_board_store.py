@@ -0,0 +1,36 @@
+import json
+
+import board_store
+
+def _restart(monkeypatch):
+    """프로세스 재시작 흉내 — 초기화된 DB 목록을 비움"""
+    monkeypatch.setattr(board_store, '_ready', set())
+
+def test_legacy_not_reseeded_after_delete_all(tmp_path, monkeypatch):
+    """관리자가 댓글/업데이트를 모두 지운 뒤 재시작해도 예전 JSON이 다시 옮겨지지 않아야 함"""
+    db = str(tmp_path / 'board.db')
+    comments, updates = tmp_path / 'comments.json', tmp_path / 'updates.json'
+    comments.write_text(json.dumps([{'nickname': 'b', 'text': '둘째', 'time': '2024-01-02'},
+                                    {'nickname': 'a', 'text': '첫째', 'time': '2024-01-01'}]), encoding='utf-8')
+    updates.write_text(json.dumps([{'version': '1.0', 'title': '첫 배포', 'tags': ['new']}]), encoding='utf-8')
+    _restart(monkeypatch)
+    board_store.init_db(db, str(comments), str(updates))
+    assert [c['text'] for c in board_store.list_comments(path=db)] == ['둘째', '첫째']
+    assert [u['title'] for u in board_store.list_updates(path=db)] == ['첫 배포']
+
+    for c in board_store.list_comments(path=db): board_store.delete_comment(c['id'], path=db)
+    for u in board_store.list_updates(path=db): board_store.delete_update(u['id'], path=db)
+    _restart(monkeypatch)
+    board_store.init_db(db, str(comments), str(updates), default_updates=[{'title': '기본'}])
+    assert board_store.count_comments(path=db) == 0
+    assert board_store.list_updates(path=db) == []
+
+def test_existing_db_without_version_not_reseeded(tmp_path, monkeypatch):
+    """user_version 기록 전에 만든 DB는 이미 옮긴 것으로 보고 비어 있어도 다시 옮기지 않음"""
+    db = str(tmp_path / 'board.db')
+    _restart(monkeypatch)
+    board_store.init_db(db)
+    with board_store._db(db) as conn: conn.execute("PRAGMA user_version = 0")
+    _restart(monkeypatch)
+    board_store.init_db(db, default_updates=[{'title': '기본'}])
+    assert board_store.list_updates(path=db) == []
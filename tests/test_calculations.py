@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from calculations import (calculate_sector_scores, calculate_sector_scores_panel, calculate_sector_scores_state,
+                          calculate_core_sector_scores, calculate_core_sector_scores_panel, calculate_core_sector_scores_state,
+                          close_panel)
+from data_fetcher import _build_entries, _fan_out
+from indicators import reset_states
+from synthetic import make_ohlc, make_universe
+
+@pytest.fixture
+def entries():
+    """길이가 제각각이고(상장 직후 ~ 3년) 종목마다 휴장일이 다른 작은 유니버스 → {이름: entry}"""
+    universe = make_universe(40)
+    frames = make_ohlc(list(universe.values()), 3, seed=11)
+    rng = np.random.default_rng(11)
+    for i, (sym, df) in enumerate(frames.items()):
+        df = df.iloc[-[15, 60, 130, 210, 260, len(df)][i % 6]:]
+        frames[sym] = df.drop(df.index[rng.choice(len(df), len(df) // 25, replace=False)])  # 종목별 휴장일
+    reset_states()
+    return _fan_out(universe, _build_entries(frames))
+
+def test_sector_scores_panel_and_state_match_loop(entries):
+    loop = calculate_sector_scores(entries)
+    assert len(loop) == len(entries)
+    assert calculate_sector_scores_panel(*close_panel(entries)).equals(loop)
+    assert calculate_sector_scores_state(entries).equals(loop)
+
+def test_core_sector_scores_panel_and_state_match_loop(entries):
+    loop = calculate_core_sector_scores(entries)
+    assert 0 < len(loop) < len(entries)  # 이력이 짧은 종목(15봉)은 세 구현 모두 빼야 함
+    assert calculate_core_sector_scores_panel(*close_panel(entries)).equals(loop)
+    assert calculate_core_sector_scores_state(entries).equals(loop)
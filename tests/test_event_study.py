@@ -0,0 +1,18 @@
+import numpy as np
+import pandas as pd
+
+from event_study import event_windows
+from v8_batch import build_v8_panel, simulate_panel
+from synthetic import make_ohlc, make_macro
+
+def test_avoided_drawdown_column():
+    """회피 낙폭은 두 낙폭 열 바로 뒤에 전략 - 존버 값으로 들어감 (열 순서가 바뀌어도 위치가 따라감)"""
+    frames = make_ohlc(['QQQ', 'TQQQ'], 3, 5)
+    panel = build_v8_panel(pd.DataFrame({t: f['Close'] for t, f in frames.items()}), make_macro(3, 5))
+    run = simulate_panel(panel, panel['index'][0].year)
+    events = [{'date': d, 'name': f'E{i}'} for i, d in enumerate(panel['index'][250::40])]
+    table, _ = event_windows(run, events)
+    assert len(table)
+    cols = list(table.columns)
+    assert cols[cols.index('존버 낙폭(%)') + 1] == '회피 낙폭(%p)'
+    np.testing.assert_allclose(table['회피 낙폭(%p)'], table['전략 낙폭(%)'] - table['존버 낙폭(%)'])
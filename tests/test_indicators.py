@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+import indicators
+from indicators import IndicatorState, sync_states, reset_states
+from synthetic import make_ohlc
+
+def _pandas_values(close):
+    """IndicatorState.values()와 같은 정의를 pandas로 이력 전체에서 다시 계산"""
+    c, rets = close.iloc[-1], close.pct_change().iloc[1:]
+    ret = lambda k: c / close.iloc[-k] - 1 if len(close) >= k else 0.0
+    return {
+        'current': c, 'prev_day': close.iloc[-2], 'high_52w': close.iloc[-252:].max(), 'low_52w': close.iloc[-252:].min(),
+        'ytd_start': close[close.index.year == close.index[-1].year].iloc[0],
+        'ma200': close.iloc[-200:].mean() if len(close) >= 200 else np.nan, 'ma20': close.iloc[-20:].mean(),
+        'vol_20': rets.iloc[-20:].std(), 'ret_20': ret(20), 'ret_21': ret(21), 'ret_126': ret(126), 'bars': len(close),
+    }
+
+def _assert_close(state, close):
+    got, want = state.values(close.index[-1].year), _pandas_values(close)
+    assert got.keys() == want.keys()
+    for k, v in want.items():
+        assert got[k] == pytest.approx(v, rel=1e-12, abs=1e-15, nan_ok=True), k
+
+@pytest.fixture
+def close():
+    return make_ohlc(['AAA'], 4, seed=5)['AAA']['Close']
+
+@pytest.mark.parametrize('seed_bars', [30, 150, 260, 700])
+def test_update_matches_pandas(close, seed_bars):
+    """짧은 이력으로 초기화한 뒤 봉 하나씩 update() — 연도 경계/52주 창 이동을 지나도 pandas 재계산과 같아야 함"""
+    state = IndicatorState.from_series(close.iloc[:seed_bars])
+    for i in range(seed_bars, len(close)):
+        state.update(close.index[i], close.iloc[i])
+        if i % 97 == 0: _assert_close(state, close.iloc[:i + 1])
+    _assert_close(state, close)
+
+def test_update_rejects_old_bar(close):
+    state = IndicatorState.from_series(close)
+    with pytest.raises(ValueError):
+        state.update(close.index[-1], 1.0)
+
+def test_sync_states_extends_and_reseeds(close, monkeypatch):
+    """새 봉만 이어 붙이고(같은 상태 객체), 마지막 봉 값이 바뀌면(분할 수정) 이력으로 다시 초기화"""
+    monkeypatch.setattr(indicators, '_states', {})
+    first = sync_states({'AAA': close.iloc[:-5]})['AAA']
+    extended = sync_states({'AAA': close})['AAA']
+    assert extended is first
+    _assert_close(extended, close)
+
+    adjusted = close / 2
+    reseeded = sync_states({'AAA': adjusted})['AAA']
+    assert reseeded is not first
+    _assert_close(reseeded, adjusted)
+
+    reset_states()
+    assert sync_states({'AAA': close})['AAA'] is not reseeded
@@ -0,0 +1,26 @@
+import json
+
+import instrumentation
+
+def test_log_sink_rotates_by_size(tmp_path, monkeypatch):
+    """계측 JSON lines는 LOG_MAX_BYTES를 넘으면 돌려 쓰고, 이전 파일은 LOG_BACKUPS개까지만 남김"""
+    path = tmp_path / 'logs' / 'timings.jsonl'
+    monkeypatch.setattr(instrumentation, 'LOG_PATH', str(path))
+    monkeypatch.setattr(instrumentation, 'LOG_MAX_BYTES', 2000)
+    monkeypatch.setattr(instrumentation, 'LOG_BACKUPS', 2)
+    monkeypatch.setattr(instrumentation, '_sink', {'logger': None})
+    for i in range(500):
+        instrumentation.record('test:rotate', 0.001, i=i)
+    instrumentation._sink['logger'].handlers[0].close()
+
+    files = sorted(p.name for p in path.parent.iterdir())
+    assert files == ['timings.jsonl', 'timings.jsonl.1', 'timings.jsonl.2']
+    assert all(p.stat().st_size <= 2000 for p in path.parent.iterdir())
+    last = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    assert last[-1]['stage'] == 'test:rotate' and last[-1]['i'] == 499
+
+def test_log_sink_disabled(tmp_path, monkeypatch):
+    monkeypatch.setattr(instrumentation, 'LOG_PATH', '')
+    monkeypatch.setattr(instrumentation, '_sink', {'logger': None})
+    instrumentation.record('test:off', 0.001)
+    assert instrumentation._sink['logger'] is None
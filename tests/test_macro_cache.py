@@ -0,0 +1,53 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import macro_cache
+from macro_cache import MACRO_SYMBOLS, MacroDataError, get_macro_series
+from synthetic import make_macro
+
+@pytest.fixture
+def macro(cold_macro):
+    return make_macro(3, seed=4)
+
+def _frames(macro, drop=()):
+    return {s: macro[[s]].rename(columns={s: 'Close'}) for s in MACRO_SYMBOLS if s not in drop}
+
+def _expire():
+    macro_cache._cache['loaded'] = 0.0
+
+def test_failed_symbol_keeps_last_good_series(macro, monkeypatch):
+    got = iter([_frames(macro), _frames(macro, drop=['^VIX'])])
+    monkeypatch.setattr(macro_cache.price_store, 'refresh', lambda *a, **k: next(got))
+    first = get_macro_series(['^VIX', '^OVX'])
+    _expire()
+    second = get_macro_series(['^VIX', '^OVX'], strict=True)
+    pd.testing.assert_frame_equal(first, second)
+    assert macro_cache.macro_cache_info()['stale'] == ['^VIX']
+
+def test_strict_raises_for_never_loaded_symbol(macro, monkeypatch):
+    monkeypatch.setattr(macro_cache.price_store, 'refresh', lambda *a, **k: _frames(macro, drop=['^VIX']))
+    assert '^VIX' not in get_macro_series(['^VIX', '^OVX'])
+    with pytest.raises(MacroDataError, match=r'\^VIX'):
+        get_macro_series(['^VIX', '^OVX'], strict=True)
+
+def test_refresh_single_flight_without_blocking_readers(macro, monkeypatch):
+    """만료 뒤 갱신은 한 호출만 하고, 그동안 캐시가 있는 다른 호출은 잠금/네트워크를 기다리지 않음"""
+    calls, release = [], threading.Event()
+    def slow_refresh(*a, **k):
+        calls.append(1)
+        if len(calls) > 1: release.wait(10)
+        return _frames(macro)
+    monkeypatch.setattr(macro_cache.price_store, 'refresh', slow_refresh)
+    get_macro_series()
+    _expire()
+    leader = threading.Thread(target=get_macro_series)
+    leader.start()
+    while macro_cache._cache['flight'] is None: time.sleep(0.001)
+    for _ in range(5):
+        assert not get_macro_series(['^VIX']).empty  # 갱신 중에도 직전 값을 바로 받음
+    release.set()
+    leader.join(10)
+    assert len(calls) == 2 and macro_cache._cache['flight'] is None
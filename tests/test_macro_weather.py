@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from macro_weather import score_macro_weather, score_history
+from synthetic import make_macro
+
+def _holes(macro, seed):
+    """상장 전 구간(앞쪽 NaN), 중간 결측, 마지막 날 결측을 심볼마다 섞음"""
+    rng = np.random.default_rng(seed)
+    macro = macro.copy()
+    n = len(macro)
+    macro.iloc[:n // 3, macro.columns.get_loc('^OVX')] = np.nan
+    macro.iloc[:n - 30, macro.columns.get_loc('XLY')] = np.nan  # 이동평균(50)이 아직 준비 안 된 지표
+    for col in macro.columns:
+        macro.iloc[rng.choice(n, n // 20, replace=False), macro.columns.get_loc(col)] = np.nan
+    macro.iloc[-1, macro.columns.get_loc('HYG')] = np.nan
+    return macro
+
+@pytest.mark.parametrize('holes', [False, True])
+def test_today_matches_history_last_row(holes):
+    """현재 점수는 같은 입력의 점수 이력 마지막 행과 같아야 함 (NaN은 양쪽 모두 감점 없음)"""
+    macro = make_macro(3, 3)
+    if holes: macro = _holes(macro, 3)  # 이 시드는 늦게 상장한 XLY 때문에 행을 버리면 HYG 감점이 빠짐
+    score, *_ = score_macro_weather(macro)
+    assert score == score_history(macro)['Score'].iloc[-1]
+
+def test_missing_indicator_is_not_penalized():
+    """지표 하나가 통째로 없어도 점수를 내고, 그 지표는 감점 없이 '-'로 표시"""
+    macro = make_macro(3, 4)
+    macro['^OVX'] = np.nan
+    score, _, _, _, details = score_macro_weather(macro)
+    last = score_history(macro).iloc[-1]
+    assert score == last['Score'] and last['pen_ovx'] == 0
+    assert details['OVX'] == {'val': '-', 'stat': '안전', 'col': '#10b981'}
@@ -0,0 +1,97 @@
+import threading
+import time
+
+import fetch_executor
+import price_store
+from data_fetcher import FakeProvider
+from synthetic import make_ohlc
+
+def test_concurrent_refresh_same_symbols(store_dir, slow_provider):
+    frames = make_ohlc(['XLY', 'XLP'], 28, seed=1)
+    provider = slow_provider(frames)
+    errors, results = [], {}
+
+    def run(start):
+        try: results[start] = price_store.refresh(['XLY', 'XLP'], start, provider)
+        except Exception as e: errors.append(e)
+
+    for _ in range(5):
+        for f in store_dir.glob('*.parquet'): f.unlink()  # 매번 빈 저장소에서 두 호출이 모두 전체 수신
+        threads = [threading.Thread(target=run, args=(s,)) for s in ('1998-01-01', '2023-10-17')]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        assert not errors
+        for sym in ('XLY', 'XLP'):
+            # 긴 구간 메타가 짧은 구간으로 덮이지 않음 → 다음 긴 구간 요청은 증분 갱신
+            assert price_store.read_meta(sym)['since'] == '1998-01-01'
+            assert len(results['1998-01-01'][sym]) == len(frames[sym])
+    assert not list(store_dir.glob('*.tmp'))
+
+class BadSymbolProvider(FakeProvider):
+    """BAD가 섞인 묶음은 통째로 실패 → 심볼 하나씩 재시도"""
+    def download(self, symbols, period='3y', start=None):
+        if 'BAD' in symbols: raise ConnectionError('boom')
+        return super().download(symbols, period, start)
+
+def test_fetch_logged_per_symbol(store_dir, monkeypatch):
+    events = []
+    monkeypatch.setattr(price_store, 'log_event', lambda name, **f: events.append({'stage': name, **f}))
+    frames = make_ohlc(['AAA', 'BBB'], 2, seed=2)
+    report = price_store.FetchReport()
+    price_store.refresh(['AAA', 'BAD', 'BBB'], '2020-01-01', BadSymbolProvider(frames), batch_size=3, workers=1, report=report)
+    assert report.failed == {'BAD': 'ConnectionError: boom'}
+
+    first = [e for e in events if not e['retry']]
+    assert sorted(e['symbol'] for e in first) == ['AAA', 'BAD', 'BBB']
+    assert len({e['chunk'] for e in first}) == 1 and all(e['size'] == 3 and e['error'] for e in first)
+    retried = {e['symbol']: e for e in events if e['retry']}
+    assert set(retried) == {'AAA', 'BAD', 'BBB'} and len({e['chunk'] for e in retried.values()}) == 3
+    assert retried['AAA']['rows'] > 0 and 'error' not in retried['AAA'] and retried['BAD']['error'] == 'ConnectionError: boom'
+
+class HangingProvider(FakeProvider):
+    """HANG이 든 요청은 release될 때까지 응답하지 않음"""
+    def __init__(self, frames):
+        super().__init__(frames)
+        self.release = threading.Event()
+
+    def download(self, symbols, period='3y', start=None):
+        if 'HANG' in symbols: self.release.wait(30)
+        return super().download(symbols, period, start)
+
+def test_hung_symbol_times_out_within_bound(store_dir, monkeypatch):
+    """멈춘 심볼은 timeout 안에 timed_out으로 남고, 같은 묶음의 다른 심볼은 재시도로 받음"""
+    monkeypatch.setattr(fetch_executor, '_abandoned', {'running': 0})
+    provider = HangingProvider(make_ohlc(['AAA', 'BBB'], 2, seed=3))
+    report = price_store.FetchReport()
+    t0 = time.monotonic()
+    try:
+        got = price_store.refresh(['AAA', 'HANG', 'BBB'], '2020-01-01', provider, batch_size=3, workers=3, timeout=1.0, report=report)
+        elapsed = time.monotonic() - t0
+    finally:
+        provider.release.set()
+    assert report.timed_out == ['HANG'] and not report.failed
+    assert sorted(got) == ['AAA', 'BBB']
+    assert elapsed < 1.0 + 0.3  # 재시도가 두 번째 timeout 창을 열지 않음
+
+def test_abandoned_threads_capped(monkeypatch):
+    """포기한 스레드가 상한만큼 남아 있으면 새 작업을 시작하지 않고 바로 타임아웃 처리"""
+    monkeypatch.setattr(fetch_executor, '_abandoned', {'running': 0})
+    monkeypatch.setattr(fetch_executor, 'FETCH_MAX_ABANDONED', 2)
+    release, calls = threading.Event(), []
+    def hang():
+        calls.append(1)
+        release.wait(30)
+    try:
+        for i in range(2):
+            _, _, timed_out = fetch_executor.run_jobs({i: hang}, timeout=0.1)
+            assert timed_out == [i]
+        assert fetch_executor.abandoned() == 2
+        t0 = time.monotonic()
+        _, _, timed_out = fetch_executor.run_jobs({'new': hang}, timeout=0.1)
+        assert timed_out == ['new'] and len(calls) == 2 and time.monotonic() - t0 < 0.05
+    finally:
+        release.set()
+    for _ in range(100):
+        if fetch_executor.abandoned() == 0: break
+        time.sleep(0.01)
+    assert fetch_executor.abandoned() == 0
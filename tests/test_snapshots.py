@@ -0,0 +1,11 @@
+import snapshots
+
+def test_versions_order_and_prune(tmp_path, monkeypatch):
+    """.9995초 이상도 초 자리가 올라가 버전 순서 = 만든 순서, 정리할 때 최신본이 남아야 함"""
+    monkeypatch.setattr(snapshots, 'SNAPSHOT_KEEP', 1)
+    old = snapshots.write_snapshot({'built_at': 1700000000.5}, tmp_path)
+    new = snapshots.write_snapshot({'built_at': 1700000000.9996}, tmp_path)
+    assert old < new
+    assert snapshots.latest_version(tmp_path) == new
+    assert sorted(p.name for p in tmp_path.glob('snapshot-*.pkl')) == [f'snapshot-{new}.pkl']
+    assert snapshots.load_snapshot(new, tmp_path)['built_at'] == 1700000000.9996
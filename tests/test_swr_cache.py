@@ -0,0 +1,21 @@
+from concurrent.futures import Future
+
+import swr_cache
+
+def _ready(value):
+    fut = Future()
+    fut.set_result(value)
+    return fut
+
+def test_version_changes_only_with_value():
+    """적중은 같은 version, 갱신이 끝나면 새 version (invalidate 뒤에도 예전 번호를 다시 쓰지 않음)"""
+    key = 'test:version'
+    swr_cache.invalidate(key)
+    first = swr_cache.request(key, lambda: _ready(1)).result()
+    assert swr_cache.request(key, lambda: _ready(2)).result()['version'] == first['version']
+    swr_cache.request(key, lambda: _ready(2), ttl=0)  # 만료 → 직전 값을 주고 갱신 (이미 끝난 Future라 바로 반영)
+    second = swr_cache.request(key, lambda: _ready(3)).result()
+    assert second['value'] == 2 and second['version'] > first['version']
+    swr_cache.invalidate(key)
+    third = swr_cache.request(key, lambda: _ready(2)).result()
+    assert third['version'] > second['version']
@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from table_colors import gradient_frame
+
+def _styler_css(df, cols, vmin=None, vmax=None):
+    """pandas Styler.background_gradient(cmap='RdYlGn')가 칸마다 붙이는 CSS (같은 문자열 모양으로)"""
+    ctx = df.style.background_gradient(cmap='RdYlGn', subset=cols, vmin=vmin, vmax=vmax)._compute().ctx
+    out = pd.DataFrame('', index=df.index, columns=df.columns, dtype=object)
+    for (i, j), props in ctx.items():
+        out.iat[i, j] = ';'.join(f"{k}: {v}" for k, v in props)
+    return out
+
+@pytest.mark.parametrize('bounds', [(None, None), (-10, 10)])
+def test_gradient_frame_matches_styler(bounds):
+    pytest.importorskip('matplotlib')
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'이름': list('abcdefghij') * 3, 'x': rng.normal(0, 8, 30), 'y': rng.uniform(-30, 30, 30)})
+    df.loc[[3, 17], 'x'] = np.nan
+    expected = _styler_css(df, ['x', 'y'], *bounds)
+    got = gradient_frame(df, ['x', 'y'], *bounds)
+    nan = df['x'].isna()
+    assert (got.loc[nan, 'x'] == '').all()  # Styler는 NaN을 검은색으로 칠하지만 여기서는 비워 둠
+    pd.testing.assert_frame_equal(got[~nan], expected[~nan], check_dtype=False)
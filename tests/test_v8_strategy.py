@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from v8_strategy import build_v8_frame, calculate_signals, calculate_signals_reference, calc_performance, simulate, INPUT_COLS
+from synthetic import make_ohlc, make_macro
+
+TICKERS = ['QQQ', 'TQQQ']  # 일반 / 레버리지(터보경보) 규칙
+
+def _frame(years, seed, macro=None):
+    close = make_ohlc(['QQQ'], years, seed)['QQQ'][['Close']]
+    return build_v8_frame(close, make_macro(years, seed) if macro is None else macro)
+
+def _assert_same(df, ticker):
+    fast, ref = calculate_signals(df, ticker), calculate_signals_reference(df, ticker)
+    pd.testing.assert_series_equal(fast['신호'], ref['신호'], check_dtype=False)
+    pd.testing.assert_series_equal(fast['CMS'], ref['CMS'].astype('float64'))
+    assert fast.drop(columns=['신호', 'CMS']).equals(df)
+
+@pytest.mark.parametrize('ticker', TICKERS)
+def test_signals_match_reference(ticker):
+    df = _frame(26, 7)  # 이 시드는 종목별로 나올 수 있는 다섯 신호를 모두 지남
+    assert calculate_signals(df, ticker)['신호'].nunique() == 5
+    _assert_same(df, ticker)
+
+@pytest.mark.parametrize('ticker', TICKERS)
+def test_signals_match_reference_with_nans(ticker):
+    """입력 열 곳곳의 NaN과 VIX_MA5 == 0 — 비교는 False, max(0, NaN)은 0으로 같게 처리해야 함"""
+    df = _frame(8, 1)
+    rng = np.random.default_rng(1)
+    for col in INPUT_COLS[1:]:
+        df.loc[df.index[rng.choice(len(df), 40, replace=False)], col] = np.nan
+    df.loc[df.index[rng.choice(len(df), 10, replace=False)], 'VIX_MA5'] = 0.0
+    _assert_same(df, ticker)
+
+@pytest.mark.parametrize('ticker', TICKERS)
+def test_signals_match_reference_with_vix_gaps(ticker):
+    """VIX/OVX가 빠진 날 (build_v8_frame이 VIX 없는 날을 버리고 OVX는 기본값으로 채움)"""
+    macro = make_macro(8, 2)
+    rng = np.random.default_rng(2)
+    macro.loc[macro.index[rng.choice(len(macro), 150, replace=False)], '^VIX'] = np.nan
+    macro.loc[macro.index[300:420], '^OVX'] = np.nan
+    macro.loc[macro.index[500:520], ['^TNX', '^IRX']] = np.nan
+    df = _frame(8, 2, macro)
+    assert len(df) < len(macro)
+    _assert_same(df, ticker)
+
+@pytest.mark.parametrize('ticker', TICKERS)
+@pytest.mark.parametrize('rows', [1, 5, 60])
+def test_signals_match_reference_short_history(ticker, rows):
+    """MA200이 막 생긴 짧은 이력"""
+    df = _frame(1.1, 3)
+    assert len(df) >= rows
+    _assert_same(df.iloc[-rows:], ticker)
+
+# ── 경로 의존 시뮬레이터 ──
+def test_simulate_hand_computed():
+    """스로틀(낙폭 -5% 아래면 비중 절반)과 비중 변경 비용(1%, 실제 비중 0이면 면제)을 손으로 계산한 값"""
+    sim = simulate([0.0, -0.10, 0.05, 0.04, 0.03], [1.0, 1.0, 1.0, 0.5, 0.0], cost_rate=0.01, throttle_dd=-0.05, throttle_factor=0.5)
+    np.testing.assert_allclose(sim['exposure'], [1.0, 0.5, 1.0, 0.5, 0.0])
+    np.testing.assert_allclose(sim['cost'], [0.0, 0.0, 0.0, 0.01, 0.0])
+    np.testing.assert_allclose(sim['equity'], [1.0, 0.95, 0.9975, 1.007475, 1.007475])
+    np.testing.assert_allclose(sim['drawdown'], [0.0, -0.05, -0.0025, 0.0, 0.0], atol=1e-15)
+
+def test_simulate_1d_matches_2d():
+    """파이썬 float 루프(1차원)와 시나리오 배열(2차원, 시나리오별 파라미터 포함)이 같은 경로를 냄"""
+    rng = np.random.default_rng(0)
+    r = rng.normal(0.0005, 0.02, 1500)
+    e = rng.choice([0.0, 0.2, 0.4, 0.7, 1.0], 1500)[np.repeat(np.arange(150), 10)]  # 10일마다 비중 변경
+    params = [(0.002, -0.08, 0.3), (0.0, -0.05, 0.5), (0.01, -0.2, 0.0)]
+    cost, dd, factor = (np.array(p) for p in zip(*params))
+    both = simulate(r, np.column_stack([e] * len(params)), cost, dd, factor)
+    for j, p in enumerate(params):
+        one = simulate(r, e, *p)
+        for k in ('equity', 'exposure', 'cost', 'drawdown'):
+            np.testing.assert_allclose(both[k][:, j], one[k], rtol=1e-12, atol=1e-15, err_msg=f"{p} {k}")
+
+def test_calc_performance_includes_cost():
+    """cum_strat/dd_strat는 비용까지 뺀 시뮬레이터 자산곡선"""
+    df = calculate_signals(_frame(10, 7), 'QQQ')
+    perf = calc_performance(df, 'QQQ', df.index[0].year + 1)
+    assert perf['cost'].sum() > 0
+    expected = (1 + perf['daily_ret'] * perf['exposure'] - perf['cost']).cumprod()
+    np.testing.assert_allclose(perf['cum_strat'], expected, rtol=1e-12)
+    no_cost = calc_performance(df, 'QQQ', df.index[0].year + 1, cost_rate=0.0)
+    assert perf['cum_strat'].iloc[-1] < no_cost['cum_strat'].iloc[-1]
+    np.testing.assert_allclose(perf['dd_strat'], (perf['cum_strat'] / perf['cum_strat'].cummax() - 1) * 100, atol=1e-12)
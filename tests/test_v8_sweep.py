@@ -0,0 +1,45 @@
+import os
+
+import pandas as pd
+import pytest
+
+from v8_strategy import EXPOSURE, SIG_WAIT, V8_PARAMS, build_v8_frame
+from v8_sweep import run_sweep, parse_exposures, exposure_label
+from synthetic import make_ohlc, make_macro
+
+SHM_DIR = '/dev/shm'
+
+def _segments():
+    return set(os.listdir(SHM_DIR)) if os.path.isdir(SHM_DIR) else set()
+
+@pytest.fixture(scope='module')
+def frame():
+    close = make_ohlc(['QQQ'], 8, seed=9)['QQQ'][['Close']]
+    return build_v8_frame(close, make_macro(8, seed=9))
+
+GRID = {'vix_floor': (20.0, 25.0), 'cms_green': (50.0, 55.0), 'throttle_dd': (-0.08, -0.15),
+        'exposure': (EXPOSURE, {**EXPOSURE, SIG_WAIT: 0.3})}
+
+@pytest.mark.parametrize('ticker', ['QQQ', 'TQQQ'])
+def test_process_pool_matches_serial(frame, ticker):
+    """공유 메모리 + spawn 프로세스 풀 결과가 같은 프로세스 안의 순차 evaluate와 같고, 공유 메모리는 남지 않음"""
+    before = _segments()
+    serial = run_sweep(frame, ticker, 2019, GRID, workers=1, chunk=3)
+    pooled = run_sweep(frame, ticker, 2019, GRID, workers=2, chunk=3)
+    assert len(serial) == 16 and serial['CAGR(%)'].nunique() > 1
+    pd.testing.assert_frame_equal(pooled, serial)
+    assert set(serial['exposure']) == {exposure_label(EXPOSURE), exposure_label({**EXPOSURE, SIG_WAIT: 0.3})}
+    assert _segments() <= before
+
+def test_shared_memory_released_on_worker_error(frame):
+    before = _segments()
+    bad = {'vix_floor': (20.0, 25.0, 30.0), 'exposure': ({**EXPOSURE, SIG_WAIT: 'x'},)}  # 작업 프로세스의 exposure_table에서 ValueError
+    with pytest.raises(ValueError):
+        run_sweep(frame, 'QQQ', 2019, bad, workers=2, chunk=1)
+    assert _segments() <= before
+
+def test_parse_exposures():
+    assert parse_exposures(exposure_label(V8_PARAMS['exposure'])) == (EXPOSURE,)
+    assert len(parse_exposures('1/0.4/0.4/0.7/0.8; 1/0.2/0.2/0.5/0.8;')) == 2
+    with pytest.raises(ValueError):
+        parse_exposures('1/0.4/0.7')
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+from v8_strategy import V8_PARAMS, INPUT_COLS, LEVERAGED, SIGNALS, classify, exposure_table, simulate
+
+# ── V8 유니버스 일괄 백테스트 ((날짜 × 티커) 배열 하나 + 공용 매크로 패널) ──
+MACRO_COLS = ['VIX', 'VIX_MA5', 'OVX', 'Spread']
+
+def _naive(obj):
+    return obj.tz_localize(None) if obj.index.tz is not None else obj
+
+def build_v8_panel(closes, macro):
+    """(날짜 × 티커) 종가 DataFrame + 매크로 종가(^VIX/^OVX/^TNX/^IRX) → 신호 입력 배열 dict
+
+    build_v8_frame과 같은 규칙을 종목 전체에 한 번에 적용합니다. 날짜 축은 VIX 거래일이고,
+    매크로 열은 모든 종목이 (날짜 × 1) 열 하나를 공유합니다.
+    상장 전 구간은 NaN으로 두고, 상장 후 중간에 빠진 봉은 전일 종가로 채웁니다(수익률 0).
+    """
+    macro, closes = _naive(macro), _naive(closes)
+    vix = macro['^VIX'].dropna()
+    idx = vix.index
+    close = closes.reindex(idx).ffill()
+    col = lambda s: s.reindex(idx).to_numpy(dtype='float64')[:, None]
+    panel = {'index': idx, 'tickers': list(close.columns), 'Close': close.to_numpy(dtype='float64')}
+    for n in (20, 50, 200):
+        panel[f'MA{n}'] = close.rolling(n).mean().to_numpy(dtype='float64')
+    panel['VIX'], panel['VIX_MA5'] = col(vix), col(vix.rolling(5).mean())
+    panel['OVX'] = col(macro['^OVX'].reindex(idx).fillna(30))
+    panel['Spread'] = col((macro['^TNX'] - macro['^IRX']).reindex(idx).fillna(1.0))
+    return panel
+
+def simulate_panel(panel, start_year, params=None, leveraged=LEVERAGED):
+    """start_year 이후 구간을 모든 종목에 대해 한 번의 2차원 시뮬레이션으로 → 배열 dict
+
+    종목마다 종가와 MA200이 모두 있는 첫 봉부터 calc_performance와 같은 규칙(전일 신호로 오늘 비중,
+    첫 봉 수익률·비중 0)으로 계산하고, 그 전 구간은 비중 0·수익률 0으로 자산곡선을 1에 묶어 둡니다.
+    반환 배열은 모두 (날짜 × 티커)이고, 유효하지 않은 봉의 신호 코드는 -1입니다.
+    """
+    p = {**V8_PARAMS, **(params or {})}
+    rows = panel['index'] >= pd.Timestamp(f"{start_year}-01-01")
+    idx, tickers = panel['index'][rows], panel['tickers']
+    arr = {k: panel[k][rows] for k in INPUT_COLS}
+    close = arr['Close']
+    valid = ~np.isnan(close) & ~np.isnan(arr['MA200'])
+    both = np.zeros_like(valid)
+    both[1:] = valid[1:] & valid[:-1]  # 전일과 오늘 모두 유효한 봉만 수익률/비중을 가짐
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        daily_ret = np.where(both, np.clip(close / np.vstack([close[:1], close[:-1]]) - 1, -0.99, 5.0), 0.0)
+
+    # 레버리지 여부만 다르므로 두 묶음으로 나눠 신호 코드와 비중을 계산
+    code, cms = np.zeros(close.shape, dtype=np.int64), np.zeros(close.shape)
+    base = np.zeros(close.shape)
+    is_lev = np.array([t in leveraged for t in tickers], dtype=bool)
+    for lev in (False, True):
+        cols = np.flatnonzero(is_lev == lev)
+        if not len(cols): continue
+        inputs = [arr[k][:, cols] if k not in MACRO_COLS else arr[k] for k in INPUT_COLS]
+        code[:, cols], cms[:, cols] = classify(*inputs, lev, p)
+        base[1:, cols] = exposure_table(lev, p)[code[:-1, cols]]
+    base = np.where(both, base, 0.0)
+
+    sim = simulate(daily_ret, base, p['cost_rate'], p['throttle_dd'], p['throttle_factor'])
+    bah = np.cumprod(1 + daily_ret, axis=0)
+    return {'index': idx, 'tickers': tickers, 'valid': valid, 'code': np.where(valid, code, -1), 'cms': cms,
+            'exposure': sim['exposure'], 'cost': sim['cost'], 'equity': sim['equity'], 'drawdown': sim['drawdown'], 'bah': bah}
+
+def summarize(run):
+    """simulate_panel 결과 → 종목별 전략 vs 존버 CAGR/MDD DataFrame"""
+    idx, tickers, valid, bah = run['index'], run['tickers'], run['valid'], run['bah']
+    bah_dd = bah / np.maximum.accumulate(bah, axis=0) - 1
+    has = valid.any(axis=0)
+    first = np.argmax(valid, axis=0)
+    last = len(idx) - 1 - np.argmax(valid[::-1], axis=0)
+    cols = np.arange(len(tickers))
+    years = np.asarray((idx[last] - idx[first]).days, dtype='float64') / 365.25
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cagr = lambda final: np.where(years > 0, (np.power(final, 1 / years) - 1) * 100, np.nan)
+        out = pd.DataFrame({
+            '티커': tickers, '시작일': idx[first].strftime('%Y-%m-%d'),
+            '전략 CAGR(%)': cagr(run['equity'][-1]), '존버 CAGR(%)': cagr(bah[-1]),
+            '전략 MDD(%)': run['drawdown'].min(axis=0) * 100, '존버 MDD(%)': bah_dd.min(axis=0) * 100,
+            '비용(%p)': run['cost'].sum(axis=0) * 100,
+            '현재 신호': np.array(SIGNALS)[np.maximum(run['code'][last, cols], 0)], 'CMS': run['cms'][last, cols],
+        })
+    out.insert(4, 'CAGR 차(%p)', out['전략 CAGR(%)'] - out['존버 CAGR(%)'])
+    out.insert(7, 'MDD 개선(%p)', out['전략 MDD(%)'] - out['존버 MDD(%)'])
+    return out[has].reset_index(drop=True)
+
+def run_batch(panel, start_year, params=None, leveraged=LEVERAGED):
+    """build_v8_panel 결과 → 종목별 지표 DataFrame"""
+    return summarize(simulate_panel(panel, start_year, params, leveraged))
+
+def leaderboard(universes, closes, macro, start_year, params=None):
+    """{그룹: {이름: 티커}} 전체를 한 번에 백테스트 → (전략 CAGR 순 리더보드, simulate_panel 배열)
+
+    여러 그룹에 겹치는 티커(QQQ, SMH 등)는 한 번만 계산하고 이름/그룹을 붙여 펼칩니다.
+    배열은 이벤트 윈도우 분석(event_study) 등에 그대로 재사용합니다.
+    """
+    symbols = list(dict.fromkeys(t for g in universes.values() for t in g.values() if t in closes.columns))
+    run = simulate_panel(build_v8_panel(closes[symbols], macro), start_year, params)
+    res = summarize(run).set_index('티커')
+    names = pd.DataFrame([{'그룹': g, '이름': n, '티커': t} for g, tickers in universes.items() for n, t in tickers.items() if t in res.index])
+    if names.empty: return names, run
+    board = names.join(res, on='티커')
+    return board.sort_values('전략 CAGR(%)', ascending=False).reset_index(drop=True), run
@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+
+from macro_weather import score_exposure, _pos
+
+# ── V8 하이브리드 전략 로직 (백테스트 페이지에서 사용) ──
+LEVERAGED = ["TQQQ", "QLD"]
+SIG_RED, SIG_TURBO, SIG_EARLY = '🔴철수(Red)', '⚠️터보경보(Turbo)', '🟡조기경보(Yellow)'
+SIG_GREEN, SIG_CONTRA, SIG_WAIT = '🟢매수(Green)', '🔥역발상매수', '🟡관망(Yellow)'
+
+SIGNALS = [SIG_RED, SIG_TURBO, SIG_EARLY, SIG_GREEN, SIG_CONTRA, SIG_WAIT]  # classify()가 돌려주는 코드 순서
+INPUT_COLS = ['Close', 'MA20', 'MA50', 'MA200', 'VIX', 'VIX_MA5', 'OVX', 'Spread']
+
+# 신호별 기본 비중 (철수는 0), 터보경보는 레버리지 종목일 때 0.2
+EXPOSURE = {SIG_GREEN: 1.0, SIG_TURBO: 0.4, SIG_EARLY: 0.4, SIG_WAIT: 0.7, SIG_CONTRA: 0.8}
+LEV_TURBO_EXPOSURE = 0.2
+COST_RATE, THROTTLE_DD, THROTTLE_FACTOR = 0.002, -0.08, 0.3  # 비중 변경 비용, 낙폭 스로틀 기준/배율
+
+# 전략 임계값 (파라미터 스윕에서 덮어쓸 수 있는 값들)
+V8_PARAMS = {
+    'vix_floor': 25, 'ovx_floor': 35, 'spread_floor': -0.5, 'spike_ratio': 1.25,
+    'cms_red': 50, 'cms_green': 55, 'contra_level': 0.90,
+    'exposure': EXPOSURE, 'lev_turbo_exposure': LEV_TURBO_EXPOSURE,
+    'cost_rate': COST_RATE, 'throttle_dd': THROTTLE_DD, 'throttle_factor': THROTTLE_FACTOR,
+}
+
+def build_v8_frame(df, macro):
+    """종가 DataFrame(Close)과 매크로 종가(^VIX/^OVX/^TNX/^IRX 열)를 합쳐 신호 입력 열을 만듦"""
+    combined = df.join(macro['^VIX'].dropna().to_frame('VIX'), how='inner')
+    combined = combined.join(macro['^OVX'].dropna().to_frame('OVX'), how='left')
+    combined['Spread'] = (macro['^TNX'] - macro['^IRX'])
+    combined['MA20'] = combined['Close'].rolling(20).mean()
+    combined['MA50'] = combined['Close'].rolling(50).mean()
+    combined['MA200'] = combined['Close'].rolling(200).mean()
+    combined['VIX_MA5'] = combined['VIX'].rolling(5).mean()
+    combined['OVX'] = combined['OVX'].fillna(30)
+    combined['Spread'] = combined['Spread'].fillna(1.0)
+    return combined.dropna(subset=['Close', 'VIX', 'MA200']).tz_localize(None)
+
+def classify(c, m20, m50, m200, v, v5, o, s, is_lev, params=V8_PARAMS):
+    """CMS 감점, VIX 스파이크, 신호 결정 순서를 열 전체 마스크로 계산 → (신호 코드, CMS)"""
+    p = params
+    mult = np.where(c < m50, 2.0, 1.0)
+    pen = ((1.0 * _pos(v - p['vix_floor'])) + (1.2 * _pos(o - p['ovx_floor'])) + np.where(s < p['spread_floor'], 20, 0)) * mult
+    cms = 100 - pen
+    with np.errstate(divide='ignore', invalid='ignore'):
+        v_spike = (v5 > 0) & (v / v5 > p['spike_ratio'])
+
+    warn = ((c < m20) if is_lev else (c < m50)) | v_spike
+    code = np.select(
+        [(c < m200) & (cms < p['cms_red']), warn, cms >= p['cms_green'], c < (m200 * p['contra_level'])],
+        [0, 1 if is_lev else 2, 3, 4],
+        default=5
+    )
+    return code, cms
+
+def exposure_table(is_lev, params=V8_PARAMS):
+    """신호 코드 → 기본 비중 조회용 배열"""
+    table = dict(params['exposure'], **({SIG_TURBO: params['lev_turbo_exposure']} if is_lev else {}))
+    return np.array([table.get(sig, 0.0) for sig in SIGNALS], dtype='float64')
+
+def calculate_signals(df, ticker, params=None):
+    """행 단위 루프 없이 전체 열에 V8 신호와 CMS를 붙임"""
+    df = df.copy()
+    code, cms = classify(*(df[k].to_numpy(dtype='float64') for k in INPUT_COLS), ticker in LEVERAGED, {**V8_PARAMS, **(params or {})})
+    df['신호'], df['CMS'] = np.array(SIGNALS)[code], cms
+    return df
+
+def calculate_signals_reference(df, ticker):
+    """행 단위 원본 규칙 (calculate_signals 결과 검증용 기준 구현)"""
+    df = df.copy()
+    is_lev = ticker in LEVERAGED
+    def get_status(row):
+        c, m20, m50, m200, v, v5, o, s = row['Close'], row['MA20'], row['MA50'], row['MA200'], row['VIX'], row['VIX_MA5'], row['OVX'], row['Spread']
+        mult = 2.0 if c < m50 else 1.0
+        pen = ((1.0 * max(0, v - 25)) + (1.2 * max(0, o - 35)) + (20 if s < -0.5 else 0)) * mult
+        cms = 100 - pen
+        v_spike = v / v5 > 1.25 if v5 > 0 else False
+        if c < m200 and cms < 50: return SIG_RED, cms
+        if is_lev:
+            if c < m20 or v_spike: return SIG_TURBO, cms
+        else:
+            if c < m50 or v_spike: return SIG_EARLY, cms
+        if cms >= 55: return SIG_GREEN, cms
+        if c < (m200 * 0.90): return SIG_CONTRA, cms
+        return SIG_WAIT, cms
+    res = df.apply(get_status, axis=1, result_type='expand')
+    df['신호'], df['CMS'] = res[0], res[1]
+    return df
+
+# ── 경로 의존 시뮬레이터 (낙폭 스로틀 + 비중 변경 비용) ──
+def simulate(daily_ret, base_exp, cost_rate=COST_RATE, throttle_dd=THROTTLE_DD, throttle_factor=THROTTLE_FACTOR):
+    """일간 수익률과 목표 비중으로 전략 자산곡선을 한 번에 계산
+
+    - 목표 비중이 전일과 달라진 날은 cost_rate만큼 비용 (실제 비중이 0이면 면제)
+    - 그날 결과로 고점 대비 낙폭이 throttle_dd 아래로 내려가면 비중을 throttle_factor배로 축소
+    1차원 배열은 한 번의 시뮬레이션, (날짜 × 시나리오) 2차원 배열은 시나리오 전체를 동시에 계산합니다.
+    cost_rate/throttle_dd/throttle_factor에 시나리오별 배열을 넘길 수도 있습니다.
+    반환: {'equity', 'exposure', 'cost', 'drawdown'} (drawdown은 비율, 예: -0.25)
+    """
+    r, e = np.asarray(daily_ret, dtype='float64'), np.asarray(base_exp, dtype='float64')
+    if r.ndim == 1 and e.ndim == 1 and all(np.ndim(p) == 0 for p in (cost_rate, throttle_dd, throttle_factor)):
+        return _simulate_1d(r, e, float(cost_rate), float(throttle_dd), float(throttle_factor))
+    r, e = np.broadcast_arrays(r.reshape(len(r), -1), e.reshape(len(e), -1))
+    cost = np.zeros(e.shape)
+    cost[1:] = np.where(e[1:] != e[:-1], 1.0, 0.0) * cost_rate
+    exposure, paid, equity = np.empty(e.shape), np.empty(e.shape), np.empty(e.shape)
+    cum, peak = np.ones(e.shape[1]), np.ones(e.shape[1])
+    for i in range(len(e)):
+        temp = cum * (1 + (r[i] * e[i]) - cost[i])
+        actual = np.where(temp / peak - 1 < throttle_dd, e[i] * throttle_factor, e[i])
+        paid[i] = np.where(actual > 0, cost[i], 0.0)
+        cum = cum * (1 + (r[i] * actual) - paid[i])
+        peak = np.maximum(peak, cum)
+        exposure[i], equity[i] = actual, cum
+    return {'equity': equity, 'exposure': exposure, 'cost': paid,
+            'drawdown': equity / np.maximum.accumulate(equity, axis=0) - 1}
+
+def _simulate_1d(r, e, cost_rate, throttle_dd, throttle_factor):
+    # 단일 경로는 배열 원소 접근보다 파이썬 float 루프가 훨씬 빠릅니다.
+    rets, exps = r.tolist(), e.tolist()
+    exposure, paid, equity = [0.0] * len(exps), [0.0] * len(exps), [0.0] * len(exps)
+    cum, peak, prev = 1.0, 1.0, None
+    for i, (d_ret, exp) in enumerate(zip(rets, exps)):
+        cost = cost_rate if i > 0 and exp != prev else 0
+        temp = cum * (1 + (d_ret * exp) - cost)
+        actual = exp * throttle_factor if temp / peak - 1 < throttle_dd else exp
+        cost = cost if actual > 0 else 0
+        cum *= (1 + (d_ret * actual) - cost)
+        if cum > peak: peak = cum
+        exposure[i], paid[i], equity[i], prev = actual, cost, cum, exp
+    equity = np.array(equity)
+    return {'equity': equity, 'exposure': np.array(exposure), 'cost': np.array(paid, dtype='float64'),
+            'drawdown': equity / np.maximum.accumulate(equity) - 1}
+
+def signal_exposure(signals, ticker, params=V8_PARAMS):
+    """신호 라벨 → 기본 비중 배열"""
+    table = dict(zip(SIGNALS, exposure_table(ticker in LEVERAGED, params)))
+    return pd.Series(signals).map(table).fillna(0.0).to_numpy(dtype='float64')
+
+def calc_performance(df, ticker, start_year, cost_rate=COST_RATE, throttle_dd=THROTTLE_DD, throttle_factor=THROTTLE_FACTOR,
+                     weather=None, weather_mode='overlay'):
+    """V8 신호로 비중을 정해 자산곡선/낙폭을 계산
+
+    weather에 매크로 날씨 점수 Series(macro_weather.score_history()['Score'])를 넘기면 날씨 비중도 반영합니다.
+    - 'overlay': V8 비중 × 날씨 비중 / 'only': 날씨 비중만 (V8 신호 무시)
+    점수가 없는 날(이력 시작 전)은 날씨 비중 1로 둡니다. 두 신호 모두 전일 값으로 오늘 비중을 정합니다.
+    """
+    df = df[df.index >= f"{start_year}-01-01"].copy()
+    df['daily_ret'] = df['Close'].pct_change().fillna(0).clip(-0.99, 5.0)
+    exp = signal_exposure(df['신호'], ticker)
+    if weather is not None:
+        score = weather.reindex(df.index, method='ffill').to_numpy(dtype='float64')
+        w_exp = np.where(np.isnan(score), 1.0, score_exposure(score))
+        df['날씨점수'] = score
+        exp = w_exp if weather_mode == 'only' else exp * w_exp
+    df['base_exp'] = pd.Series(exp, index=df.index).shift(1).fillna(0)
+    sim = simulate(df['daily_ret'].to_numpy(), df['base_exp'].to_numpy(), cost_rate, throttle_dd, throttle_factor)
+    # 💡 자산곡선은 시뮬레이터 결과를 그대로 사용 (예전 cumprod 재계산은 비용을 빠뜨렸음)
+    df['exposure'], df['cost'], df['cum_strat'] = sim['exposure'], sim['cost'], sim['equity']
+    df['cum_bah'] = (1 + df['daily_ret']).cumprod()
+    df['dd_strat'] = sim['drawdown'] * 100
+    df['dd_bah'] = (df['cum_bah'] / df['cum_bah'].cummax() - 1) * 100
+    return df
@@ -0,0 +1,100 @@
+import itertools
+import os
+import numpy as np
+import pandas as pd
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from v8_strategy import (V8_PARAMS, INPUT_COLS, LEVERAGED, classify, exposure_table, simulate,
+                         SIG_GREEN, SIG_TURBO, SIG_EARLY, SIG_WAIT, SIG_CONTRA)
+
+# ── V8 임계값 그리드 서치 (프로세스 풀 + 공유 메모리) ──
+SWEEP_WORKERS = int(os.environ.get('SWEEP_WORKERS', os.cpu_count() or 2))
+SWEEP_CHUNK = 128  # 작업 하나가 한꺼번에 시뮬레이션하는 조합 수
+ARRAY_COLS = INPUT_COLS + ['daily_ret']
+
+EXPOSURE_ORDER = [SIG_GREEN, SIG_TURBO, SIG_EARLY, SIG_WAIT, SIG_CONTRA]  # 비중표 후보 입력/표시 순서 (철수는 항상 0)
+
+_SHARED = {}  # 작업 프로세스별 공유 메모리 뷰
+
+def exposure_label(exposure):
+    """비중표 dict → '1/0.4/0.4/0.7/0.8' (EXPOSURE_ORDER 순서)"""
+    return '/'.join(f"{exposure.get(sig, 0.0):g}" for sig in EXPOSURE_ORDER)
+
+def parse_exposures(text):
+    """'1/0.4/0.4/0.7/0.8; 1/0.2/0.2/0.5/0.8' → 비중표 dict 튜플 (형식이 틀리면 ValueError)"""
+    out = []
+    for part in (p.strip() for p in text.split(';')):
+        if not part: continue
+        values = [float(x) for x in part.split('/')]
+        if len(values) != len(EXPOSURE_ORDER): raise ValueError(f"비중 {len(EXPOSURE_ORDER)}개가 필요합니다: {part}")
+        out.append(dict(zip(EXPOSURE_ORDER, values)))
+    return tuple(out)
+
+def expand_grid(grid):
+    """{파라미터: 후보 목록} → V8_PARAMS를 덮어쓴 조합 dict 목록"""
+    keys = list(grid)
+    return [{**V8_PARAMS, **dict(zip(keys, values))} for values in itertools.product(*(grid[k] for k in keys))]
+
+def _sweep_arrays(df, start_year):
+    """시작 연도 이후 구간의 입력 열 + 일간 수익률을 (열 × 날짜) 배열로"""
+    df = df[df.index >= f"{start_year}-01-01"]
+    daily_ret = df['Close'].pct_change().fillna(0).clip(-0.99, 5.0)
+    data = np.vstack([df[k].to_numpy(dtype='float64') for k in INPUT_COLS] + [daily_ret.to_numpy(dtype='float64')])
+    years = (df.index[-1] - df.index[0]).days / 365.25
+    return np.ascontiguousarray(data), years
+
+def evaluate(data, combos, is_lev, years):
+    """조합 묶음을 한 번의 2차원 시뮬레이션으로 평가 → 지표 dict 목록"""
+    cols = dict(zip(ARRAY_COLS, data))
+    inputs = [cols[k] for k in INPUT_COLS]
+    base = np.empty((data.shape[1], len(combos)))
+    for j, p in enumerate(combos):
+        code, _ = classify(*inputs, is_lev, p)
+        base[1:, j] = exposure_table(is_lev, p)[code][:-1]  # 전일 신호로 오늘 비중 결정
+    base[0] = 0.0
+    sim = simulate(cols['daily_ret'], base,
+                   cost_rate=np.array([p['cost_rate'] for p in combos]),
+                   throttle_dd=np.array([p['throttle_dd'] for p in combos]),
+                   throttle_factor=np.array([p['throttle_factor'] for p in combos]))
+    final = sim['equity'][-1]
+    cagr = (np.power(final, 1 / years) - 1) * 100 if years > 0 else np.zeros(len(combos))
+    mdd = sim['drawdown'].min(axis=0) * 100
+    turnover = np.abs(np.diff(sim['exposure'], axis=0)).sum(axis=0) / max(years, 1e-9)
+    return [{'CAGR(%)': float(cagr[j]), 'MDD(%)': float(mdd[j]), '회전율(연)': float(turnover[j])} for j in range(len(combos))]
+
+def _attach(name, shape):
+    shm = shared_memory.SharedMemory(name=name)  # 해제(unlink)는 부모 프로세스가 담당
+    _SHARED['shm'] = shm
+    _SHARED['data'] = np.ndarray(shape, dtype='float64', buffer=shm.buf)
+
+def _evaluate_shared(combos, is_lev, years):
+    return evaluate(_SHARED['data'], combos, is_lev, years)
+
+def run_sweep(df, ticker, start_year, grid, workers=None, chunk=SWEEP_CHUNK):
+    """grid의 모든 조합을 평가해 파라미터 + CAGR/MDD/회전율 표로 반환
+
+    가격·지표 배열은 공유 메모리에 한 번만 올리고, 작업에는 조합 목록만 넘깁니다.
+    """
+    combos = expand_grid(grid)
+    data, years = _sweep_arrays(df, start_year)
+    is_lev = ticker in LEVERAGED
+    chunks = [combos[i:i + chunk] for i in range(0, len(combos), chunk)]
+    workers = min(workers or SWEEP_WORKERS, len(chunks))
+
+    if workers <= 1:
+        metrics = [m for c in chunks for m in evaluate(data, c, is_lev, years)]
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=data.nbytes)
+        try:
+            np.ndarray(data.shape, dtype='float64', buffer=shm.buf)[:] = data
+            with ProcessPoolExecutor(workers, mp_context=mp.get_context('spawn'),
+                                     initializer=_attach, initargs=(shm.name, data.shape)) as pool:
+                metrics = [m for part in pool.map(_evaluate_shared, chunks, itertools.repeat(is_lev), itertools.repeat(years)) for m in part]
+        finally:
+            shm.close()
+            shm.unlink()
+
+    rows = [{**{k: exposure_label(c[k]) if k == 'exposure' else c[k] for k in grid}, **m} for c, m in zip(combos, metrics)]
+    return pd.DataFrame(rows).sort_values('CAGR(%)', ascending=False).reset_index(drop=True)
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+from table_colors import gradient_frame
+
+# ── 화면용 뷰 모델: 점수표 → 표 CSS/서식 + 카드 HTML을 데이터 버전마다 한 번만 만들어 둠 ──
+# 💡 재실행마다 하는 일은 table_controls로 고른 행 번호(_row)로 미리 만든 CSS/카드를 잘라 오는 것뿐이라
+#    유니버스가 1,000종목이어도 화면에 보이는 행 수만큼만 비용이 듭니다.
+#    그라데이션은 표 전체(한 데이터 버전) 기준으로 정규화하므로 검색/상위 N을 바꿔도 색이 유지됩니다.
+SECTOR_GRADIENT = ['L-score', 'S-score', 'S-L', '20일(%)']
+SECTOR_FORMAT = {'L-score': '{:.2f}', 'S-score': '{:.2f}', 'S-L': '{:.2f}', '20일(%)': '{:.2f}%'}
+INDIVIDUAL_NUM = ['연초대비', 'high대비', '200대비', '전일대비', '52저대비']
+INDIVIDUAL_COLS = ['티커_아이콘', '현재가'] + INDIVIDUAL_NUM
+INDIVIDUAL_FORMAT = {'현재가': '{:.2f}', **{c: '{:.1f}%' for c in INDIVIDUAL_NUM}}
+CORE_GRADIENT = ['S-SCORE', '20일(%)']
+CORE_FORMAT = {'S-SCORE': '{:.2f}', '20일(%)': '{:.2f}%'}
+
+BENCHMARK_SECTORS = ['S&P', 'NASDAQ']
+DEFENSIVE_SECTORS = ['CASH', '물가연동채', '장기국채']
+LEVERAGED_ICON = ['TQQQ', 'SOXL', 'UPRO', 'QLD', 'SSO', 'TECL', 'FNGU', 'BULZ', 'NVDL', 'CONL']
+CORE_ICON = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META', 'NVDA', 'TSLA', 'SPY', 'QQQ', 'DIA']
+
+# 신호 순번(0 매수 / 1 관망 / 2 도망챠)별 카드 모양
+CARD_CSS = ["card-buy", "card-wait", "card-exit"]
+CARD_SIGNAL = ["✅ 매수 신호", "⚠️ 관망", "🚨 도망챠"]
+CARD_ICON = ["🟢", "🟡", "🔴"]
+GROUP_LABELS = {0: "✅ 매수 구간", 1: "⚠️ 관망 구간", 2: "🚨 도망챠 구간"}
+GROUP_COLORS = {0: "#d1fae5", 1: "#fef9c3", 2: "#fee2e2"}
+
+def _with_row(df):
+    """table_controls(top_rows)를 거쳐도 원래 행 번호를 알 수 있게 _row 열을 붙인 복사본"""
+    out = df.copy()
+    out['_row'] = np.arange(len(out))
+    return out
+
+def _empty(fmt):
+    return {'table': pd.DataFrame({'_row': []}), 'css': pd.DataFrame(), 'format': fmt, 'cards': np.array([], dtype=object),
+            'signal': np.array([], dtype=np.int64), 'card_rank': np.array([], dtype=np.int64)}
+
+def _signal(score, low, high):
+    return np.select([score > high, score < low], [0, 2], 1)
+
+def sector_view(df):
+    """섹터 점수표 → {'table', 'css', 'format', 'signal', 'card_rank', 'cards'}
+
+    - css: 표와 같은 모양의 CSS (벤치마크/방어 자산 행 강조 + 점수 열 그라데이션)
+    - signal: 행별 신호 순번 — 💡 0 근처(-0.05 ~ 0.05)에서 알짱거리는 휩쏘(거짓 신호)는 관망으로
+    - card_rank: 카드 뷰 정렬 순서 (신호 순번, S-L 내림차순), cards: 행별 카드 HTML
+    """
+    if df.empty: return _empty(SECTOR_FORMAT)
+    s, l, sl = (df[c].to_numpy(dtype='float64') for c in ('S-score', 'L-score', 'S-L'))
+    sector = df['섹터'].to_numpy()
+    row_css = np.select([np.isin(sector, BENCHMARK_SECTORS), np.isin(sector, DEFENSIVE_SECTORS)],
+                        ['background-color:#d9d9d9;font-weight:bold', 'background-color:#e2efda;color:#385723;font-weight:bold'], '')
+    grad = gradient_frame(df, SECTOR_GRADIENT)
+    css = pd.DataFrame({c: [a + (';' + b if a and b else b) for a, b in zip(row_css, grad[c])] for c in df.columns}, index=df.index)
+    signal = np.where((s > 0.05) & (l > 0.05), 0, np.where((s < -0.05) & (l < -0.05), 2, 1))
+    card_rank = np.empty(len(df), dtype=np.int64)
+    card_rank[np.lexsort((-sl, signal))] = np.arange(len(df))
+    cards = np.array([
+        f"<div class=\"unified-card {CARD_CSS[o]}\"><span class=\"ticker-label\">{CARD_ICON[o]} {name} "
+        f"<span style='color:#64748b;font-weight:400;font-size:0.9rem;'>({tick})</span></span>"
+        f"<span class=\"signal-text\">{CARD_SIGNAL[o]}</span>"
+        f"<div class=\"score-line\">S-L: <b>{v_sl:.3f}</b> | 20일: <b>{ret:.2f}%</b><br>L: {v_l:.3f} / S: {v_s:.3f}</div></div>"
+        for o, name, tick, v_sl, ret, v_l, v_s in zip(signal, sector, df['티커'], sl, df['20일(%)'], l, s)], dtype=object)
+    return {'table': _with_row(df), 'css': css, 'format': SECTOR_FORMAT, 'signal': signal, 'card_rank': card_rank, 'cards': cards}
+
+def asset_icon(tickers):
+    """🟥 레버리지·고변동성 / 🟩 코어 우량주 / 🟨 위성 자산 아이콘을 붙인 티커 배열"""
+    t = np.asarray(tickers, dtype=object)
+    icon = np.select([np.isin(t, LEVERAGED_ICON), np.isin(t, CORE_ICON)], ['🟥', '🟩'], '🟨')
+    return np.array([f"{i} {x}" for i, x in zip(icon, t)], dtype=object)
+
+def individual_view(df):
+    """개별 종목표 → {'table', 'css', 'format', 'signal', 'card_rank', 'cards'} (표 열은 INDIVIDUAL_COLS, 빈 값은 0)"""
+    if df.empty: return _empty(INDIVIDUAL_FORMAT)
+    df = df.copy()
+    df['티커_아이콘'] = asset_icon(df['티커'])
+    for c in INDIVIDUAL_NUM:
+        df[c] = pd.to_numeric(df[c], errors='coerce').fillna(0)
+    css = gradient_frame(df[INDIVIDUAL_COLS], INDIVIDUAL_NUM, vmin=-10, vmax=10).rename(columns={'티커_아이콘': '티커'})
+    ytd, ma200, prev, high = (df[c].to_numpy(dtype='float64') for c in ('연초대비', '200대비', '전일대비', 'high대비'))
+    signal = _signal(ytd, 0, 0)
+    card_rank = np.empty(len(df), dtype=np.int64)
+    card_rank[np.argsort(-ytd, kind='stable')] = np.arange(len(df))
+    cards = np.array([
+        f"<div class=\"unified-card {CARD_CSS[o]}\"><span class=\"ticker-label\">{CARD_ICON[o]} {name} "
+        f"<span style='font-size:0.9rem;font-weight:400'>| &#36;{price:,.2f}</span></span>"
+        f"<span class=\"signal-text\">{CARD_SIGNAL[o]} <span style='font-weight:400'>(YTD: {y:+.1f}%)</span></span>"
+        f"<div class=\"score-line\">전일: <b>{p:+.1f}%</b> | 200일: <b>{m:+.1f}%</b><br>고점대비: <b>{h:+.1f}%</b></div></div>"
+        for o, name, price, y, p, m, h in zip(signal, df['티커_아이콘'], df['현재가'], ytd, prev, ma200, high)], dtype=object)
+    return {'table': _with_row(df), 'css': css, 'format': INDIVIDUAL_FORMAT, 'signal': signal, 'card_rank': card_rank, 'cards': cards}
+
+def core_view(df):
+    """핵심 섹터표 → {'table', 'css', 'format', 'signal', 'card_rank', 'cards'} (카드는 S-SCORE 내림차순, 순위는 R1)"""
+    if df.empty: return _empty(CORE_FORMAT)
+    sc, ret = df['S-SCORE'].to_numpy(dtype='float64'), df['20일(%)'].to_numpy(dtype='float64')
+    signal = _signal(sc, -0.05, 0.05)
+    card_rank = np.empty(len(df), dtype=np.int64)
+    card_rank[np.argsort(-sc, kind='stable')] = np.arange(len(df))
+    cards = np.array([
+        f"<div class=\"unified-card {CARD_CSS[o]}\"><span class=\"ticker-label\">{CARD_ICON[o]} #{rank} {name} "
+        f"<span style='color:#64748b;font-weight:400;font-size:0.9rem;'>({tick})</span></span>"
+        f"<span class=\"signal-text\">{CARD_SIGNAL[o]}</span>"
+        f"<div class=\"score-line\">S점수: <b>{v:+.3f}</b> | 20일 수익: <b>{r:+.2f}%</b></div></div>"
+        for o, rank, name, tick, v, r in zip(signal, df['R1'], df['섹터'], df['티커'], sc, ret)], dtype=object)
+    return {'table': _with_row(df), 'css': gradient_frame(df, CORE_GRADIENT), 'format': CORE_FORMAT,
+            'signal': signal, 'card_rank': card_rank, 'cards': cards}
+
+def select(vm, view, cols=None, rename=None):
+    """table_controls로 고른 view → (표 DataFrame, 같은 모양의 CSS DataFrame)"""
+    rows = view['_row'].to_numpy()
+    table = view.drop(columns='_row')
+    if cols: table = table[cols]
+    if rename: table = table.rename(columns=rename)
+    css = vm['css'].iloc[rows][list(table.columns)]
+    return table.reset_index(drop=True), css.reset_index(drop=True)
+
+def card_rows(vm, view):
+    """view에 남은 행의 카드 순서 (원래 행 번호 배열, card_rank 순)"""
+    rows = view['_row'].to_numpy()
+    return rows[np.argsort(vm['card_rank'][rows], kind='stable')]